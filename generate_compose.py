@@ -12,6 +12,11 @@ parser.add_argument(
     default=TradingType.PAPER,
     help="Trading type: 'paper' or 'live'. Default is 'paper'.",
 )
+parser.add_argument(
+    "--single-process",
+    action="store_true",
+    help="Run every ticker in one scale_t_bots container instead of one container per ticker.",
+)
 args = parser.parse_args()
 trading_type = args.trading_type
 
@@ -121,6 +126,11 @@ services = {
 }
 
 
+# Mount the whole ticker data folder, not single CSVs: the storage backends keep files next to
+# the CSV (.tmp, .journal, .ladder, ladders.sqlite3) and replace the CSV by renaming onto it,
+# which fails on a file that is itself a bind mount
+ticker_data_volume = f"./data/SCALE_T/ticker_data/{trading_type.value}:/app/data/ticker_data/{trading_type.value}"
+
 alpaca_interface = AlpacaInterface(trading_type=trading_type)
 # Add bot services
 for ticker in tickers:
@@ -148,6 +158,9 @@ for ticker in tickers:
         worker.create_csv(answers)
         print(f"Created new data file for {ticker}.")
 
+    if args.single_process:
+        continue
+
     services[f"scale_t_bot_{ticker.lower()}"] = {
         "build": {
             "context": ".",
@@ -155,9 +168,27 @@ for ticker in tickers:
         },
         "command": f"{ticker.upper()} {trading_type.value}",
         "container_name": f"scale_t_bot_{ticker.lower()}",
-        "volumes": [
-            f"./data/SCALE_T/ticker_data/{trading_type.value}/{ticker.upper()}.csv:/app/data/ticker_data/{trading_type.value}/{ticker.upper()}.csv",
-        ],
+        "volumes": [ticker_data_volume],
+        "restart": "no",
+        "depends_on": ["alpaca_broker", "firebase_client"],
+        "logging": {
+            "driver": "json-file",
+            "options": {
+                "max-size": "10m",
+                "max-file": "3"
+            }
+        },
+    }
+
+if args.single_process:
+    services["scale_t_bots"] = {
+        "build": {
+            "context": ".",
+            "dockerfile": f"main/bots/SCALE_T/Dockerfile",
+        },
+        "command": f"{' '.join(ticker.upper() for ticker in tickers)} {trading_type.value}",
+        "container_name": "scale_t_bots",
+        "volumes": [ticker_data_volume],
         "restart": "no",
         "depends_on": ["alpaca_broker", "firebase_client"],
         "logging": {
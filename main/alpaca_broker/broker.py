@@ -17,7 +17,7 @@ from alpaca.trading.models import TradeUpdate
 from main.utils.redis import (
     RedisPublisher, RedisSubscriber, CHANNELS, REDIS_HOST_DOCKER, REDIS_PORT, REDIS_DB
 )
-from ..bots.SCALE_T.common.logging_config import get_logger
+from ..bots.SCALE_T.common.logging_config import get_logger, get_sampled_logger
 from ..bots.SCALE_T.common.constants import ENV_FILE, TRADING_TYPE_TO_KEY_NAME, TradingType
 from .constants import MessageType, StreamType # Keep internal constants if needed elsewhere
 
@@ -27,6 +27,7 @@ class AlpacaBroker:
     def __init__(self):
         """Initialize the broker with thread tracking, logging, and Redis connections."""
         self.logger = get_logger(self.__class__.__name__)
+        self.tick_logger = get_sampled_logger(self.__class__.__name__)  # for lines logged on every price update
         self.logger.info("Initializing AlpacaBroker")
 
         self._running = False
@@ -87,8 +88,8 @@ class AlpacaBroker:
             raise ValueError(f"Missing API keys for {trading_type.value} trading")
         self.logger.info(f"API keys configured for {trading_type.value} trading")
 
-    def _publish_to_redis(self, channel_name: str, data: dict):
-        """Publish data to a specific Redis channel name using the custom publisher."""
+    def _publish_to_redis(self, channel_name: str, data: dict, log=None):
+        """Publish data to a specific Redis channel name using the custom publisher. log: debug logger for the published message."""
         if not self._redis_publisher:
             self.logger.warning("Redis publisher not connected. Cannot publish message.")
             return
@@ -96,16 +97,19 @@ class AlpacaBroker:
         try:
             # Use the standard publish method, assuming it handles dicts and channel names
             self._redis_publisher.publish(channel_name, data, sender="alpaca_broker")
-            self.logger.debug(f"Published to {channel_name}: {data}")
+            (log or self.logger.debug)("Published to %s: %s", channel_name, data)
         except Exception as e: # Catch potential errors from the custom publisher
             self.logger.error(f"Failed to publish to Redis channel {channel_name}: {e}")
 
     async def price_handler(self, data: Trade):
-        self.handle_price_update({"price": str(data.price), "symbol": data.symbol, "timestamp": str(data.timestamp)})
+        # Stamps for the SCALE_T tick-to-order latency histograms (bots/SCALE_T/trading/latency.py)
+        stamps = {"trade": data.timestamp.timestamp(), "received": time.time()}
+        self.handle_price_update({"price": str(data.price), "symbol": data.symbol, "timestamp": str(data.timestamp),
+                                  "stamps": stamps})
 
     def handle_price_update(self, price_data):
         """Handle incoming price updates and publish to the dynamic ticker channel."""
-        self.logger.debug(f"Handling price update: {price_data}")
+        self.tick_logger.debug("Handling price update: %s", price_data)
         ticker = price_data.get("symbol")
         if not ticker:
             self.logger.warning("Price update missing symbol, cannot publish to Redis.")
@@ -120,13 +124,16 @@ class AlpacaBroker:
             "symbol": ticker # Explicitly include symbol in payload
         }
         if self._redis_publisher:
-            self._publish_to_redis(channel_name, message_data)
+            stamps = price_data.get("stamps")
+            if stamps is not None:
+                message_data["stamps"] = dict(stamps, published=time.time())
+            self._publish_to_redis(channel_name, message_data, log=self.tick_logger.debug)
         else:
             self.logger.warning("Redis publisher not connected. Cannot publish price update.")
 
     def handle_order_update(self, trade_update: TradeUpdate):
         """Handle incoming order updates and publish to the dynamic ticker channel."""
-        self.logger.debug(f"Handling order update: {trade_update}")
+        self.logger.debug("Handling order update: %s", trade_update)
         ticker = trade_update.order.symbol
         if not ticker:
             self.logger.warning("Order update missing symbol, cannot publish to Redis.")
@@ -172,7 +179,7 @@ class AlpacaBroker:
                  "source": "alpaca"
              },
              "timestamp": str(trade_update.timestamp),
-             "position_qty": str(trade_update.position_qty) if trade_update.position_qty else None,
+             "position_qty": str(trade_update.position_qty) if trade_update.position_qty is not None else None,  # 0 is a flat position
              "price": str(trade_update.price) if trade_update.price else None,
              "qty": str(trade_update.qty) if trade_update.qty else None,
          }
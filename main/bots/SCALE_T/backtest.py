@@ -0,0 +1,262 @@
+"""
+Backtest runner for SCALE_T bot.
+
+Replays recorded or synthetic trade ticks through the DecisionMaker with no Redis and no
+Alpaca: orders go to a SimulatedBroker (brokerages/simulated_broker.py) and the ladder is
+held in memory (MemoryLadderStorage), so the ladder CSV is never written.
+
+Each tick is first matched against the broker's open orders; the resulting trade updates
+and the tick itself are then handled exactly as the live consumer would. place_order and
+cancel_order run inline instead of on the order pool, so a run is deterministic.
+
+Usage:
+    python -m main.bots.SCALE_T.backtest AAPL --ticks aapl_trades.csv --output-dir out/
+    python -m main.bots.SCALE_T.backtest AAPL --synthetic 1000000 --percentage-diff 0.005 --risk-type 1 --total-cash 10000
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .brokerages.simulated_broker import SimulatedBroker
+from .common.constants import TradingType
+from .common.logging_config import scale_t_logger
+from .csv_utils.csv_service import CSVService
+from .csv_utils.csv_tool_helper import build_ladder_rows
+from .csv_utils.storage import MemoryLadderStorage
+from .trading.constants import MessageType
+from .trading.decision_maker import DecisionMaker
+from .trading.inline_executor import InlineExecutor
+
+Tick = Tuple[datetime, float]
+
+LINE_COLUMNS = ("index", "buy_price", "sell_price", "target_shares", "held_shares", "profit", "unrealized_profit")
+
+# Ladder rows round held shares to 5 places, so the ladder may drift from the broker by up to about this much per row
+SHARE_DRIFT_PER_ROW = 1e-4
+
+
+class BacktestPublisher:
+    """Collects what the DecisionMaker would publish to Redis (profit reports)."""
+
+    def __init__(self):
+        self.messages: List[Dict] = []
+
+    def publish(self, channel, message_data, sender=None) -> None:
+        self.messages.append(message_data)
+
+
+class BacktestCSVService(CSVService):
+    """
+    CSVService on MemoryLadderStorage: starts from rows, or from the ticker's ladder CSV if rows
+    is None, and never writes. last_action times come from the replayed ticks.
+    """
+
+    def __init__(self, ticker: str, trading_type: TradingType = TradingType.PAPER, custom_id: Optional[str] = None,
+                 rows: Optional[List[Dict]] = None):
+        self.broker: Optional[SimulatedBroker] = None  # set by run_backtest
+        super().__init__(ticker, trading_type, custom_id, storage=MemoryLadderStorage(rows))
+
+    def _get_epoch_time(self):
+        if self.broker is None:
+            return super()._get_epoch_time()
+        return int(self.broker.clock.timestamp())
+
+
+class BacktestDecisionMaker(DecisionMaker):
+    """DecisionMaker driven tick by tick from a SimulatedBroker instead of Redis."""
+
+    def _create_order_executor(self) -> Executor:
+        return InlineExecutor()
+
+    def __init__(self, csv_service, alpaca_interface, publisher=None):
+        self.max_share_drift = 0.0  # largest broker vs ladder share count difference seen
+        self.share_drift_tolerance = SHARE_DRIFT_PER_ROW * len(csv_service.csv_data)
+        super().__init__(csv_service, alpaca_interface, publisher)
+
+    def _verify_share_count(self, alpaca_shares):
+        # Fractional fills spread over several rows drift from the broker's count by the rounding
+        # of each row. Record that drift; anything larger is a real accounting bug and fails the run.
+        csv_shares = self.csv_service.get_current_held_shares()
+        drift = abs(alpaca_shares - csv_shares)
+        self.max_share_drift = max(self.max_share_drift, drift)
+        if drift > self.share_drift_tolerance:
+            raise RuntimeError(f"Mismatch in shares: broker ({alpaca_shares}) vs ladder ({csv_shares}), "
+                               f"more than the rounding tolerance of {self.share_drift_tolerance:g}")
+
+    def on_tick(self, price: float, timestamp: Optional[datetime] = None) -> None:
+        self.alpaca_interface.on_trade(price, timestamp)
+        self.settle()
+        self.handle_price_update(price)
+        self.settle()
+
+    def settle(self) -> None:
+        """Handle queued actions and broker trade updates until neither has anything left."""
+        while True:
+            for trade_update in self.alpaca_interface.take_updates():
+                self.action_queue.put_nowait({'type': MessageType.ORDER_UPDATE, 'data': trade_update, 'source': 'backtest'})
+            if self.action_queue.empty():
+                return
+            while not self.action_queue.empty():
+                self._handle_action(self.action_queue.get_nowait())
+
+
+class BacktestResult(NamedTuple):
+    ticks: int
+    elapsed_sec: float
+    fills: List[Dict]
+    lines: List[Dict]          # per-line profit, see LINE_COLUMNS
+    ladder: List[Dict]         # final ladder rows
+    profit_reports: List[Dict]
+    max_share_drift: float     # largest broker vs ladder share count difference seen
+
+    @property
+    def realized_profit(self) -> float:
+        return round(sum(line["profit"] for line in self.lines), 2)
+
+    @property
+    def unrealized_profit(self) -> float:
+        return round(sum(line["unrealized_profit"] for line in self.lines), 2)
+
+
+def run_backtest(csv_service: BacktestCSVService, ticks: Iterable[Tick], cash: float = math.inf,
+                 latency_sec: float = 0.0, partial_fill_qty: Optional[float] = None) -> BacktestResult:
+    """
+    Replay ticks through a DecisionMaker trading csv_service's ladder against a SimulatedBroker.
+
+    Args:
+        csv_service (BacktestCSVService): The ladder to trade.
+        ticks (Iterable[Tick]): (timestamp, price) trade ticks in time order.
+        cash (float): Buying power of the simulated account; unlimited by default.
+        latency_sec (float): Simulated order round trip, see SimulatedBroker.
+        partial_fill_qty (Optional[float]): Most shares filled per tick, see SimulatedBroker.
+
+    Returns:
+        BacktestResult: Fills, per-line profit and the final ladder.
+
+    Raises:
+        RuntimeError: If the ladder's held shares drift from the broker's by more than rounding.
+    """
+    ticks = iter(ticks)
+    first = next(ticks, None)
+    if first is None:
+        raise ValueError("No ticks to replay")
+    # Orders pending in a live ladder don't exist at the simulated broker
+    for row in csv_service.csv_data:
+        if row['pending_order_id'] != "None":
+            row['pending_order_id'] = "None"
+    broker = SimulatedBroker(csv_service.ticker, shares=csv_service.get_current_held_shares(), cash=cash,
+                             latency_sec=latency_sec, partial_fill_qty=partial_fill_qty)
+    broker.on_trade(first[1], first[0])
+    csv_service.broker = broker
+    publisher = BacktestPublisher()
+    decision_maker = BacktestDecisionMaker(csv_service, broker, publisher=publisher)
+
+    started = time.perf_counter()
+    count = 1
+    decision_maker.settle()  # the initial price DecisionMaker queued on startup
+    for timestamp, price in ticks:
+        decision_maker.on_tick(price, timestamp)
+        count += 1
+    elapsed = time.perf_counter() - started
+
+    ladder = [dict(row) for row in csv_service.csv_data]
+    lines = [{column: row.get(column) for column in LINE_COLUMNS} for row in ladder]
+    return BacktestResult(count, elapsed, broker.fills, lines, ladder, publisher.messages,
+                          decision_maker.max_share_drift)
+
+
+def read_ticks(filepath: str) -> Iterator[Tick]:
+    """
+    Trade ticks from a CSV with 'timestamp' (ISO 8601 or epoch seconds) and 'price' columns.
+    """
+    with open(filepath, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            timestamp = row['timestamp']
+            try:
+                moment = datetime.fromtimestamp(float(timestamp), timezone.utc)
+            except ValueError:
+                moment = datetime.fromisoformat(timestamp)
+            yield moment, float(row['price'])
+
+
+def synthetic_ticks(start_price: float, count: int, seed: int = 0, step: float = 0.01,
+                    start: Optional[datetime] = None) -> Iterator[Tick]:
+    """A seeded random walk of count ticks, one second apart, moving at most one step per tick."""
+    rng = random.Random(seed)
+    epoch = (start or datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)).timestamp()
+    price = start_price
+    for i in range(count):
+        yield datetime.fromtimestamp(epoch + i, timezone.utc), price
+        price = max(round(price + rng.choice((-step, 0.0, step)), 2), step)
+
+
+def write_result(result: BacktestResult, output_dir: str) -> None:
+    """Write fills.csv, lines.csv and ladder.csv to output_dir."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name, rows, fieldnames in (
+        ("fills.csv", result.fills, ("timestamp", "order_id", "side", "qty", "price")),
+        ("lines.csv", result.lines, LINE_COLUMNS),
+        ("ladder.csv", result.ladder, list(result.ladder[0]) if result.ladder else []),
+    ):
+        with open(os.path.join(output_dir, name), 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest a SCALE_T ladder on recorded or synthetic trade ticks.")
+    parser.add_argument("ticker", type=str, help="The stock ticker symbol (e.g., AAPL).")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ticks", type=str, help="CSV of trade ticks with timestamp and price columns.")
+    source.add_argument("--synthetic", type=int, metavar="COUNT", help="Replay a seeded random walk of COUNT ticks.")
+    parser.add_argument("--start-price", type=float, default=100.0, help="First price of the random walk.")
+    parser.add_argument("--seed", type=int, default=0, help="Random walk seed.")
+    parser.add_argument("--trading-type", type=TradingType, default=TradingType.PAPER, choices=list(TradingType),
+                        help="Which ladder directory to read the ticker's ladder from.")
+    parser.add_argument("--custom-id", type=str, help="Optional custom identifier of the ladder CSV.")
+    parser.add_argument("--percentage-diff", type=float, help="Build the ladder in memory with this buy/sell difference instead of reading it.")
+    parser.add_argument("--risk-type", type=float, default=1, help="Risk type of a built ladder (100 lines per step).")
+    parser.add_argument("--total-cash", type=float, default=10000.0, help="Cash spread over a built ladder.")
+    parser.add_argument("--starting-buy-price", type=float, help="Top buy price of a built ladder (defaults to the first tick).")
+    parser.add_argument("--cash", type=float, default=math.inf, help="Buying power of the simulated account (default unlimited).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated order round trip in seconds.")
+    parser.add_argument("--partial-fill-qty", type=float, help="Fill at most this many shares per tick.")
+    parser.add_argument("--output-dir", type=str, help="Write fills.csv, lines.csv and ladder.csv here.")
+    parser.add_argument("--log-level", type=str, default="ERROR", help="SCALE_T log level during the run.")
+    args = parser.parse_args()
+
+    # Per-tick INFO logging would dominate the run time
+    scale_t_logger.setLevel(getattr(logging, args.log_level.upper()))
+
+    if args.ticks:
+        ticks = read_ticks(args.ticks)
+    else:
+        ticks = synthetic_ticks(args.start_price, args.synthetic, seed=args.seed)
+
+    rows = None
+    if args.percentage_diff is not None:
+        ticks = iter(ticks)
+        first = next(ticks)
+        starting_buy_price = args.starting_buy_price or first[1]
+        rows = build_ladder_rows(starting_buy_price, args.percentage_diff, args.risk_type, args.total_cash, int(first[0].timestamp()))
+        ticks = itertools.chain([first], ticks)
+    csv_service = BacktestCSVService(args.ticker.upper(), args.trading_type, args.custom_id, rows)
+
+    result = run_backtest(csv_service, ticks, cash=args.cash, latency_sec=args.latency,
+                          partial_fill_qty=args.partial_fill_qty)
+    print(f"Ticks: {result.ticks} in {result.elapsed_sec:.2f}s ({result.ticks / max(result.elapsed_sec, 1e-9) * 60:,.0f} per minute)")
+    print(f"Fills: {len(result.fills)}  Realized profit: {result.realized_profit}  Unrealized profit: {result.unrealized_profit}")
+    print(f"Held shares: {csv_service.get_current_held_shares()}  Max share count drift: {result.max_share_drift:.5f}")
+    if args.output_dir:
+        write_result(result, args.output_dir)
+        print(f"Wrote fills, lines and ladder to {args.output_dir}")
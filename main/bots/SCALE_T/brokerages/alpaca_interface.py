@@ -5,13 +5,14 @@ This module provides an interface (AlpacaInterface class) for interacting with t
 It encapsulates brokerage functionalities and provides a singleton trading client for efficient reuse.
 """
 
-import os, sys
+import copy
+import os, sys, time
 from typing import Tuple, List, Dict, Any, Optional, Callable, Awaitable, Union
 import asyncio
 from dotenv import load_dotenv
 from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import GetAssetsRequest, LimitOrderRequest, MarketOrderRequest
-from alpaca.trading.enums import AssetStatus, OrderStatus, OrderSide, OrderType, TimeInForce
+from alpaca.trading.requests import GetAssetsRequest, GetOrdersRequest, LimitOrderRequest, MarketOrderRequest, ReplaceOrderRequest
+from alpaca.trading.enums import AssetStatus, OrderStatus, QueryOrderStatus, OrderSide, OrderType, TimeInForce
 from alpaca.data.live import StockDataStream
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockLatestTradeRequest
@@ -24,6 +25,7 @@ from ..common.constants import (
     # LIVE_ALPACA_KEY_ID,
     # LIVE_ALPACA_SECRET_KEY,
     ENV_FILE,
+    POSITION_RECONCILE_INTERVAL_SEC,
     TradingType,
     TRADING_TYPE_TO_KEY_NAME
 )
@@ -49,6 +51,9 @@ class AlpacaInterface:
         self.secret_key = None
         self.trading_client = None # Instance-level variable
         self.data_client = None
+        # Position cache, fed by the position_qty on trade updates (see update_position)
+        self._position_qty = None
+        self._position_reconciled_at = None  # monotonic time of the last get_shares_count
         self.logger.info("Initializing AlpacaInterface ")
         self.set_trading_client()
 
@@ -59,6 +64,17 @@ class AlpacaInterface:
             sys.exit(0)
         self.logger.info("Alpaca interface initialized successfully.")
 
+    def for_ticker(self, ticker: str) -> "AlpacaInterface":
+        """
+        Returns an AlpacaInterface for another ticker that shares this one's trading and
+        data clients (and their HTTP sessions), without validating the keys again.
+        """
+        interface = copy.copy(self)
+        interface.ticker = ticker
+        interface._position_qty = None
+        interface._position_reconciled_at = None
+        return interface
+
     def set_trading_client(self) -> None:
         """
         Sets the Alpaca Trading client and api/secret keys.
@@ -107,13 +123,35 @@ class AlpacaInterface:
 
     def get_shares_count(self) -> float:
         """
-        Gets the number of shares held for the ticker.
+        Gets the number of shares held for the ticker from Alpaca, and resets the position cache to it.
         """
+        shares = 0.0
         positions = self.trading_client.get_all_positions()
         for position in positions:
             if position.symbol == self.ticker:
-                return float(position.qty)
-        return 0.0
+                shares = float(position.qty)
+                break
+        self._position_qty = shares
+        self._position_reconciled_at = time.monotonic()
+        return shares
+
+    def update_position(self, position_qty: float) -> None:
+        """
+        Updates the position cache from a trade update's position_qty (the position after that event).
+        """
+        self._position_qty = float(position_qty)
+
+    def get_cached_shares_count(self, max_age_sec: float = POSITION_RECONCILE_INTERVAL_SEC) -> Optional[float]:
+        """
+        Gets the cached number of shares held for the ticker, without a REST call.
+
+        Returns:
+            Optional[float]: The cached count, or None if the cache hasn't been reconciled
+            with get_shares_count in the last max_age_sec seconds and should be.
+        """
+        if self._position_reconciled_at is None or time.monotonic() - self._position_reconciled_at > max_age_sec:
+            return None
+        return self._position_qty
 
     def get_buying_power(self):
         """Gets the current buying power."""
@@ -130,6 +168,15 @@ class AlpacaInterface:
         """
         return self.trading_client.get_order_by_id(order_id)
 
+    def get_open_orders(self, symbols: List[str]) -> list:
+        """
+        Gets the open orders for several tickers in one call (the multi-ticker engine's
+        OrderReconciler uses it instead of one get_order_by_id per pending order).
+        """
+        return self.trading_client.get_orders(
+            filter=GetOrdersRequest(status=QueryOrderStatus.OPEN, symbols=symbols, limit=500)
+        )
+
     def cancel_order(self, order_id: str) -> bool:
       """Cancels an order by ID.
       
@@ -228,6 +275,31 @@ class AlpacaInterface:
           self.logger.error(f"An error occurred while placing the order: {e}")
           return None
 
+    def replace_order(self, order_id: str, price: float, quantity: int):
+      """Re-price and/or resize a pending limit order in one call (Alpaca replace-order).
+
+      Alpaca cancels the old order and opens a replacement with a new ID; the old order
+      then gets a 'replaced' order update. Side and time in force are kept.
+
+      Args:
+          order_id (str): ID of the order to replace
+          price (float): New limit price
+          quantity (int): New total quantity (whole shares)
+
+      Returns:
+          Object: The replacement order if successful, None otherwise (e.g. already filled)
+      """
+      try:
+          self.logger.info(f"Replacing order {order_id}: {quantity} shares of {self.ticker} at ${price}")
+          order = self.trading_client.replace_order_by_id(
+              order_id, order_data=ReplaceOrderRequest(qty=quantity, limit_price=price)
+          )
+          self.logger.info(f"Order {order_id} replaced by {order.id}.")
+          return order
+      except Exception as e:
+          self.logger.error(f"Failed to replace order {order_id}: {e}")
+          return None
+
 if __name__ == "__main__":
     import sys
 
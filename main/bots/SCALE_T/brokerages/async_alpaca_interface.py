@@ -0,0 +1,52 @@
+"""
+asyncio facade over AlpacaInterface for the SCALE_T asyncio engine.
+
+alpaca-py only ships a blocking REST client, so each call runs on a small thread pool
+and is awaited. The event loop keeps handling price ticks while a REST call is in flight.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from .alpaca_interface import AlpacaInterface
+
+
+class AsyncAlpacaInterface:
+    """
+    Awaitable versions of the AlpacaInterface calls the DecisionMaker makes while trading.
+    """
+
+    def __init__(self, alpaca_interface: AlpacaInterface, max_workers: int = 4):
+        self.alpaca_interface = alpaca_interface
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alpaca_rest")
+
+    async def _call(self, method: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args))
+
+    async def place_order(self, side, price, quantity):
+        """See AlpacaInterface.place_order. Returns the order, or None if it wasn't placed."""
+        return await self._call(self.alpaca_interface.place_order, side, price, quantity)
+
+    async def replace_order(self, order_id: str, price: float, quantity: int):
+        """See AlpacaInterface.replace_order. Returns the replacement order, or None."""
+        return await self._call(self.alpaca_interface.replace_order, order_id, price, quantity)
+
+    async def cancel_order(self, order_id: str) -> bool:
+        """See AlpacaInterface.cancel_order."""
+        return await self._call(self.alpaca_interface.cancel_order, order_id)
+
+    async def get_order_by_id(self, order_id):
+        return await self._call(self.alpaca_interface.get_order_by_id, order_id)
+
+    async def get_shares_count(self) -> float:
+        return await self._call(self.alpaca_interface.get_shares_count)
+
+    async def get_current_price(self):
+        return await self._call(self.alpaca_interface.get_current_price)
+
+    def close(self) -> None:
+        """Stop the REST thread pool; calls already running finish on their own."""
+        self._executor.shutdown(wait=False)
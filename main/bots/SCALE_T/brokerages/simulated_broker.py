@@ -0,0 +1,253 @@
+"""
+Simulated brokerage for SCALE_T bot backtests and offline tests.
+
+SimulatedBroker answers the same calls as AlpacaInterface, but fills orders against the
+trade ticks it is fed instead of sending them to Alpaca:
+
+    - A buy limit fills at its limit price on a tick at or below it (a sell limit at or
+      above it). Market orders fill at the tick's price.
+    - Orders only match ticks after the one they were placed on, so there is no look-ahead.
+    - latency_sec: new orders (and replacements) only match ticks at least this long after
+      they were sent, and a cancel only lands this long after it was sent, so an order can
+      still fill while its cancel is on the way, as it can at Alpaca.
+    - partial_fill_qty: at most this many shares fill per matching tick; the rest stays open.
+    - Fills, cancels and replaces become TradeUpdates (with position_qty), collected with
+      take_updates() and handed to the DecisionMaker like stream updates.
+
+Time only moves with the ticks, and matching is deterministic: the same ticks and decisions
+always give the same fills.
+
+for_ticker() gives a broker for another ticker on the same account, as AlpacaInterface.for_ticker
+does for the multi-ticker engine: each is fed its own ticker's trades, and get_order_by_id and
+get_open_orders on any of them see the orders of all of them.
+"""
+
+import itertools
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from alpaca.trading import TradeUpdate
+from alpaca.trading.enums import OrderClass, OrderSide, OrderStatus, OrderType, TimeInForce, TradeEvent
+from alpaca.trading.models import Order
+
+from ..common.logging_config import get_logger
+
+
+class SimulatedBroker:
+    """
+    Stands in for AlpacaInterface; see the module docstring for the matching rules.
+    """
+
+    def __init__(self, ticker: str, shares: float = 0.0, cash: float = math.inf, latency_sec: float = 0.0,
+                 partial_fill_qty: Optional[float] = None):
+        self.logger = get_logger(self.__class__.__name__)
+        self.ticker = ticker
+        self.shares = shares
+        self.cash = cash
+        self.latency = timedelta(seconds=latency_sec)
+        self.partial_fill_qty = partial_fill_qty
+        self.price: Optional[float] = None
+        self.clock = datetime.fromtimestamp(0, timezone.utc)
+        self.orders: Dict[UUID, Order] = {}
+        self.fills: List[Dict] = []  # every fill, in order: timestamp, order_id, side, qty, price
+        self._open_orders: Dict[UUID, Order] = {}
+        self._active_at: Dict[UUID, datetime] = {}  # open orders still on their way to the book
+        self._cancels: List[Tuple[datetime, UUID]] = []  # cancels on their way, in the order they were sent
+        self._updates: List[TradeUpdate] = []
+        self._ids = itertools.count(1)  # order ids, shared by the brokers of one account
+        self._brokers: Dict[str, "SimulatedBroker"] = {ticker: self}  # every ticker of the account
+
+    # --- Market data ---
+    def on_trade(self, price: float, timestamp: Optional[datetime] = None) -> None:
+        """Land the cancels that are due, match the open orders against a trade tick, then make it the current price."""
+        if timestamp is not None:
+            self.clock = timestamp
+        if self._cancels:
+            self._land_cancels()
+        if self._open_orders:
+            for order in list(self._open_orders.values()):
+                if order.id in self._active_at:
+                    if self.clock < self._active_at[order.id]:
+                        continue
+                    del self._active_at[order.id]
+                fill_price = self._match(order, price)
+                if fill_price is not None:
+                    self._fill(order, fill_price)
+        self.price = price
+
+    def _match(self, order: Order, price: float) -> Optional[float]:
+        if order.order_type == OrderType.MARKET:
+            return price
+        limit_price = float(order.limit_price)
+        if order.side == OrderSide.BUY:
+            return limit_price if price <= limit_price else None
+        return limit_price if price >= limit_price else None
+
+    def take_updates(self) -> List[TradeUpdate]:
+        """The trade updates since the last call, oldest first."""
+        updates, self._updates = self._updates, []
+        return updates
+
+    # --- AlpacaInterface calls ---
+    def for_ticker(self, ticker: str) -> "SimulatedBroker":
+        """
+        A broker for another ticker on this account, with the same latency and partial fills. It
+        starts flat, with its own clock and cash (unlimited); orders and their ids are shared.
+        """
+        broker = SimulatedBroker(ticker, latency_sec=self.latency.total_seconds(), partial_fill_qty=self.partial_fill_qty)
+        broker.orders = self.orders
+        broker._ids = self._ids
+        broker._brokers = self._brokers
+        self._brokers[ticker] = broker
+        return broker
+
+    def validate_alpaca_keys(self) -> Tuple[bool, List[str]]:
+        return True, []
+
+    def get_current_price(self) -> float:
+        return self.price
+
+    def get_shares_count(self) -> float:
+        return self.shares
+
+    def get_cached_shares_count(self, max_age_sec: float = 0) -> float:
+        # The simulated position is always exact, so there is nothing to reconcile
+        return self.shares
+
+    def update_position(self, position_qty: float) -> None:
+        pass
+
+    def get_buying_power(self) -> float:
+        """Cash less what the open buy orders could cost, as Alpaca reserves it."""
+        reserved = sum(self._remaining(order) * self._reserve_price(order)
+                       for order in self._open_orders.values() if order.side == OrderSide.BUY)
+        return self.cash - reserved
+
+    def get_order_by_id(self, order_id) -> Order:
+        return self.orders[self._order_id(order_id)].model_copy()
+
+    def get_open_orders(self, symbols: List[str]) -> List[Order]:
+        """Same as AlpacaInterface.get_open_orders: the open orders of every ticker in symbols on this account."""
+        return [order.model_copy() for symbol in symbols if symbol in self._brokers
+                for order in self._brokers[symbol]._open_orders.values()]
+
+    def place_order(self, side, price, quantity) -> Optional[Order]:
+        """
+        Same rules as AlpacaInterface.place_order: fractional quantities go out as market orders,
+        and None means the order wasn't placed (unfavorable price or not enough buying power).
+        """
+        order_side = OrderSide(side)
+        order_type = OrderType.LIMIT
+        if quantity % 1 > 0.0:
+            price_is_favorable = (order_side == OrderSide.BUY and self.price < price) or \
+                                 (order_side == OrderSide.SELL and self.price > price)
+            if not price_is_favorable:
+                self.logger.warning(f"Current price ${self.price} is not favorable compared to expected order price ${price}. Order not placed.")
+                return None
+            order_type, price = OrderType.MARKET, None
+        if order_side == OrderSide.BUY and quantity * (price or self.price) > self.get_buying_power():
+            self.logger.error(f"Insufficient buying power for {quantity} shares of {self.ticker}")
+            return None
+        return self._open(order_side, price, quantity, order_type).model_copy()
+
+    def replace_order(self, order_id, price: float, quantity: int) -> Optional[Order]:
+        """
+        Same rules as AlpacaInterface.replace_order. The old order leaves the book at once and
+        the replacement arrives after latency_sec. None if the order is no longer open, has
+        started filling or has a cancel on the way.
+        """
+        order_id = self._order_id(order_id)
+        old_order = self._open_orders.get(order_id)
+        if old_order is None or float(old_order.filled_qty) > 0 or any(order_id == cancel_id for _, cancel_id in self._cancels):
+            return None
+        self._close(old_order)
+        order = self._open(old_order.side, price, quantity, OrderType.LIMIT, replaces=old_order.id)
+        old_order.status = OrderStatus.REPLACED
+        old_order.replaced_by = order.id
+        old_order.replaced_at = self.clock
+        self._emit(TradeEvent.REPLACED, old_order)
+        return order.model_copy()
+
+    def cancel_order(self, order_id) -> bool:
+        """
+        Same rules as AlpacaInterface.cancel_order: False if the order is no longer open. The
+        cancel lands after latency_sec; the CANCELED update (with whatever filled) comes then.
+        """
+        order_id = self._order_id(order_id)
+        if order_id not in self._open_orders:
+            return False
+        self._cancels.append((self.clock + self.latency, order_id))
+        if not self.latency:
+            self._land_cancels()
+        return True
+
+    # --- Order book ---
+    def _order_id(self, order_id) -> UUID:
+        return order_id if isinstance(order_id, UUID) else UUID(str(order_id))
+
+    def _remaining(self, order: Order) -> float:
+        return float(order.qty) - float(order.filled_qty)
+
+    def _reserve_price(self, order: Order) -> float:
+        return float(order.limit_price) if order.limit_price is not None else self.price
+
+    def _land_cancels(self) -> None:
+        due = [cancel for cancel in self._cancels if cancel[0] <= self.clock]
+        if not due:
+            return
+        self._cancels = [cancel for cancel in self._cancels if cancel[0] > self.clock]
+        for _, order_id in due:
+            order = self._open_orders.get(order_id)
+            if order is None:
+                continue  # filled while the cancel was on its way
+            self._close(order)
+            order.status = OrderStatus.CANCELED
+            order.canceled_at = self.clock
+            self._emit(TradeEvent.CANCELED, order)
+
+    def _open(self, side: OrderSide, limit_price: Optional[float], quantity: float, order_type: OrderType,
+              replaces: Optional[UUID] = None) -> Order:
+        order_id = UUID(int=next(self._ids))
+        order = Order(
+            id=order_id, client_order_id=str(order_id), created_at=self.clock, updated_at=self.clock,
+            submitted_at=self.clock, symbol=self.ticker, qty=quantity, filled_qty=0.0, replaces=replaces,
+            order_class=OrderClass.SIMPLE, order_type=order_type, type=order_type, side=side,
+            time_in_force=TimeInForce.DAY, limit_price=limit_price, status=OrderStatus.NEW, extended_hours=False,
+        )
+        self.orders[order_id] = order
+        self._open_orders[order_id] = order
+        if self.latency:
+            self._active_at[order_id] = self.clock + self.latency
+        return order
+
+    def _close(self, order: Order) -> None:
+        del self._open_orders[order.id]
+        self._active_at.pop(order.id, None)
+
+    def _fill(self, order: Order, price: float) -> None:
+        remaining = self._remaining(order)
+        quantity = remaining if self.partial_fill_qty is None else min(remaining, self.partial_fill_qty)
+        filled_qty = float(order.filled_qty)
+        order.filled_avg_price = round(((order.filled_avg_price or 0.0) * filled_qty + price * quantity) / (filled_qty + quantity), 4)
+        order.filled_qty = round(filled_qty + quantity, 9)
+        signed_quantity = quantity if order.side == OrderSide.BUY else -quantity
+        self.shares = round(self.shares + signed_quantity, 5)
+        self.cash -= signed_quantity * price
+        if quantity < remaining:
+            order.status = OrderStatus.PARTIALLY_FILLED
+            event = TradeEvent.PARTIAL_FILL
+        else:
+            self._close(order)
+            order.status = OrderStatus.FILLED
+            order.filled_at = self.clock
+            event = TradeEvent.FILL
+        self.fills.append({'timestamp': self.clock, 'order_id': str(order.id), 'side': order.side.value,
+                           'qty': quantity, 'price': price})
+        self._emit(event, order, price=price, qty=quantity)
+
+    def _emit(self, event: TradeEvent, order: Order, price: Optional[float] = None, qty: Optional[float] = None) -> None:
+        order.updated_at = self.clock
+        self._updates.append(TradeUpdate(event=event, order=order.model_copy(), timestamp=self.clock,
+                                         position_qty=self.shares, price=price, qty=qty))
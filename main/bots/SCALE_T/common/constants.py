@@ -88,6 +88,38 @@ TRADING_TYPE_TO_PATH = {
 TEMPLATE_CSV = os.path.join(TEMPLATES_DIR, "SCALE_T.csv")
 METADATA_FILE = os.path.join(TEMPLATES_DIR, "csv_versions_metadata.json")
 
+# Ladder persistence
+class StorageBackend(Enum):
+    CSV = "csv"                            # rewrite the ladder CSV on every save (default)
+    CSV_WRITE_BEHIND = "csv_write_behind"  # coalesced, atomic CSV writes on a background thread (csv_utils/persister.py)
+    JOURNAL = "journal"                    # append-only journal, compacted into the CSV (csv_utils/journal.py)
+    BINARY = "binary"                      # fixed-width mmap file, CSV is import/export only (csv_utils/binary_store.py)
+    SQLITE = "sqlite"                      # SQLite database in WAL mode, CSV is import/export only (csv_utils/sqlite_store.py)
+
+CSV_STORAGE_BACKEND = StorageBackend(os.getenv("CSV_STORAGE_BACKEND", StorageBackend.CSV.value))
+CSV_JOURNAL_COMPACT_EVERY = int(os.getenv("CSV_JOURNAL_COMPACT_EVERY", "500"))  # saves between compactions
+BINARY_LADDER_EXTENSION = ".ladder"
+SQLITE_LADDER_DB = "ladders.sqlite3"  # one database per trading type directory
+
+# Engine
+ASYNC_ENGINE = os.getenv("SCALE_T_ASYNC_ENGINE", "false").lower() == "true"  # engine.py --asyncio by default
+
+# Position cache: share counts come from trade updates; Alpaca's positions endpoint is only
+# asked after this many seconds, or when the cached count disagrees with the ladder
+POSITION_RECONCILE_INTERVAL_SEC = int(os.getenv("SCALE_T_POSITION_RECONCILE_INTERVAL_SEC", "300"))
+
+# Pending-order reconciliation: a pending order is polled from Alpaca in case its stream update was
+# lost, first after the min delay, then with the delay doubling up to the max; new activity resets it
+ORDER_RECONCILE_MIN_SEC = float(os.getenv("SCALE_T_ORDER_RECONCILE_MIN_SEC", "5"))
+ORDER_RECONCILE_MAX_SEC = float(os.getenv("SCALE_T_ORDER_RECONCILE_MAX_SEC", "300"))
+
+# Tick-to-order latency histograms (trading/latency.py) are logged this often; 0 turns the log off
+LATENCY_REPORT_INTERVAL_SEC = int(os.getenv("SCALE_T_LATENCY_REPORT_INTERVAL_SEC", "60"))
+
+# Decision trace (trading/decision_trace.py): records kept per ticker, dumped on SIGUSR1 or on error
+DECISION_TRACE_SIZE = int(os.getenv("SCALE_T_DECISION_TRACE_SIZE", "4096"))
+DECISION_TRACE_DIR = os.path.join(LOGS_DIR, "decision_trace")
+
 # File naming patterns
 DEFAULT_CSV_PATTERN = "{ticker}.csv"  # Standard pattern
 CUSTOM_ID_CSV_PATTERN = "{ticker}_{custom_id}.csv"  # Pattern with custom ID
@@ -125,6 +157,30 @@ def get_ticker_filepath(ticker: str, trading_type: TradingType, custom_id: Optio
     filename = get_ticker_filename(ticker, custom_id)
     return os.path.join(base_path, filename)
 
+def get_binary_ladder_filepath(csv_filepath: str) -> str:
+    """
+    Get the binary ladder store path that goes with a ticker CSV file.
+
+    Args:
+        csv_filepath (str): The ticker CSV path (see get_ticker_filepath)
+
+    Returns:
+        str: The same path with the binary ladder extension instead of .csv
+    """
+    return os.path.splitext(csv_filepath)[0] + BINARY_LADDER_EXTENSION
+
+def get_sqlite_ladder_filepath(csv_filepath: str) -> str:
+    """
+    Get the SQLite ladder database that holds a ticker CSV's ladder.
+
+    Args:
+        csv_filepath (str): The ticker CSV path (see get_ticker_filepath)
+
+    Returns:
+        str: The database path in the same directory as the CSV
+    """
+    return os.path.join(os.path.dirname(csv_filepath), SQLITE_LADDER_DB)
+
 def parse_ticker_filename(filename: str) -> tuple:
     """
     Parse a ticker filename to extract ticker symbol and custom ID.
@@ -1,12 +1,55 @@
+import glob
+import gzip
 import os
+import shutil
+import sys
+import threading
 from logging.handlers import TimedRotatingFileHandler
-from datetime import datetime
+from datetime import datetime, timedelta
 from .constants import NYC_TZ, LOGS_DIR, BOT_NAME
 
+
+def gzip_log_file(filepath: str) -> None:
+    """Replace filepath with filepath.gz."""
+    try:
+        with open(filepath, 'rb') as src, gzip.open(filepath + ".gz.tmp", 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(filepath + ".gz.tmp", filepath + ".gz")
+        os.remove(filepath)
+    except OSError as e:
+        # Not through logging: this runs beside the handler that would write it
+        print(f"Failed to compress log file {filepath}: {e}", file=sys.stderr)
+
+
+def prune_old_logs(base_dir: str, backup_count: int, current_filename: str) -> None:
+    """Remove all but the backup_count latest finished day files (.log or .log.gz) under base_dir."""
+    day_files = [path for pattern in (f"{BOT_NAME}-*.log", f"{BOT_NAME}-*.log.gz")
+                 for path in glob.glob(os.path.join(base_dir, "*", "*", pattern))
+                 if os.path.abspath(path) != current_filename]
+    # The date is in the name, so name order is day order
+    day_files.sort(key=os.path.basename)
+    for path in day_files[:-backup_count]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"Failed to remove old log file {path}: {e}", file=sys.stderr)
+
+
 class CustomTimedRotatingFileHandler(TimedRotatingFileHandler):
-    def __init__(self, base_dir=LOGS_DIR, when="midnight", interval=1, backupCount=7, encoding=None, delay=False, utc=False):
+    """
+    Daily log files under base_dir/YYYY/MM, switched at NYC midnight.
+
+    The finished day's file is gzipped when compress is set, and only the backupCount latest
+    finished days are kept (0 keeps them all); both run on a background thread after the switch.
+    """
+
+    def __init__(self, base_dir=LOGS_DIR, when="midnight", interval=1, backupCount=7, encoding=None, delay=False, utc=False,
+                 compress=True):
         self.base_dir = base_dir
+        self.compress = compress  # gzip each day's file once the next day starts
+        self.compress_thread = None  # gzips and prunes the finished day
         self.current_date = self.get_nyc_date()
+        self.next_rollover_at = self.get_next_nyc_midnight()
         log_file = self.get_log_filename()
         super().__init__(log_file, when, interval, backupCount, encoding, delay, utc=True)  # Force UTC to handle timezone manually
 
@@ -14,20 +57,43 @@ class CustomTimedRotatingFileHandler(TimedRotatingFileHandler):
         """Get the current date in NYC timezone."""
         return datetime.now(NYC_TZ).strftime("%Y-%m-%d")
 
+    def get_next_nyc_midnight(self) -> float:
+        """Epoch time of the next midnight in NYC."""
+        tomorrow = datetime.now(NYC_TZ).date() + timedelta(days=1)
+        return NYC_TZ.localize(datetime.combine(tomorrow, datetime.min.time())).timestamp()
+
     def get_log_filename(self):
         """Generate log file path based on the current date."""
-        year = datetime.now(NYC_TZ).strftime("%Y")
-        month = datetime.now(NYC_TZ).strftime("%m")
+        year, month = self.current_date[:4], self.current_date[5:7]
         log_dir = os.path.join(self.base_dir, year, month)
         os.makedirs(log_dir, exist_ok=True)  # Ensure directory exists
         return os.path.join(log_dir, f"{BOT_NAME}-{self.current_date}.log")
 
     def shouldRollover(self, record):
-        """Check if the log file should be rolled over based on NYC time."""
-        new_date = self.get_nyc_date()
-        if new_date != self.current_date:
-            self.current_date = new_date
-            self.baseFilename = self.get_log_filename()
+        """Check if the record belongs to a later NYC day than the open file; one float compare per record."""
+        return record.created >= self.next_rollover_at
+
+    def doRollover(self):
+        """Switch to the new day's file, then compress the old one and prune old days on a background thread."""
+        if self.stream:
             self.stream.close()
+            self.stream = None
+        previous_filename = self.baseFilename
+        self.current_date = self.get_nyc_date()
+        self.next_rollover_at = self.get_next_nyc_midnight()
+        self.baseFilename = os.path.abspath(self.get_log_filename())
+        if not self.delay:
             self.stream = self._open()
-        return super().shouldRollover(record)
+        if previous_filename == self.baseFilename:
+            return
+        compress = self.compress and os.path.exists(previous_filename)
+        if compress or self.backupCount > 0:
+            self.compress_thread = threading.Thread(target=self._archive, args=(previous_filename, compress),
+                                                    name="log_compress", daemon=True)
+            self.compress_thread.start()
+
+    def _archive(self, previous_filename: str, compress: bool) -> None:
+        if compress:
+            gzip_log_file(previous_filename)
+        if self.backupCount > 0:
+            prune_old_logs(self.base_dir, self.backupCount, self.baseFilename)
@@ -1,5 +1,10 @@
+import atexit
 import logging
 import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
 from .custom_logfile_handler import CustomTimedRotatingFileHandler
 from .constants import BOT_NAME
 
@@ -7,6 +12,13 @@ from .constants import BOT_NAME
 LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()           # for file logs
 CONSOLE_LOG_LEVEL = os.getenv("CONSOLE_LOG_LEVEL", "INFO").upper()  # for console logs
 LOG_FILE = os.getenv("LOG_FILE", "app.log")                     # Log file name
+# Queue logging: the logging thread only enqueues; a listener thread formats and writes
+LOG_QUEUE = os.getenv("SCALE_T_LOG_QUEUE", "false").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("SCALE_T_LOG_QUEUE_SIZE", "10000"))  # records buffered before new ones are dropped
+# Sampled hot-path logging (SampledLogger): per statement and interval, the first N lines, then 1 in K
+LOG_SAMPLE_FIRST = int(os.getenv("SCALE_T_LOG_SAMPLE_FIRST", "10"))
+LOG_SAMPLE_EVERY = int(os.getenv("SCALE_T_LOG_SAMPLE_EVERY", "100"))  # 1 logs everything
+LOG_SAMPLE_INTERVAL_SEC = float(os.getenv("SCALE_T_LOG_SAMPLE_INTERVAL_SEC", "60"))
 
 # Create our custom logger
 scale_t_logger = logging.getLogger(BOT_NAME)
@@ -31,9 +43,150 @@ console_handler.setFormatter(formatter)
 scale_t_logger.addHandler(rotating_handler)
 scale_t_logger.addHandler(console_handler)
 
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue. A record that doesn't fit is dropped and counted instead of
+    blocking the thread that logged it, and a warning with the count goes out once there is room.
+
+    Records are queued unformatted (only tracebacks are rendered here), so %-style arguments are
+    formatted on the listener thread. Don't mutate an object after passing it as a log argument.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0      # records dropped since startup
+        self._unreported = 0  # dropped records the log doesn't mention yet
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # The traceback holds frames of the logging thread; render it now like QueueHandler does
+            return super().prepare(record)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # emit() runs under the handler lock, so the counters don't need their own
+        if self._unreported:
+            notice = scale_t_logger.makeRecord(scale_t_logger.name, logging.WARNING, __file__, 0,
+                                               "Log queue full, dropped %d records", (self._unreported,), None)
+            try:
+                self.queue.put_nowait(notice)
+                self._unreported = 0
+            except queue.Full:
+                pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+
+class _LogListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than fail on a full queue; the listener is draining it
+        self.queue.put(self._sentinel)
+
+
+queue_handler: Optional[DroppingQueueHandler] = None
+log_listener: Optional[QueueListener] = None
+
+
+def enable_queue_logging(maxsize: int = LOG_QUEUE_SIZE) -> DroppingQueueHandler:
+    """
+    Move the file and console handlers behind a bounded queue and a listener thread, so logging
+    costs the calling thread one put. Records are dropped (and counted) while the queue is full.
+    """
+    global queue_handler, log_listener
+    if queue_handler is not None:
+        return queue_handler
+    log_queue = queue.Queue(maxsize)
+    queue_handler = DroppingQueueHandler(log_queue)
+    log_listener = _LogListener(log_queue, rotating_handler, console_handler, respect_handler_level=True)
+    scale_t_logger.removeHandler(rotating_handler)
+    scale_t_logger.removeHandler(console_handler)
+    scale_t_logger.addHandler(queue_handler)
+    log_listener.start()
+    return queue_handler
+
+
+def disable_queue_logging() -> None:
+    """Write out what is still queued and put the handlers back on the logger."""
+    global queue_handler, log_listener
+    if queue_handler is None:
+        return
+    scale_t_logger.removeHandler(queue_handler)
+    scale_t_logger.addHandler(rotating_handler)
+    scale_t_logger.addHandler(console_handler)
+    log_listener.stop()
+    queue_handler, log_listener = None, None
+
+
+if LOG_QUEUE:
+    enable_queue_logging()
+atexit.register(disable_queue_logging)
+
+
 def get_logger(name):
     """
     Return a child logger with the given name based on our custom logger.
     This allows for module-specific logging without affecting the global root logger.
     """
     return scale_t_logger.getChild(name)
+
+
+class SampledLogger:
+    """
+    Wraps a logger for statements that run on every tick. Each statement (keyed by its
+    message template, so pass arguments %-style) logs its first `first` calls in an interval,
+    then every `every`-th. When an interval ends with calls suppressed, the statement's next
+    line says how many. Calls below the logger's level cost one isEnabledFor check.
+
+    Meant for one thread, like the per-tick paths it is used on; counts from several threads
+    are approximate.
+    """
+
+    def __init__(self, logger: logging.Logger, first: int = LOG_SAMPLE_FIRST, every: int = LOG_SAMPLE_EVERY,
+                 interval_sec: float = LOG_SAMPLE_INTERVAL_SEC):
+        self.logger = logger
+        self.first = first
+        self.every = max(every, 1)
+        self.interval_sec = interval_sec
+        self._windows: Dict[str, List] = {}  # msg -> [interval start, calls, suppressed]
+
+    def debug(self, msg: str, *args) -> None:
+        self._log(logging.DEBUG, msg, args, 3)
+
+    def info(self, msg: str, *args) -> None:
+        self._log(logging.INFO, msg, args, 3)
+
+    def log(self, level: int, msg: str, *args) -> None:
+        self._log(level, msg, args, 2)
+
+    def _log(self, level: int, msg: str, args: tuple, stacklevel: int) -> None:
+        # stacklevel points the record at the line that called debug/info/log
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        window = self._windows.get(msg)
+        if window is None:
+            window = self._windows[msg] = [now, 0, 0]
+        elif now - window[0] >= self.interval_sec:
+            if window[2]:
+                self.logger.log(level, "Suppressed %d of %d \"%s\" lines in the last %.0fs",
+                                window[2], window[1], msg, now - window[0], stacklevel=stacklevel)
+            window[:] = [now, 0, 0]
+        window[1] += 1
+        calls = window[1]
+        if calls <= self.first or (calls - self.first) % self.every == 0:
+            self.logger.log(level, msg, *args, stacklevel=stacklevel)
+        else:
+            window[2] += 1
+
+    def suppressed(self) -> int:
+        """Lines suppressed in the current intervals, over every statement."""
+        return sum(window[2] for window in self._windows.values())
+
+
+def get_sampled_logger(name, **kwargs) -> SampledLogger:
+    """get_logger(name) wrapped in a SampledLogger, for per-tick log statements."""
+    return SampledLogger(get_logger(name), **kwargs)
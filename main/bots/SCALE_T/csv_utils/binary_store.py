@@ -0,0 +1,226 @@
+"""
+Fixed-width binary ladder store for the SCALE_T bot.
+
+An alternative on-disk format for very deep ladders: one struct-packed record per
+line, accessed through `mmap`. Loading is a single pass of `struct.unpack_from`
+calls with no CSV parsing, and a single-value change (e.g. held_shares after a fill)
+writes only that field's bytes. save() becomes an msync of the dirty pages.
+
+The CSV stays the human-editable format: `csv_tool` imports a CSV into the store
+and exports the store back to CSV.
+
+File layout (little-endian):
+    header: magic (8s), version (I), record size (I), row count (Q)
+    records: one per ladder line, in the order the lines were added
+
+Records are not moved when chase_price inserts a line at the top; the new record
+is appended and the ladder order is recovered on load by sorting on `index`.
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .ladder import Ladder, LadderValue, parse_value
+from .persister import fsync_dir
+from .storage import LadderStorage
+
+MAGIC = b"SCLTLADR"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ")
+
+# Record layout, in the ladder CSV column order. Text columns are NUL padded utf-8.
+RECORD_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("index", "q"),
+    ("buy_price", "d"),
+    ("sell_price", "d"),
+    ("target_shares", "d"),
+    ("held_shares", "d"),
+    ("pending_order_id", "40s"),
+    ("spc", "8s"),
+    ("unrealized_profit", "d"),
+    ("last_action", "20s"),
+    ("profit", "d"),
+)
+RECORD = struct.Struct("<" + "".join(code for _, code in RECORD_FIELDS))
+FIELDNAMES = [name for name, _ in RECORD_FIELDS]
+
+
+def _field_layout() -> Dict[str, Tuple[int, struct.Struct]]:
+    layout = {}
+    offset = 0
+    for name, code in RECORD_FIELDS:
+        field = struct.Struct("<" + code)
+        layout[name] = (offset, field)
+        offset += field.size
+    return layout
+
+
+FIELD_LAYOUT = _field_layout()
+TEXT_FIELDS = {name for name, code in RECORD_FIELDS if code.endswith("s")}
+
+
+def _encode(name: str, value: LadderValue):
+    if name not in TEXT_FIELDS:
+        return value
+    encoded = str(value).encode("utf-8")
+    if len(encoded) > FIELD_LAYOUT[name][1].size:
+        raise ValueError(f"Value too long for binary ladder column {name}: {value!r}")
+    return encoded
+
+
+def _decode(name: str, value) -> LadderValue:
+    if name in TEXT_FIELDS:
+        return value.rstrip(b"\0").decode("utf-8")
+    return value
+
+
+class BinaryLadderStore(LadderStorage):
+    """
+    mmap backed ladder file (StorageBackend.BINARY). CSVCore calls record_change/record_insert
+    from its ladder hooks and commit() from save().
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._file = None
+        self._mmap = None
+        self._capacity = 0
+        self._row_count = 0
+        self._record_by_slot: Dict[int, int] = {}
+        self._load_order: List[int] = []
+        # Until the file holds the current ladder, changes aren't written through
+        self._stale = True
+
+    @staticmethod
+    def supports(fieldnames: Iterable[str]) -> bool:
+        """Whether a ladder with these columns fits the record layout."""
+        return set(fieldnames) <= set(FIELDNAMES)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.filepath)
+
+    def load(self) -> Optional[List[Dict[str, LadderValue]]]:
+        """
+        Read every record and open the file for in-place updates.
+
+        Returns:
+            Optional[List[Dict[str, LadderValue]]]: Rows in ladder order, or None if there is no
+            binary file yet. Pass them to the csv_data setter, then call attach() so the ladder
+            slots line up with the records.
+
+        Raises:
+            ValueError: If the file isn't a binary ladder or has a different record layout.
+        """
+        if not self.exists():
+            return None
+        self.close()
+        self._open()
+        magic, version, record_size, row_count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"Not a version {VERSION} binary ladder file: {self.filepath}")
+        self._row_count = row_count
+        records = []
+        for record in range(row_count):
+            values = RECORD.unpack_from(self._mmap, HEADER.size + record * RECORD.size)
+            records.append({name: _decode(name, value) for name, value in zip(FIELDNAMES, values)})
+        self._load_order = sorted(range(row_count), key=lambda record: records[record]["index"])
+        return [records[record] for record in self._load_order]
+
+    def attach(self, ladder: Ladder, loaded: bool) -> None:
+        """
+        Map ladder slots to records after the rows returned by load() became csv_data,
+        or import a ladder that was read from the CSV.
+        """
+        if not loaded:
+            self.write_all(ladder)
+            return
+        self._record_by_slot = {slot: record for slot, record in enumerate(self._load_order)}
+        self._load_order = []
+        self._stale = False
+
+    def write_all(self, ladder: Ladder) -> None:
+        """
+        Replace the file with the whole ladder, via a temp file and an atomic rename,
+        and open it for in-place updates. Used to import a CSV and when csv_data is replaced.
+
+        Raises:
+            ValueError: If the ladder has columns the record layout can't hold.
+        """
+        if not self.supports(ladder.fieldnames):
+            extra = sorted(set(ladder.fieldnames) - set(FIELDNAMES))
+            raise ValueError(f"Binary ladder store can't hold columns: {extra}")
+        self.close()
+        tmp_path = f"{self.filepath}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(ladder)))
+            for row in ladder:
+                f.write(self._pack_row(row))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.filepath)
+        fsync_dir(self.filepath)
+        self._open()
+        self._row_count = len(ladder)
+        self._record_by_slot = {slot: record for record, slot in enumerate(ladder.slots())}
+        self._stale = False
+
+    # Driven by the CSVCore ladder hooks
+    def reset(self) -> None:
+        """The ladder was replaced wholesale; the next commit rewrites the file."""
+        self._stale = True
+
+    def record_change(self, slot: int, name: str, value: LadderValue) -> None:
+        """Overwrite a single field of a row in place."""
+        if self._stale:
+            return
+        offset, field = FIELD_LAYOUT[name]
+        field.pack_into(self._mmap, HEADER.size + self._record_by_slot[slot] * RECORD.size + offset, _encode(name, value))
+
+    def record_insert(self, ladder: Ladder, slot: int) -> None:
+        """Add a record for a newly inserted ladder row."""
+        if self._stale:
+            return
+        if self._row_count == self._capacity:
+            self._grow(max(16, self._capacity * 2))
+        record = self._row_count
+        offset = HEADER.size + record * RECORD.size
+        self._mmap[offset:offset + RECORD.size] = self._pack_row(ladder.row(slot))
+        self._row_count += 1
+        self._record_by_slot[slot] = record
+        HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, RECORD.size, self._row_count)
+
+    @staticmethod
+    def _pack_row(row) -> bytes:
+        """Pack a ladder row; columns the ladder doesn't have get their default value."""
+        return RECORD.pack(*(_encode(name, row.get(name, parse_value(name, None))) for name in FIELDNAMES))
+
+    def commit(self, ladder: Ladder) -> None:
+        """Make the in-place updates durable (msync), or rewrite the file if the ladder was replaced."""
+        if self._stale:
+            self.write_all(ladder)
+        elif self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        self._file = open(self.filepath, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._capacity = (len(self._mmap) - HEADER.size) // RECORD.size
+
+    def _grow(self, capacity: int) -> None:
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.truncate(HEADER.size + capacity * RECORD.size)
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._capacity = capacity
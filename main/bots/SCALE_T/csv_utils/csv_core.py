@@ -1,13 +1,22 @@
 from typing import Optional
-from ..common.constants import get_ticker_filepath
+from ..common.constants import get_binary_ladder_filepath, get_ticker_filepath
 from typing import List, Dict, Union
 import csv, os, json, time
+from math import fsum
 
 from ..common.constants import (
+    CSV_STORAGE_BACKEND,
     METADATA_FILE,
+    StorageBackend,
     TradingType
 )
-from ..csv_utils.csv_tool_helper import clip_decimal_place_shares
+from ..csv_utils.csv_tool_helper import carry_cash_over_lines
+from .binary_store import BinaryLadderStore
+from .journal import LadderJournal
+from .ladder import Ladder, LadderValue
+from .persister import LadderPersister
+from .sqlite_store import SQLiteLadderStore
+from .storage import LadderStorage
 
 class CSVCore:
     """
@@ -15,18 +24,126 @@ class CSVCore:
     This class provides core functionality that can be extended by specific CSV handlers.
     """
     
-    def __init__(self, ticker: str, trading_type: TradingType, custom_id: Optional[str] = None):
+    def __init__(self, ticker: str, trading_type: TradingType, custom_id: Optional[str] = None,
+                 storage: Optional[Union[StorageBackend, LadderStorage]] = None):
         self.ticker = ticker.upper()
         self.trading_type = trading_type
         self.custom_id = custom_id
         self.csv_filepath = get_ticker_filepath(self.ticker, self.trading_type, self.custom_id)
+        # Where the ladder lives between runs, defaults to CSV_STORAGE_BACKEND (see storage.py)
+        self.storage_backend = storage or CSV_STORAGE_BACKEND
+        self._storage = self._create_storage(self.storage_backend)
         self.metadata = self._load_metadata()
         self.required_columns = self._get_required_columns()
         self.csv_data = [] # Initialize to empty on start
 
+    def _create_storage(self, backend: Union[StorageBackend, LadderStorage]) -> Optional[LadderStorage]:
+        """The storage backend for this ladder, or None to read and rewrite the CSV directly."""
+        if isinstance(backend, LadderStorage):
+            return backend
+        if backend == StorageBackend.CSV_WRITE_BEHIND:
+            return LadderPersister(self.csv_filepath)
+        if backend == StorageBackend.JOURNAL:
+            return LadderJournal(self.csv_filepath)
+        if backend == StorageBackend.BINARY:
+            return BinaryLadderStore(get_binary_ladder_filepath(self.csv_filepath))
+        if backend == StorageBackend.SQLITE:
+            return SQLiteLadderStore(self.csv_filepath)
+        return None
+
+    @property
+    def csv_data(self) -> Ladder:
+        """The ladder rows, stored as typed columns."""
+        return self._csv_data
+
+    @csv_data.setter
+    def csv_data(self, rows) -> None:
+        """
+        Replace the ladder. Accepts any iterable of dict rows; values are parsed
+        to their column types here, once.
+
+        Raises:
+            ValueError: If a value can't be converted to its column type.
+        """
+        self._csv_data = Ladder.from_rows(rows, on_change=self._on_row_change, on_insert=self._on_row_insert)
+        if self._storage:
+            self._storage.reset()
+        self._rebuild_aggregates()
+        self._on_ladder_reset()
+
+    # Hooks for subclasses that keep derived data (indexes, aggregates) in sync with the ladder.
+    # Overrides of _on_row_change/_on_row_insert must call super() so the stores and aggregates see the change.
+    def _on_ladder_reset(self) -> None:
+        """Called after csv_data is replaced."""
+        pass
+
+    def _on_row_change(self, slot: int, column: str, old_value: LadderValue, new_value: LadderValue) -> None:
+        """Called after a single ladder value changes."""
+        if self._storage:
+            self._storage.record_change(slot, column, new_value)
+        if column in self._AGGREGATE_COLUMNS:
+            self._update_aggregates(slot, column, old_value, new_value)
+
+    def _on_row_insert(self, slot: int) -> None:
+        """Called after a row is added to the ladder."""
+        if self._storage:
+            self._storage.record_insert(self.csv_data, slot)
+        self._add_row_to_aggregates(slot)
+
+    # Ladder aggregates, kept in step with every change so the queries that use them are O(1)
+    _AGGREGATE_COLUMNS = ("held_shares", "target_shares", "buy_price", "pending_order_id")
+
+    def _rebuild_aggregates(self) -> None:
+        """Recompute the aggregates from scratch. O(n)."""
+        self._held_shares_total = 0.0
+        self._cash_value_total = 0.0
+        self._pending_order_slots = set()
+        ladder = self.csv_data
+        fieldnames = ladder.fieldnames
+        if "held_shares" in fieldnames:
+            self._held_shares_total = fsum(ladder.column("held_shares"))
+        if "target_shares" in fieldnames and "buy_price" in fieldnames:
+            self._cash_value_total = fsum(
+                shares * price for shares, price in zip(ladder.column("target_shares"), ladder.column("buy_price"))
+            )
+        if "pending_order_id" in fieldnames:
+            pending_order_ids = ladder.column("pending_order_id")
+            self._pending_order_slots = {slot for slot in ladder.slots() if pending_order_ids[slot] != "None"}
+
+    def _add_row_to_aggregates(self, slot: int) -> None:
+        row = self.csv_data.row(slot)
+        self._held_shares_total += row.get("held_shares", 0.0)
+        self._cash_value_total += row.get("target_shares", 0.0) * row.get("buy_price", 0.0)
+        if row.get("pending_order_id", "None") != "None":
+            self._pending_order_slots.add(slot)
+
+    def _update_aggregates(self, slot: int, column: str, old_value: LadderValue, new_value: LadderValue) -> None:
+        row = self.csv_data.row(slot)
+        if column == "held_shares":
+            self._held_shares_total += new_value - old_value
+        elif column == "target_shares":
+            self._cash_value_total += (new_value - old_value) * row.get("buy_price", 0.0)
+        elif column == "buy_price":
+            self._cash_value_total += (new_value - old_value) * row.get("target_shares", 0.0)
+        elif new_value != "None":
+            self._pending_order_slots.add(slot)
+        else:
+            self._pending_order_slots.discard(slot)
+
+    def _on_ladder_renumber(self) -> None:
+        """Called after every row's index has been rewritten by _renumber_rows."""
+        pass
+
+    def _renumber_rows(self) -> None:
+        """Set each row's index to its position in the ladder (top line is 0)."""
+        for position, row in enumerate(self.csv_data):
+            row["index"] = position
+        self._on_ladder_renumber()
+
     def _load_csv_data(self) -> List[Dict[str, Union[str, float, int]]]:
         """
         Load CSV data from the given filepath. (PEP 8 naming for internal method)
+        Values are parsed into typed columns here so the hot paths never re-parse strings.
 
         Args:
             filepath (str): The path to the CSV file.
@@ -35,10 +152,15 @@ class CSVCore:
             List[Dict[str, Union[str, float, int]]]: A list of dictionaries representing the CSV data.
         """
         try:
-            with open(self.csv_filepath, 'r') as f:
-                reader = csv.DictReader(f)
-                data = list(reader)
-                self.csv_data = data
+            stored_rows = self._storage.load() if self._storage else None
+            if stored_rows is not None:
+                self.csv_data = stored_rows
+            else:
+                with open(self.csv_filepath, 'r') as f:
+                    reader = csv.DictReader(f)
+                    self.csv_data = reader
+            if self._storage:
+                self._storage.attach(self.csv_data, loaded=stored_rows is not None)
             self.validate_csv_data()
         except FileNotFoundError:
             print(f"File not found: {self.csv_filepath}")
@@ -97,12 +219,7 @@ class CSVCore:
             if required_col not in column_names:
                 raise ValueError(f"Validation failed: Missing required column: {required_col}") # Debugging
 
-        # 2. Basic data type checks
-        for row in self.csv_data:
-            int(row.get('index', 0))  # Check if index is integer-like
-            float(row.get('target_shares', 0)) # Check if target_shares is numeric
-            float(row.get('buy_price', 0)) # Check if buy_price is float-like
-            float(row.get('sell_price', 0)) # Check if sell_price is float-like
+        # 2. Data types are checked when the rows are parsed into the ladder (see csv_data setter)
 
     def _get_column_names(self) -> List[str]:
         """
@@ -113,7 +230,7 @@ class CSVCore:
         """
         if not self.csv_data:
             return []  # Return empty list if no data loaded
-        return list(self.csv_data[0].keys()) # Get keys from the first row
+        return list(self.csv_data.fieldnames)
 
     def _save_csv_data(self, filepath: str, data: List[Dict[str, Union[str, float, int]]]) -> None:
         """
@@ -137,9 +254,31 @@ class CSVCore:
         Save the CSV data to file. (Public method)
 
         This method is used to save the current CSV data to the file.
-        It calls the internal _save_csv_data method to perform the actual saving.
+        It calls the internal _save_csv_data method to perform the actual saving,
+        or commits to the storage backend (journal append, mmap msync, SQLite transaction).
+        With StorageBackend.CSV_WRITE_BEHIND it returns straight away and the write happens
+        in the background; use flush() where the save must be on disk before continuing.
         """
-        self._save_csv_data(self.csv_filepath, self.csv_data)
+        if self._storage:
+            self._storage.commit(self.csv_data)
+        else:
+            self._save_csv_data(self.csv_filepath, self.csv_data)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every save() so far is on disk. Only write-behind saves can be outstanding.
+
+        Returns:
+            bool: False if the timeout ran out before the write finished, or it failed.
+        """
+        if self._storage:
+            return self._storage.flush(timeout)
+        return True
+
+    def close(self) -> None:
+        """Finish outstanding writes and stop the background writers."""
+        if self._storage:
+            self._storage.close()
 
     # Total cash value of all lines
     def get_total_cash_value(self) -> float:
@@ -149,16 +288,20 @@ class CSVCore:
         Returns:
             float: The total cash value.
         """
-        total_value = 0
-        for row in self.csv_data:
-            total_value += float(row.get('target_shares', 0)) * float(row.get('buy_price', 0))
-        return total_value
+        if not self.csv_data:
+            return 0
+        return self._cash_value_total
 
-    def chase_price(self, context: Dict[str, Union[str, float, int]]):
+    def chase_price(self, context: Dict[str, Union[str, float, int]], catch_up: bool = False):
         """
         Before this function is called, a check for
         1. No held shared in csv should be done
         2. No pending orders in csv
+
+        Moves the top of the ladder up by $0.01. With catch_up, keeps stepping by $0.01
+        until the top line is within a cent of current_price, so a gap up is chased in one
+        call: the final top line and inserted lines are worked out first, then the ladder
+        is rebalanced and saved once.
         """
         # Get the current price from the context
         current_price = context["current_price"]
@@ -168,10 +311,10 @@ class CSVCore:
 
         # Do the appropriate checks to see if price is chasable
         # Chasable in the sense that current price is more than .01 of buy_price at index 0
-        if not float(self.csv_data[0]["buy_price"])+0.01 < current_price:
+        if not self.csv_data[0]["buy_price"]+0.01 < current_price:
             # Handle unchasable lines
-            print(f'Current price {current_price} is not greater than buy price {self.csv_data[0]["buy_price"]} + 0.01')
-            print(f"Not chasing price, current price {current_price} is not greater than buy price {self.csv_data[0]['buy_price']}")
+            self._log_chase("Not chasing price, current price %s is not greater than buy price %s + 0.01",
+                            current_price, self.csv_data[0]["buy_price"])
             return
         # Proceed with chasable lines        
         # Because of the sliding lock of the top line we need to compare with second line to ensure lock limit
@@ -182,28 +325,39 @@ class CSVCore:
         # We still keep the check for the first line having a difference of .5% between buy and sell price
         first_line = self.csv_data[0]
         second_line = self.csv_data[1]
-        buy_price = float(first_line["buy_price"])
-        sell_price = float(first_line["sell_price"])
-        # Check that the difference is close to .5%
-        precentage_diff = abs((sell_price - buy_price) / buy_price)
-        if precentage_diff < 0.004: # Keep it at .4% for now as its close to .5%
-            print(f"Unexpected price difference {precentage_diff}, not chasing")
-            return
-        
         # Get total cash value from all lines combined
         total_cash_value = self.get_total_cash_value()
-        new_buy_price = round(float(first_line["buy_price"]) + 0.01, 2)
-        new_sell_price = round(new_buy_price * (1 + 0.005), 2)
-        # Check that the second line and first line are locked at buy and sell price
-        if abs((float(second_line["sell_price"]) - float(first_line["buy_price"])) != 0):
-            print(f"First line and second line are not locked, shifting first line up")
-            # shift row 1 buy price up by .01 cents and sell price be .5% of buy price
-            # new_buy_price = round(float(first_line["buy_price"]) + 0.01, 2)
-            first_line["buy_price"] = new_buy_price
-            first_line["sell_price"] = new_sell_price
-        else :
-            print(f"First line and second line are locked inserting new line")
-            # We need a new line at the top that copies the first line and shifts the diff
+
+        # [buy_price, sell_price] of the first line and of each line inserted above it, top line last.
+        # Only these prices change while chasing, so the steps are worked out here and applied once.
+        top_lines = [[first_line["buy_price"], first_line["sell_price"]]]
+        locked_sell_price = second_line["sell_price"]
+        steps = 0
+        while top_lines[-1][0] + 0.01 < current_price and (catch_up or steps == 0):
+            buy_price, sell_price = top_lines[-1]
+            # Check that the difference is close to .5%
+            precentage_diff = abs((sell_price - buy_price) / buy_price)
+            if precentage_diff < 0.004: # Keep it at .4% for now as its close to .5%
+                print(f"Unexpected price difference {precentage_diff}, not chasing")
+                break
+            new_buy_price = round(buy_price + 0.01, 2)
+            new_sell_price = round(new_buy_price * (1 + 0.005), 2)
+            # Check that the line below and the top line are locked at buy and sell price
+            if locked_sell_price != buy_price:
+                # shift the top line's buy price up by .01 cents and sell price be .5% of buy price
+                top_lines[-1] = [new_buy_price, new_sell_price]
+            else:
+                # We need a new line at the top that copies the top line and shifts the diff
+                locked_sell_price = sell_price
+                top_lines.append([new_buy_price, new_sell_price])
+            steps += 1
+        if not steps:
+            return
+
+        self._log_chase("Chased %d cent(s): shifting first line up, inserting %d new line(s)", steps, len(top_lines) - 1)
+        first_line["buy_price"], first_line["sell_price"] = top_lines[0]
+        last_action = self._get_epoch_time()
+        for new_buy_price, new_sell_price in top_lines[1:]:
             new_line = {
                 "index": 0,
                 "buy_price": new_buy_price,
@@ -213,20 +367,23 @@ class CSVCore:
                 "pending_order_id": "None",
                 "spc": "N",
                 "unrealized_profit": 0,
-                "last_action": self._get_epoch_time(),
+                "last_action": last_action,
                 "profit": 0
             }
-            # Shift all other lines up an index by 1
-            for i in range(len(self.csv_data)):
-                # Shift the index of the line
-                self.csv_data[i]["index"] = i + 1
-            # Set the new line at index 0, need to not loose the first line
+            # Set the new line at index 0; all other lines shift down
             self.csv_data.insert(0, new_line)
+        if len(top_lines) > 1:
+            # Shift all other lines up an index
+            self._renumber_rows()
         
         # need to rebalance cash value of all lines
-        print(f"Rebalancing cash value of all lines")
+        self._log_chase("Rebalancing cash value of all lines")
         self.even_redistribution(total_cash_value)
 
+    def _log_chase(self, msg: str, *args) -> None:
+        """Report a chase_price step; CSVService logs these sampled, as they can come every tick."""
+        print(msg % args)
+
     def even_redistribution(self, total_cash: float) -> None:
         """
         Distribute cash evenly across all lines.
@@ -239,31 +396,21 @@ class CSVCore:
             print("No lines to redistribute cash to.")
             return
         
-        # Calculate the cash per line
-        cash_per_line = total_cash / num_lines
-        extra_dollars = 0
-        # Distribute the cash
-        for row in self.csv_data:
-            # Get the current buy price
-            buy_price = float(row["buy_price"])
-            # Calculate the number of shares to buy
-            intended_shares = (cash_per_line + extra_dollars) / buy_price
-            # Get the clipped extra shares
-            extra_shares = clip_decimal_place_shares(buy_price, intended_shares)
-            # take out the extra shares
-            intended_shares -= extra_shares
-            #Put the extra shares back into the extra dollars
-            extra_dollars = extra_shares * buy_price
-            # set the target shares
-            row["target_shares"] = intended_shares
+        # Calculate the cash per line and the target shares for every line in one pass
+        ladder = self.csv_data
+        slots = ladder.slots()
+        buy_price_column = ladder.column("buy_price")
+        buy_prices = [buy_price_column[slot] for slot in slots]
+        target_shares, extra_dollars = carry_cash_over_lines(buy_prices, total_cash / num_lines)
 
         # If there are any extra dollars left, add them to the last line
         if extra_dollars:
-            last_row = self.csv_data[-1]
-            last_row["target_shares"] += extra_dollars / float(last_row["buy_price"])
-            last_row["spc"] = "last"
+            target_shares[-1] += extra_dollars / buy_prices[-1]
+            ladder.set_value(slots[-1], "spc", "last")
+        for slot, shares in zip(slots, target_shares):
+            ladder.set_value(slot, "target_shares", shares)
         # Save the updated CSV data
-        self._save_csv_data(self.csv_filepath, self.csv_data)
+        self.save()
         
     def is_chasable_lines(self, current_price=None):
         """
@@ -276,16 +423,15 @@ class CSVCore:
         if not self.csv_data or not current_price:
             return False
         # Check if the first line has shares
-        if float(self.csv_data[0]["held_shares"]) > 0:
+        if self.csv_data[0]["held_shares"] > 0:
             return False
         # Check if current_price is not greater than index 0's buy_price
-        if float(self.csv_data[0]["buy_price"]) >= float(current_price):
+        if self.csv_data[0]["buy_price"] >= float(current_price):
             return False
 
         # Check if there are any pending orders
-        for row in self.csv_data:
-            if row["pending_order_id"] != "None":
-                return False
+        if self._pending_order_slots:
+            return False
         return True        
 
     def _get_epoch_time(self):
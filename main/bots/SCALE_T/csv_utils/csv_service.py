@@ -2,24 +2,31 @@
 CSV Manager for SCALE_T bot.
 
 This module provides functionality to manage CSV files containing trading data.
-It handles reading, validation, and updating of CSV data using dictionary-based operations.
+It handles reading, validation, and updating of CSV data using dictionary-style row views
+over the typed ladder columns.
 """
 
-from typing import Dict, Optional, Union
+from bisect import bisect_left, bisect_right, insort
+from math import inf, nextafter
+from typing import Dict, List, Optional, Tuple, Union
 from .csv_core import CSVCore
+from .ladder import LadderRow
+from .storage import LadderStorage
 
 
-from ..common.logging_config import get_logger
-from ..common.constants import TradingType
+from ..common.logging_config import get_logger, get_sampled_logger
+from ..common.constants import StorageBackend, TradingType
 
 class CSVService(CSVCore):
     """
     Manages CSV data for SCALE_T trading strategy.
     Handles reading, validation, and updating of CSV files containing trading data.
-    Uses dictionary-based operations for data manipulation.
+    Rows are dictionary-style views over typed columns (see ladder.py), so values are
+    already floats/ints and don't need parsing on the hot path.
     """
 
-    def __init__(self, ticker: str, trading_type: TradingType, custom_id: Optional[str] = None):
+    def __init__(self, ticker: str, trading_type: TradingType, custom_id: Optional[str] = None,
+                 storage: Optional[Union[StorageBackend, LadderStorage]] = None):
         """
         Initialize CSVService with ticker and trading type.
 
@@ -27,12 +34,15 @@ class CSVService(CSVCore):
             ticker (str): Stock ticker symbol (e.g., 'AAPL')
             trading_type (str): Either 'paper' or 'live' trading
             custom_id (Optional[str]): Optional custom identifier for the CSV file
+            storage (Optional[Union[StorageBackend, LadderStorage]]): Where the ladder is stored, defaults to
+                CSV_STORAGE_BACKEND. A LadderStorage instance is used as is (e.g. MemoryLadderStorage for backtests)
 
         Raises:
             ValueError: If trading_type is invalid
         """
-        super().__init__(ticker, trading_type, custom_id)
+        super().__init__(ticker, trading_type, custom_id, storage)
         self.logger = get_logger("csv_service")
+        self.tick_logger = get_sampled_logger("csv_service")  # chase_price steps, see _log_chase
         self.logger.info(f"Initializing CSVService for {self.ticker} ({self.trading_type}) with custom_id: {self.custom_id}")
         # Load metadata and get required columns``
         self.csv_data = [] # Initialize to empty list
@@ -42,20 +52,99 @@ class CSVService(CSVCore):
             raise ValueError("CSV data not found. CSVService initialization failed.")
         self.logger.info(f"CSVService initialized successfully.")
 
-    def get_row_by_index(self, index: int) -> Optional[Dict[str, Union[str, float, int]]]:
+    # Price index maintenance, driven by the ladder hooks from CSVCore
+    # Buy keys are (-buy_price, slot) so the highest buy price comes first
+    # Sell keys are (sell_price, slot) so the lowest sell price comes first
+    _PRICE_INDEX_COLUMNS = ("buy_price", "sell_price", "held_shares", "target_shares")
+
+    def _on_ladder_reset(self) -> None:
+        self._rebuild_price_index()
+        self._rebuild_row_index()
+        self._idle_band = None
+
+    def _on_row_change(self, slot, column, old_value, new_value) -> None:
+        super()._on_row_change(slot, column, old_value, new_value)
+        self._idle_band = None
+        if column in self._PRICE_INDEX_COLUMNS:
+            self._update_price_index(slot)
+        elif column == "index":
+            if self._slot_by_index.get(old_value) == slot:
+                del self._slot_by_index[old_value]
+            self._slot_by_index[new_value] = slot
+
+    def _on_row_insert(self, slot) -> None:
+        super()._on_row_insert(slot)
+        self._idle_band = None
+        self._update_price_index(slot)
+        if "index" in self.csv_data.fieldnames:
+            self._slot_by_index[self.csv_data.get_value(slot, "index")] = slot
+
+    def _on_ladder_renumber(self) -> None:
+        self._rebuild_row_index()
+
+    def _rebuild_row_index(self) -> None:
+        """Rebuild the ladder index -> slot map. The first row wins if an index is duplicated."""
+        self._slot_by_index: Dict[int, int] = {}
+        if "index" not in self.csv_data.fieldnames:
+            return
+        index_column = self.csv_data.column("index")
+        for slot in reversed(self.csv_data.slots()):
+            self._slot_by_index[index_column[slot]] = slot
+
+    def _rebuild_price_index(self) -> None:
+        """Rebuild the buy/sell price index from scratch. O(n log n)."""
+        self._buy_keys: List[Tuple[float, int]] = []
+        self._sell_keys: List[Tuple[float, int]] = []
+        self._price_keys_by_slot: Dict[int, Tuple[Optional[Tuple[float, int]], Optional[Tuple[float, int]]]] = {}
+        for slot in self.csv_data.slots():
+            self._update_price_index(slot)
+
+    def _update_price_index(self, slot: int) -> None:
+        """
+        Re-file a single row in the price index after its prices or shares changed.
+
+        A row sits in the buy index while held_shares < target_shares and
+        in the sell index while held_shares > 0.
+        """
+        old_buy_key, old_sell_key = self._price_keys_by_slot.pop(slot, (None, None))
+        if old_buy_key is not None:
+            self._remove_price_key(self._buy_keys, old_buy_key)
+        if old_sell_key is not None:
+            self._remove_price_key(self._sell_keys, old_sell_key)
+
+        row = self.csv_data.row(slot)
+        held_shares = row.get("held_shares", 0.0)
+        buy_key = None
+        sell_key = None
+        if held_shares < row.get("target_shares", 0.0):
+            buy_key = (-row["buy_price"], slot)
+            insort(self._buy_keys, buy_key)
+        if held_shares > 0:
+            sell_key = (row["sell_price"], slot)
+            insort(self._sell_keys, sell_key)
+        self._price_keys_by_slot[slot] = (buy_key, sell_key)
+
+    @staticmethod
+    def _remove_price_key(keys, key) -> None:
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def get_row_by_index(self, index: int) -> Optional[LadderRow]:
         """
         Get a row from the CSV data by index. (Public method)
+        O(1) lookup through the maintained index -> slot map.
 
         Args:
             index (int): The index of the row to retrieve.
 
         Returns:
-            Optional[Dict[str, Union[str, float, int]]]: The row data, or None if not found.
+            Optional[LadderRow]: The row data, or None if not found.
         """
-        for row in self.csv_data:
-            if str(row.get('index')) == str(index):
-                return row
-        return None
+        slot = self._slot_by_index.get(int(index))
+        if slot is None:
+            return None
+        return self.csv_data.row(slot)
 
     def _get_total_row_count(self) -> int:
         """
@@ -70,34 +159,69 @@ class CSVService(CSVCore):
         """
         Gets the number of shares currently held from the CSV data.
         """
-        total_held_shares = 0
-        for row in self.csv_data:
-            total_held_shares += float(row.get('held_shares', 0))  # Default to 0 if not found or invalid
-        return round(total_held_shares, 5)
+        if not self.csv_data:
+            return 0
+        return round(self._held_shares_total, 5)
 
     def get_pending_order_info(self):
         """
         Gets the pending order ID and its index from the CSV data.
-        Iterates through all rows and returns the first non-empty pending_order_id found.
+        Returns the top-most row with a pending_order_id, using the maintained set of pending rows.
         """
-        for index, row in enumerate(self.csv_data):
-            if "pending_order_id" in row and row["pending_order_id"] != "None":
-                return {"order_id": row["pending_order_id"], "index": index}
-        return None
+        if not self._pending_order_slots:
+            return None
+        row = min((self.csv_data.row(slot) for slot in self._pending_order_slots), key=lambda row: row["index"])
+        return {"order_id": row["pending_order_id"], "index": row["index"]}
+
+    def get_trigger_thresholds(self) -> Tuple[float, float, float]:
+        """
+        The prices at which the ladder would act, from the price index and aggregates. O(1).
+
+        Returns:
+            Tuple[float, float, float]: (buy_at_or_below, sell_at_or_above, chase_above)
+                - get_rows_for_buy(price) is non-empty iff price <= buy_at_or_below
+                - get_rows_for_sell(price) is non-empty iff price >= sell_at_or_above
+                - is_chasable_lines(price) is True iff price > chase_above
+                A trigger that can't fire is -inf (buy) or inf (sell, chase).
+        """
+        buy_at_or_below = -self._buy_keys[0][0] if self._buy_keys else -inf
+        sell_at_or_above = self._sell_keys[0][0] if self._sell_keys else inf
+        chase_above = inf
+        if self.csv_data and not self._pending_order_slots and self.csv_data[0]["held_shares"] <= 0:
+            chase_above = self.csv_data[0]["buy_price"]
+        return buy_at_or_below, sell_at_or_above, chase_above
+
+    def get_idle_band(self) -> Tuple[float, float]:
+        """
+        Open price interval (low, high) in which a tick can't trigger a buy, sell or chase.
+        Cached until the ladder changes, so DecisionMaker can drop idle ticks with two compares.
+        """
+        if self._idle_band is None:
+            buy_at_or_below, sell_at_or_above, chase_above = self.get_trigger_thresholds()
+            # price > chase_above is the same as price >= the next float up, so sell and chase share one bound
+            self._idle_band = (buy_at_or_below, min(sell_at_or_above, nextafter(chase_above, inf)))
+        return self._idle_band
 
     def get_rows_for_buy(self, current_price):
-        return [
-            row
-            for row in self.csv_data
-            if float(row["buy_price"]) >= current_price and float(row["held_shares"]) < float(row["target_shares"])
-        ]
+        """
+        Rows with buy_price >= current_price that still need shares, in ladder order.
+        Uses the price index, O(log n + k) for k matching rows.
+        """
+        end = bisect_right(self._buy_keys, (-current_price, inf))
+        rows = [self.csv_data.row(slot) for _, slot in self._buy_keys[:end]]
+        return sorted(rows, key=lambda row: row["index"])
 
     def get_rows_for_sell(self, current_price):
-        return [
-            row
-            for row in self.csv_data
-            if float(row["sell_price"]) <= current_price and float(row["held_shares"]) > 0
-        ]
+        """
+        Rows with sell_price <= current_price that hold shares, in ladder order.
+        Uses the price index, O(log n + k) for k matching rows.
+        """
+        end = bisect_right(self._sell_keys, (current_price, inf))
+        rows = [self.csv_data.row(slot) for _, slot in self._sell_keys[:end]]
+        return sorted(rows, key=lambda row: row["index"])
+
+    def _log_chase(self, msg: str, *args) -> None:
+        self.tick_logger.info(msg, *args)
 
     # Instead of distributing shares bottom up for buys and top down for sells, do the opposite
     def update_order_status(self, index, filled_qty, filled_avg_price, side):
@@ -121,21 +245,21 @@ class CSVService(CSVCore):
                 for i in range(0, index+1):
                     current_row = self.get_row_by_index(i)
                     if current_row:
-                        assignable = min(filled_qty, float(current_row['target_shares']) - float(current_row['held_shares']))
+                        assignable = min(filled_qty, current_row['target_shares'] - current_row['held_shares'])
                         if assignable > 0:
                             self.logger.debug(f"Assigning {assignable} shares to index {i}, filled_qty: {filled_qty}")
-                            prev_held_shares = float(current_row['held_shares'])
+                            prev_held_shares = current_row['held_shares']
                             current_row['held_shares'] = round(prev_held_shares + assignable, 5)
                             filled_qty -= assignable
                             self.logger.debug(f"After assignment, filled_qty: {filled_qty}")
                             #update unrealized profit
                             if prev_held_shares > 0:
-                                existing_unrealized = float(current_row.get('unrealized_profit', 0))
+                                existing_unrealized = current_row.get('unrealized_profit', 0.0)
                             else:
                                 existing_unrealized = 0.0
                             self.logger.debug(f"Before unrealized profit update, existing: {existing_unrealized}")
                             #Add unrealized profit for the new shares
-                            new_unrealized = (float(current_row['buy_price']) - float(filled_avg_price)) * assignable
+                            new_unrealized = (current_row['buy_price'] - float(filled_avg_price)) * assignable
                             current_row['unrealized_profit'] = round(existing_unrealized + new_unrealized, 2)
                             self.logger.debug(f"After unrealized profit update, new: {current_row['unrealized_profit']}")
                             current_row['last_action'] = time_now
@@ -149,16 +273,16 @@ class CSVService(CSVCore):
                 for i in range(self._get_total_row_count()-1, index-1, -1):
                     current_row = self.get_row_by_index(i)
                     if current_row:
-                        sellable = min(filled_qty, float(current_row['held_shares']))
+                        sellable = min(filled_qty, current_row['held_shares'])
                         if sellable > 0:
                             self.logger.debug(f"Selling {sellable} shares from index {i}, filled_qty: {filled_qty}")
-                            prev_held_shares = float(current_row['held_shares'])
+                            prev_held_shares = current_row['held_shares']
                             current_row['held_shares'] = round(prev_held_shares - sellable, 5)
                             filled_qty -= sellable
-                            prev_unrealised_profit = float(current_row.get('unrealized_profit', 0))
+                            prev_unrealised_profit = current_row.get('unrealized_profit', 0.0)
                             current_row['unrealized_profit'] = 0.0
-                            sale_profit = (float(filled_avg_price) - float(current_row['buy_price'])) * sellable
-                            previous_profit = float(current_row.get('profit'))
+                            sale_profit = (float(filled_avg_price) - current_row['buy_price']) * sellable
+                            previous_profit = current_row.get('profit')
                             self.logger.debug(f"Before profit update, existing unrealized: {prev_unrealised_profit}, sale_profit: {sale_profit}, previous_profit: {previous_profit}")
                             current_row['profit'] = round(prev_unrealised_profit + sale_profit+previous_profit,2)
                             self.logger.debug(f"After sale, profit: {current_row['profit']}")
@@ -5,10 +5,14 @@ This module contains the CSVWorker class which provides functionality for
 processing and manipulating CSV data according to the SCALE_T strategy.
 """
 
+import csv
 from typing import Dict, Optional, Union
-from main.bots.SCALE_T.common.constants import TradingType
+from main.bots.SCALE_T.common.constants import StorageBackend, TradingType, get_binary_ladder_filepath
+from main.bots.SCALE_T.csv_utils.binary_store import BinaryLadderStore
 from main.bots.SCALE_T.csv_utils.csv_core import CSVCore
-from main.bots.SCALE_T.csv_utils.csv_tool_helper import find_least_decimal_digit_for_shares, clip_decimal_place_shares
+from main.bots.SCALE_T.csv_utils.ladder import Ladder
+from main.bots.SCALE_T.csv_utils.sqlite_store import SQLiteLadderStore, read_ladder_rows
+from main.bots.SCALE_T.csv_utils.csv_tool_helper import build_ladder_rows, find_least_decimal_digit_for_shares
 from main.bots.SCALE_T.csv_utils.csv_tool_prompts import (
     create_csv_questionaire, get_information_on_csv_questionaire, update_csv_questionaire
 )
@@ -16,7 +20,8 @@ from main.bots.SCALE_T.csv_utils.csv_tool_prompts import (
 # Usable by Nanny, Usable by csv_tool loop below
 class CSVWorker(CSVCore):
     def __init__(self, ticker: str, trading_type: str, custom_id: Optional[str] = None):
-        super().__init__(ticker, trading_type, custom_id)
+        # The tool always works on the human-editable CSV; see the import_/export_ methods for the other stores
+        super().__init__(ticker, trading_type, custom_id, storage=StorageBackend.CSV)
         # Try to load csv, capturing success or failure through data or something
         # Think through the return types and how useful it works downstream
 
@@ -28,60 +33,55 @@ class CSVWorker(CSVCore):
 
         risk_type = answers["risk_type"]
         percentage_diff = answers["percentage_diff"]
-        assert percentage_diff < 1, "Percentage difference must be less than 1"
         starting_buy_price = answers["starting_buy_price"]
         distribution_style = answers["distribution_style"] # will be needed when we do uneven distributions
 
         # decide base number of lines based on risk type
-        num_lines = int(risk_type*100)
-
-        current_sell_price = round(starting_buy_price * (1 + (percentage_diff)), 2)
-        dollar_per_line = answers["total_cash"] / num_lines
-        print(f"dollar per line is {dollar_per_line}")
-        extra_dollars = 0
-        last_row = None
-        # Create the line by line creation loop for the list of dicts
-        for i in range(num_lines):
-            row = {}
-            row["index"] = i
-            buy_price = round(current_sell_price * (1 - percentage_diff), 2)
-            row["buy_price"] = buy_price
-            row["sell_price"] = current_sell_price
-            # Calculate the number of shares to buy
-            # Split extra dollars across lines left
-            lines_left = num_lines - i
-            # Calculate extra for this line
-            extra_for_this_line = extra_dollars / lines_left
-            extra_dollars -= extra_for_this_line
-            dollar_for_this_line = dollar_per_line + extra_for_this_line
-            # Calculate the intended shares
-            intended_shares = dollar_for_this_line / buy_price
-            # Get the clipped extra shares
-            extra_shares = clip_decimal_place_shares(buy_price, intended_shares)
-            # take out the extra shares
-            intended_shares -= extra_shares
-            #Put the extra shares back into the extra dollars
-            extra_dollars += extra_shares * buy_price
-            # set the target shares
-            row["target_shares"] = intended_shares
-            row["held_shares"] = 0
-            row["pending_order_id"] = "None"
-            row["spc"] = "N"
-            row["unrealized_profit"] = 0
-            row["last_action"] = self._get_epoch_time()
-            row["profit"] = 0
-            
-            last_row = row
-            self.csv_data.append(row)
-            current_sell_price = buy_price
-
-        if extra_dollars:
-            last_row["target_shares"] += extra_dollars/last_row['buy_price']
-            last_row["spc"] = "last"
+        print(f"dollar per line is {answers['total_cash'] / int(risk_type*100)}")
+        # Prices and shares for every line in one pass each; see csv_tool_helper
+        self.csv_data = build_ladder_rows(
+            starting_buy_price, percentage_diff, risk_type, answers["total_cash"], self._get_epoch_time()
+        )
 
         # Save the list of dicts to the csv file
         self.save()
 
+    def import_csv_to_binary(self) -> str:
+        """Write the ticker CSV into the binary ladder store, replacing it. Returns the store path."""
+        with open(self.csv_filepath, 'r') as f:
+            ladder = Ladder.from_rows(csv.DictReader(f))
+        store = BinaryLadderStore(get_binary_ladder_filepath(self.csv_filepath))
+        store.write_all(ladder)
+        store.close()
+        return store.filepath
+
+    def export_binary_to_csv(self) -> str:
+        """Write the binary ladder store out to the ticker CSV, replacing it. Returns the CSV path."""
+        store = BinaryLadderStore(get_binary_ladder_filepath(self.csv_filepath))
+        rows = store.load()
+        store.close()
+        if rows is None:
+            raise FileNotFoundError(f"File not found: {store.filepath}")
+        self._save_csv_data(self.csv_filepath, rows)
+        return self.csv_filepath
+
+    def import_csv_to_sqlite(self) -> str:
+        """Write the ticker CSV into its SQLite ladder table, replacing it. Returns the database path."""
+        with open(self.csv_filepath, 'r') as f:
+            ladder = Ladder.from_rows(csv.DictReader(f))
+        store = SQLiteLadderStore(self.csv_filepath)
+        store.commit(ladder)
+        store.close()
+        return store.db_path
+
+    def export_sqlite_to_csv(self) -> str:
+        """Write the SQLite ladder table out to the ticker CSV, replacing it. Returns the CSV path."""
+        rows = read_ladder_rows(self.csv_filepath)
+        if rows is None:
+            raise FileNotFoundError(f"No SQLite ladder for {self.csv_filepath}")
+        self._save_csv_data(self.csv_filepath, rows)
+        return self.csv_filepath
+
     def get_information(self):
         # Place holder
         pass
@@ -101,10 +101,27 @@ if __name__ == "__main__":
     parser.add_argument("--trading-type", type=TradingType, 
                         default=TradingType.PAPER, choices=[TradingType.LIVE, TradingType.PAPER], help="Trading type (paper or live)")
     parser.add_argument("--custom-id", type=str, help="Optional custom identifier for the CSV file")
+    parser.add_argument("--import-binary", action="store_true", help="Import the CSV into the binary ladder store and exit")
+    parser.add_argument("--export-binary", action="store_true", help="Export the binary ladder store to the CSV and exit")
+    parser.add_argument("--import-sqlite", action="store_true", help="Import the CSV into the SQLite ladder store and exit")
+    parser.add_argument("--export-sqlite", action="store_true", help="Export the SQLite ladder store to the CSV and exit")
     args = parser.parse_args()
     
     # Initialize and use CSVWorker
     worker = CSVWorker(args.ticker, args.trading_type, args.custom_id)
+
+    if args.import_binary:
+        print(f"Imported {worker.csv_filepath} into {worker.import_csv_to_binary()}")
+        raise SystemExit(0)
+    if args.export_binary:
+        print(f"Exported binary ladder to {worker.export_binary_to_csv()}")
+        raise SystemExit(0)
+    if args.import_sqlite:
+        print(f"Imported {worker.csv_filepath} into {worker.import_csv_to_sqlite()}")
+        raise SystemExit(0)
+    if args.export_sqlite:
+        print(f"Exported SQLite ladder to {worker.export_sqlite_to_csv()}")
+        raise SystemExit(0)
     
     # Validation error out failure
     try :
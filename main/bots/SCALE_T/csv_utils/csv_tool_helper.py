@@ -1,3 +1,5 @@
+from typing import Dict, List, Tuple, Union
+
 
 
 
@@ -21,3 +23,82 @@ def clip_decimal_place_shares(buy_price: float, target_shares: float, dollar_cli
     clip_shares = dollar_clip / buy_price
     return target_shares % clip_shares # returning the shares to subtract
 
+
+
+# Buy and sell prices for a new ladder, top line first. Each line's sell price
+# is the buy price of the line above and its buy price is that less
+# percentage_diff, rounded to the cent. The rounding makes every line depend on
+# the one above, so this is one scalar pass rather than array math.
+def build_price_ladder(starting_buy_price: float, percentage_diff: float, num_lines: int) -> Tuple[List[float], List[float]]:
+    buy_factor = 1 - percentage_diff
+    sell_price = round(starting_buy_price * (1 + percentage_diff), 2)
+    buy_prices = [0.0] * num_lines
+    sell_prices = [0.0] * num_lines
+    for i in range(num_lines):
+        buy_price = round(sell_price * buy_factor, 2)
+        buy_prices[i] = buy_price
+        sell_prices[i] = sell_price
+        sell_price = buy_price
+    return buy_prices, sell_prices
+
+
+# Target shares for a new ladder (create_csv). Every line gets dollar_per_line,
+# clipped with clip_decimal_place_shares; the clipped dollars are spread evenly
+# over the lines still to come. Returns the target shares and the dollars left
+# over after the last line.
+def spread_cash_over_lines(buy_prices: List[float], dollar_per_line: float, dollar_clip=2) -> Tuple[List[float], float]:
+    num_lines = len(buy_prices)
+    target_shares = [0.0] * num_lines
+    extra_dollars = 0
+    for i, buy_price in enumerate(buy_prices):
+        extra_for_this_line = extra_dollars / (num_lines - i)
+        extra_dollars -= extra_for_this_line
+        intended_shares = (dollar_per_line + extra_for_this_line) / buy_price
+        extra_shares = clip_decimal_place_shares(buy_price, intended_shares, dollar_clip)
+        target_shares[i] = intended_shares - extra_shares
+        extra_dollars += extra_shares * buy_price
+    return target_shares, extra_dollars
+
+
+# Target shares for rebalancing an existing ladder (even_redistribution). Like
+# spread_cash_over_lines, but the clipped dollars all carry to the next line.
+def carry_cash_over_lines(buy_prices: List[float], cash_per_line: float, dollar_clip=2) -> Tuple[List[float], float]:
+    target_shares = [0.0] * len(buy_prices)
+    extra_dollars = 0
+    for i, buy_price in enumerate(buy_prices):
+        intended_shares = (cash_per_line + extra_dollars) / buy_price
+        extra_shares = clip_decimal_place_shares(buy_price, intended_shares, dollar_clip)
+        target_shares[i] = intended_shares - extra_shares
+        extra_dollars = extra_shares * buy_price
+    return target_shares, extra_dollars
+
+
+# Rows for a new ladder (create_csv, and backtest.py for ladders that only live in
+# memory). risk_type sets the number of lines (100 per step), total_cash is spread
+# evenly over them and whatever the clipping left over goes on the last line.
+def build_ladder_rows(starting_buy_price: float, percentage_diff: float, risk_type: float, total_cash: float,
+                      last_action: int) -> List[Dict[str, Union[str, float, int]]]:
+    assert percentage_diff < 1, "Percentage difference must be less than 1"
+    num_lines = int(risk_type*100)
+    dollar_per_line = total_cash / num_lines
+    buy_prices, sell_prices = build_price_ladder(starting_buy_price, percentage_diff, num_lines)
+    target_shares, extra_dollars = spread_cash_over_lines(buy_prices, dollar_per_line)
+    spc = ["N"] * num_lines
+    if extra_dollars:
+        target_shares[-1] += extra_dollars/buy_prices[-1]
+        spc[-1] = "last"
+    return [
+        {
+            "index": i,
+            "buy_price": buy_prices[i],
+            "sell_price": sell_prices[i],
+            "target_shares": target_shares[i],
+            "held_shares": 0,
+            "pending_order_id": "None",
+            "spc": spc[i],
+            "unrealized_profit": 0,
+            "last_action": last_action,
+            "profit": 0
+        }
+        for i in range(num_lines)
+    ]
@@ -0,0 +1,251 @@
+"""
+Append-only mutation journal for SCALE_T ladder CSVs.
+
+Instead of rewriting the whole ladder CSV on every save, the changes made since
+the last save are appended to `<csv>.journal` as a single JSON line and fsynced.
+The CSV itself becomes a snapshot that is only rewritten when the journal is
+compacted, which happens on a background thread every `compact_every` saves.
+Loading a ladder replays the snapshot plus the journal, so a crash loses at most
+the changes made since the last save.
+
+Files next to the ladder CSV:
+    <csv>                     snapshot
+    <csv>.journal             active journal, never included in the snapshot
+    <csv>.journal.compacting  journal being folded into the snapshot
+    <csv>.compact.tmp         snapshot being written
+
+Journal lines are `{"seq": n, "ts": t, "ops": [...]}` with ops
+    ["set", row_id, column, value]
+    ["insert", row_id, position, {column: value}]
+or `{"seq": n, "rebase": true}`, written whenever a journal file is started. Row ids
+are ladder positions at the last rebase, with inserted rows numbered after them,
+so they stay valid while chase_price inserts lines and renumbers the ladder.
+
+The compaction tmp file is created before the active journal is moved to
+`.compacting` and is only removed by the rename that replaces the snapshot. So if
+`.compacting` exists on load, the tmp file tells us whether the snapshot already
+includes it. Sequence numbers let a replay skip lines it has already applied.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .ladder import Ladder, LadderSnapshot
+from .persister import fsync_dir, write_csv_atomically
+from .storage import LadderStorage
+from ..common.constants import CSV_JOURNAL_COMPACT_EVERY
+from ..common.logging_config import get_logger
+
+
+class LadderJournal(LadderStorage):
+    """
+    Journal for a single ladder CSV file (StorageBackend.JOURNAL).
+
+    Not thread-safe for writers: record_*/commit are called from the thread that owns
+    the ladder (the DecisionMaker consumer). Only the snapshot write runs on another thread.
+    """
+
+    def __init__(self, csv_filepath: str, compact_every: int = CSV_JOURNAL_COMPACT_EVERY):
+        self.csv_filepath = csv_filepath
+        self.journal_path = f"{csv_filepath}.journal"
+        self.compacting_path = f"{csv_filepath}.journal.compacting"
+        self.snapshot_tmp_path = f"{csv_filepath}.compact.tmp"
+        self.compact_every = compact_every
+        self.logger = get_logger("csv_journal")
+
+        self._file = None
+        self._seq = 0
+        self._row_ids: Dict[int, int] = {}  # ladder slot -> journal row id
+        self._next_row_id = 0
+        self._pending: List[list] = []
+        self._saves_since_compaction = 0
+        # Until the ladder has been written as a snapshot, changes aren't journaled
+        self._needs_snapshot = True
+        self._compactor: Optional[threading.Thread] = None
+
+    # Recording, driven by the CSVCore ladder hooks
+    def reset(self) -> None:
+        """The ladder was replaced wholesale; the next commit writes a full snapshot."""
+        self._needs_snapshot = True
+        self._pending = []
+
+    def record_change(self, slot: int, column: str, value) -> None:
+        if self._needs_snapshot:
+            return
+        self._pending.append(["set", self._row_ids[slot], column, value])
+
+    def record_insert(self, ladder: Ladder, slot: int) -> None:
+        if self._needs_snapshot:
+            return
+        row_id = self._next_row_id
+        self._next_row_id += 1
+        self._row_ids[slot] = row_id
+        # Inserts only come from chase_price and create_csv, so the O(n) position lookup is fine
+        position = ladder.slots().index(slot)
+        self._pending.append(["insert", row_id, position, dict(ladder.row(slot))])
+
+    # Persistence
+    def commit(self, ladder: Ladder) -> None:
+        """
+        Make the changes since the last commit durable. Called from CSVCore.save().
+        Appends one fsynced line to the journal, or writes a full snapshot if the ladder was replaced.
+        """
+        if self._needs_snapshot:
+            self.compact(ladder, background=False)
+            return
+        if not self._pending:
+            return
+        self._write_line({"ts": time.time(), "ops": self._pending})
+        self._pending = []
+        self._saves_since_compaction += 1
+        if self._saves_since_compaction >= self.compact_every and not self._compaction_running():
+            self.compact(ladder, background=True)
+
+    def compact(self, ladder: Ladder, background: bool = True) -> None:
+        """
+        Fold the journal into the CSV snapshot.
+
+        The rows are copied and the journal rotated on the calling thread; only the
+        snapshot write itself runs in the background.
+        """
+        if self._compaction_running():
+            self._compactor.join()
+        snapshot = ladder.snapshot()
+        self._rotate(ladder)
+        if background:
+            self._compactor = threading.Thread(
+                target=self._write_snapshot, args=(snapshot,), name="csv_journal_compactor", daemon=True
+            )
+            self._compactor.start()
+        else:
+            self._write_snapshot(snapshot)
+
+    def close(self) -> None:
+        """Wait for a running compaction and close the journal file."""
+        if self._compaction_running():
+            self._compactor.join()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    # Loading
+    def attach(self, ladder: Ladder, loaded: bool) -> None:
+        self.recover(ladder)
+
+    def recover(self, ladder: Ladder) -> int:
+        """
+        Replay the journal onto a ladder freshly loaded from the CSV snapshot.
+        Called when CSVCore._load_csv_data attaches the ladder. If anything was replayed, the ladder is
+        compacted straight away so the bot starts from a clean snapshot.
+
+        Returns:
+            int: Number of journal lines applied.
+        """
+        journal_paths = [self.journal_path]
+        if os.path.exists(self.compacting_path):
+            if os.path.exists(self.snapshot_tmp_path):
+                # Crashed before the snapshot was replaced, it doesn't include .compacting yet
+                journal_paths.insert(0, self.compacting_path)
+            else:
+                os.remove(self.compacting_path)
+        elif os.path.exists(self.snapshot_tmp_path):
+            os.remove(self.snapshot_tmp_path)
+
+        applied = 0
+        for path in journal_paths:
+            applied += self._replay_file(path, ladder)
+
+        if applied or any(os.path.exists(path) for path in journal_paths):
+            self.logger.info(f"Replayed {applied} journal entries onto {self.csv_filepath}")
+            self.compact(ladder, background=False)
+        else:
+            self._assign_row_ids(ladder)
+            self._needs_snapshot = False
+        return applied
+
+    def _replay_file(self, path: str, ladder: Ladder) -> int:
+        if not os.path.exists(path):
+            return 0
+        applied = 0
+        slots_by_row_id = list(ladder.slots())
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn write can only be the last line; that save never completed
+                    self.logger.warning(f"Ignoring incomplete journal line in {path}")
+                    break
+                if entry["seq"] <= self._seq:
+                    continue
+                self._seq = entry["seq"]
+                if entry.get("rebase"):
+                    slots_by_row_id = list(ladder.slots())
+                    continue
+                for op in entry["ops"]:
+                    if op[0] == "set":
+                        _, row_id, column, value = op
+                        ladder.set_value(slots_by_row_id[row_id], column, value)
+                    elif op[0] == "insert":
+                        _, row_id, position, values = op
+                        slots_by_row_id.append(ladder.insert(position, values).slot)
+                applied += 1
+        return applied
+
+    # File handling
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _compaction_running(self) -> bool:
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _assign_row_ids(self, ladder: Ladder) -> None:
+        self._row_ids = {slot: position for position, slot in enumerate(ladder.slots())}
+        self._next_row_id = len(self._row_ids)
+
+    def _write_line(self, entry: dict) -> None:
+        """Append one entry, numbered with the next seq, and fsync it."""
+        if self._file is None:
+            self._file = open(self.journal_path, 'a')
+            if self._file.tell() == 0:
+                self._file.write(json.dumps({"seq": self._next_seq(), "rebase": True}) + "\n")
+        self._file.write(json.dumps({"seq": self._next_seq(), **entry}) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _rotate(self, ladder: Ladder) -> None:
+        """Move the active journal aside for compaction and start a new one."""
+        if self._file:
+            self._file.close()
+            self._file = None
+        # The tmp file must exist before .compacting does, see module docstring
+        if not os.path.exists(self.snapshot_tmp_path):
+            open(self.snapshot_tmp_path, 'w').close()
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.compacting_path):
+                # Only after recovery: keep both, replay skips duplicated lines by seq
+                with open(self.journal_path, 'r') as src, open(self.compacting_path, 'a') as dst:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.compacting_path)
+        fsync_dir(self.csv_filepath)
+        self._assign_row_ids(ladder)
+        self._pending = []
+        self._saves_since_compaction = 0
+        self._needs_snapshot = False
+
+    def _write_snapshot(self, snapshot: LadderSnapshot) -> None:
+        try:
+            write_csv_atomically(self.csv_filepath, snapshot, tmp_path=self.snapshot_tmp_path)
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)
+        except Exception as e:
+            # The journal files are left in place, the next load replays them
+            self.logger.error(f"Error compacting journal into {self.csv_filepath}: {e}")
@@ -0,0 +1,244 @@
+"""
+Typed, column-oriented ladder storage for the SCALE_T bot.
+
+A ladder CSV is parsed once at load into one typed column per CSV column:
+numeric columns live in compact `array` buffers and text columns in plain lists.
+Rows are exposed as lightweight `LadderRow` views so the rest of the bot keeps
+using `row["buy_price"]` style access, but values come back already typed and
+writes are coerced to the column type on the way in.
+"""
+
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+# Column types for the SCALE_T ladder. Columns not listed here are kept as text.
+INT_COLUMNS = ("index",)
+FLOAT_COLUMNS = ("buy_price", "sell_price", "target_shares", "held_shares", "unrealized_profit", "profit")
+# Text columns whose empty value is not "" (the CSV uses the string "None" for no pending order)
+TEXT_DEFAULTS = {"pending_order_id": "None"}
+
+LadderValue = Union[str, float, int]
+
+
+def _new_column(name: str):
+    """Create an empty storage column for the given column name."""
+    if name in INT_COLUMNS:
+        return array('q')
+    if name in FLOAT_COLUMNS:
+        return array('d')
+    return []
+
+
+def _default_value(name: str) -> LadderValue:
+    """Value used for a column that a row does not provide."""
+    if name in INT_COLUMNS:
+        return 0
+    if name in FLOAT_COLUMNS:
+        return 0.0
+    return TEXT_DEFAULTS.get(name, "")
+
+
+def parse_value(name: str, value) -> LadderValue:
+    """
+    Convert a raw CSV (or caller supplied) value to the column type.
+
+    Raises:
+        ValueError: If the value can't be converted to the column type.
+    """
+    if value is None:
+        return _default_value(name)
+    if name in INT_COLUMNS:
+        return int(value)
+    if name in FLOAT_COLUMNS:
+        return float(value)
+    return str(value)
+
+
+class LadderSnapshot(NamedTuple):
+    """
+    Point-in-time copy of a ladder, cheap to take (column buffers are copied whole)
+    so it can be handed to another thread for writing.
+    """
+    fieldnames: List[str]
+    slots: List[int]
+    columns: Dict[str, Union[array, list]]
+
+    def rows(self) -> Iterator[list]:
+        """Row values in ladder order, one list per row in fieldnames order."""
+        columns = [self.columns[name] for name in self.fieldnames]
+        for slot in self.slots:
+            yield [column[slot] for column in columns]
+
+
+class LadderRow(MutableMapping):
+    """
+    Dictionary-like view of a single ladder row.
+
+    The view is bound to a stable slot in the ladder, so it stays valid when
+    rows are inserted above it or the ladder is renumbered.
+    """
+    __slots__ = ("_ladder", "_slot")
+
+    def __init__(self, ladder: "Ladder", slot: int):
+        self._ladder = ladder
+        self._slot = slot
+
+    @property
+    def slot(self) -> int:
+        return self._slot
+
+    def __getitem__(self, key: str) -> LadderValue:
+        return self._ladder._columns[key][self._slot]
+
+    def __setitem__(self, key: str, value) -> None:
+        self._ladder.set_value(self._slot, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Ladder columns cannot be removed from a single row")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ladder.fieldnames)
+
+    def __len__(self) -> int:
+        return len(self._ladder.fieldnames)
+
+    def __repr__(self) -> str:
+        return f"LadderRow({dict(self)})"
+
+
+class Ladder:
+    """
+    Column-oriented storage for the rows of a SCALE_T ladder.
+
+    Rows are addressed two ways:
+        - position: the row's place in the ladder (0 is the top line), what `ladder[i]` uses
+        - slot: a stable id given to the row when it is added, used by indexes that must
+          survive rows being inserted above them
+
+    Optional callbacks let the owner keep derived data up to date:
+        - on_change(slot, column, old_value, new_value) after a value changes
+        - on_insert(slot) after a row is added
+    """
+
+    def __init__(self, fieldnames: Iterable[str] = (),
+                 on_change: Optional[Callable[[int, str, LadderValue, LadderValue], None]] = None,
+                 on_insert: Optional[Callable[[int], None]] = None):
+        self.fieldnames: List[str] = []
+        self._columns: Dict[str, Union[array, list]] = {}
+        self._order: List[int] = []  # position -> slot
+        self._slot_count = 0
+        self.on_change = on_change
+        self.on_insert = on_insert
+        for name in fieldnames:
+            self._add_column(name)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping], **callbacks) -> "Ladder":
+        """
+        Build a ladder from dict rows (e.g. csv.DictReader output).
+
+        Like a CSV header, the columns are taken from the first row; keys that only
+        appear in later rows are ignored.
+
+        Raises:
+            ValueError: If a value can't be converted to its column type.
+        """
+        ladder = cls()
+        for row in rows:
+            if not ladder._order:
+                for name in row.keys():
+                    ladder._add_column(name)
+            ladder._append_slot(row, add_columns=False)
+        ladder.on_change = callbacks.get("on_change")
+        ladder.on_insert = callbacks.get("on_insert")
+        return ladder
+
+    def _add_column(self, name: str) -> None:
+        column = _new_column(name)
+        default = _default_value(name)
+        for _ in range(self._slot_count):
+            column.append(default)
+        self._columns[name] = column
+        self.fieldnames.append(name)
+
+    def _append_slot(self, row: Mapping, add_columns: bool) -> int:
+        """Parse a row into a new slot, returning the slot id."""
+        if add_columns:
+            for name in row.keys():
+                if name not in self._columns:
+                    self._add_column(name)
+        # Parse everything first so a bad value doesn't leave the columns uneven
+        values = [parse_value(name, row.get(name)) for name in self.fieldnames]
+        for name, value in zip(self.fieldnames, values):
+            self._columns[name].append(value)
+        slot = self._slot_count
+        self._slot_count += 1
+        self._order.append(slot)
+        return slot
+
+    # List-like access by position
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, position: Union[int, slice]):
+        if isinstance(position, slice):
+            return [LadderRow(self, slot) for slot in self._order[position]]
+        return LadderRow(self, self._order[position])
+
+    def __iter__(self) -> Iterator[LadderRow]:
+        for slot in self._order:
+            yield LadderRow(self, slot)
+
+    def __repr__(self) -> str:
+        return f"Ladder(rows={len(self)}, fieldnames={self.fieldnames})"
+
+    def append(self, row: Mapping) -> LadderRow:
+        """Add a row at the bottom of the ladder and return its view."""
+        return self.insert(len(self._order), row)
+
+    def insert(self, position: int, row: Mapping) -> LadderRow:
+        """Insert a row at the given position and return its view. New keys become new columns."""
+        slot = self._append_slot(row, add_columns=True)
+        if position < len(self._order) - 1:
+            self._order.pop()
+            self._order.insert(position, slot)
+        if self.on_insert:
+            self.on_insert(slot)
+        return LadderRow(self, slot)
+
+    # Slot access for indexes
+    def row(self, slot: int) -> LadderRow:
+        """Get the view for a slot."""
+        return LadderRow(self, slot)
+
+    def slots(self) -> List[int]:
+        """Slots in ladder order. Treat the returned list as read-only."""
+        return self._order
+
+    def column(self, name: str) -> Union[array, list]:
+        """
+        Raw storage for a column, indexed by slot. Treat it as read-only;
+        writes must go through set_value so callbacks fire.
+        """
+        return self._columns[name]
+
+    def snapshot(self) -> LadderSnapshot:
+        """Copy the ladder for writing on another thread."""
+        return LadderSnapshot(
+            list(self.fieldnames), list(self._order), {name: column[:] for name, column in self._columns.items()}
+        )
+
+    def get_value(self, slot: int, name: str) -> LadderValue:
+        return self._columns[name][slot]
+
+    def set_value(self, slot: int, name: str, value) -> None:
+        """Set a single value, coercing it to the column type."""
+        if name not in self._columns:
+            self._add_column(name)
+        column = self._columns[name]
+        new_value = parse_value(name, value)
+        old_value = column[slot]
+        column[slot] = new_value
+        if self.on_change and old_value != new_value:
+            self.on_change(slot, name, old_value, new_value)
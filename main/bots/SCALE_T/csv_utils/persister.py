@@ -0,0 +1,140 @@
+"""
+Write-behind persistence for SCALE_T ladder CSVs.
+
+`CSVCore.save()` normally rewrites the ladder CSV on the calling thread, which is
+the DecisionMaker consumer. With StorageBackend.CSV_WRITE_BEHIND, save() only takes a snapshot
+of the ladder and hands it to a background thread. Saves that arrive while a
+write is in progress are coalesced: only the newest snapshot is written.
+
+Every write goes to a temp file that is fsynced and then renamed over the CSV,
+so a crash leaves either the old or the new ladder on disk, never a truncated one.
+Call `flush()` before anything that must not run until the ladder is durable
+(e.g. submitting an order), and don't go ahead if it returns False.
+"""
+
+import csv
+import os
+import threading
+from typing import Optional
+
+from .ladder import Ladder, LadderSnapshot
+from .storage import LadderStorage
+from ..common.logging_config import get_logger
+
+
+def write_csv_atomically(filepath: str, snapshot: LadderSnapshot, tmp_path: Optional[str] = None) -> None:
+    """
+    Write a ladder snapshot to filepath via a fsynced temp file and an atomic rename.
+
+    Args:
+        filepath (str): The ladder CSV to replace.
+        snapshot (LadderSnapshot): The ladder to write.
+        tmp_path (Optional[str]): Temp file to write first, defaults to `<filepath>.tmp`.
+    """
+    tmp_path = tmp_path or f"{filepath}.tmp"
+    with open(tmp_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(snapshot.fieldnames)
+        writer.writerows(snapshot.rows())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+    fsync_dir(filepath)
+
+
+def fsync_dir(filepath: str) -> None:
+    """fsync the directory holding filepath so a rename in it is durable."""
+    directory = os.open(os.path.dirname(os.path.abspath(filepath)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+class LadderPersister(LadderStorage):
+    """
+    Background writer for a single ladder CSV (StorageBackend.CSV_WRITE_BEHIND).
+
+    Saves are numbered; the writer thread always writes the newest snapshot and
+    records the number it wrote, which is what flush() waits on. A write that fails
+    is recorded too, and retried by the next flush() if no newer save replaced it.
+    """
+
+    def __init__(self, csv_filepath: str):
+        self.csv_filepath = csv_filepath
+        self.logger = get_logger("csv_persister")
+        self.writes = 0  # snapshots actually written, <= saves
+        self.saves = 0
+        self.last_error: Optional[Exception] = None
+        self._condition = threading.Condition()
+        self._latest: Optional[LadderSnapshot] = None
+        self._latest_save = 0
+        self._written_save = 0  # newest save on disk
+        self._failed_save = 0   # newest save whose write failed
+        self._failed: Optional[LadderSnapshot] = None  # its snapshot, for a retry
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def commit(self, ladder: Ladder) -> None:
+        """Queue the current ladder for writing, replacing any snapshot not yet written."""
+        snapshot = ladder.snapshot()
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="csv_persister", daemon=True)
+                self._thread.start()
+            self.saves += 1
+            self._latest = snapshot
+            self._latest_save = self.saves
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every save submitted so far is on disk. If the newest save failed
+        to write, it is written again first.
+
+        Returns:
+            bool: False if the timeout ran out first or the write failed (see last_error).
+        """
+        with self._condition:
+            target = self._latest_save
+            if self._written_save < target and self._failed_save == target and self._latest is None:
+                self._latest, self._failed, self._failed_save = self._failed, None, 0
+                self._condition.notify_all()
+            self._condition.wait_for(lambda: self._written_save >= target or self._failed_save >= target, timeout)
+            return self._written_save >= target
+
+    def close(self) -> None:
+        """Write any pending snapshot and stop the writer thread."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._stopping = False
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._latest is not None or self._stopping)
+                if self._latest is None:
+                    return
+                snapshot, save_number = self._latest, self._latest_save
+                self._latest = None
+            try:
+                write_csv_atomically(self.csv_filepath, snapshot)
+            except Exception as e:
+                # Report and keep the bot running; flush() tells callers the save isn't on disk
+                self.logger.error(f"Error saving CSV data to {self.csv_filepath}: {e}")
+                with self._condition:
+                    self.last_error = e
+                    self._failed_save, self._failed = save_number, snapshot
+                    self._condition.notify_all()
+                continue
+            with self._condition:
+                self.writes += 1
+                self.last_error = None
+                self._written_save = save_number
+                if self._failed_save <= save_number:
+                    self._failed_save, self._failed = 0, None
+                self._condition.notify_all()
@@ -0,0 +1,212 @@
+"""
+SQLite ladder storage for the SCALE_T bot.
+
+Keeps every ladder of a trading type in one SQLite database next to the ticker
+CSVs (`ladders.sqlite3`), one table per ticker/custom_id, in WAL mode. The bot is
+the only writer; with WAL, other processes (csv_tool, the performance service)
+can read a live ladder at any time without seeing a half-written save.
+
+Changes made between two saves are buffered from the CSVCore ladder hooks and
+applied in a single transaction on save(), so a fill or a chase_price
+re-index is all-or-nothing. Rows are keyed by a stable `row_id` rather than the
+ladder `index`, which chase_price renumbers; the ladder order comes from `index`.
+"""
+
+import os
+import sqlite3
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .ladder import FLOAT_COLUMNS, INT_COLUMNS, Ladder, LadderValue
+from .storage import LadderStorage
+from ..common.constants import get_sqlite_ladder_filepath
+from ..common.logging_config import get_logger
+
+# Columns that get an index, for queries against live ladders
+INDEXED_COLUMNS = ("index", "buy_price", "sell_price")
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _column_type(name: str) -> str:
+    if name in INT_COLUMNS:
+        return "INTEGER"
+    if name in FLOAT_COLUMNS:
+        return "REAL"
+    return "TEXT"
+
+
+def get_ladder_table_name(csv_filepath: str) -> str:
+    """Table for a ticker CSV, e.g. .../paper/AAPL_myID.csv -> ladder_AAPL_myID."""
+    return "ladder_" + os.path.splitext(os.path.basename(csv_filepath))[0]
+
+
+def read_ladder_rows(csv_filepath: str) -> Optional[List[Dict[str, LadderValue]]]:
+    """
+    Read a live ladder without touching the bot's connection, e.g. from csv_tool or the
+    performance service. Opens the database read-only.
+
+    Args:
+        csv_filepath (str): The ticker CSV path (see get_ticker_filepath).
+
+    Returns:
+        Optional[List[Dict[str, LadderValue]]]: Rows in ladder order, or None if the ladder isn't stored.
+    """
+    db_path = get_sqlite_ladder_filepath(csv_filepath)
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows, _ = _select_ladder(conn, get_ladder_table_name(csv_filepath))
+        return rows
+    finally:
+        conn.close()
+
+
+def _select_ladder(conn: sqlite3.Connection, table: str) -> Tuple[Optional[List[Dict[str, LadderValue]]], List[int]]:
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    if not exists:
+        return None, []
+    cursor = conn.execute(f'SELECT * FROM {_quote(table)} ORDER BY "index", row_id')
+    names = [description[0] for description in cursor.description]
+    rows = []
+    row_ids = []
+    for values in cursor:
+        row = dict(zip(names, values))
+        row_ids.append(row.pop("row_id"))
+        rows.append(row)
+    return rows, row_ids
+
+
+class SQLiteLadderStore(LadderStorage):
+    """One ladder table in the trading type's SQLite database (StorageBackend.SQLITE)."""
+
+    def __init__(self, csv_filepath: str):
+        self.db_path = get_sqlite_ladder_filepath(csv_filepath)
+        self.table = get_ladder_table_name(csv_filepath)
+        self.logger = get_logger("sqlite_store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._columns: List[str] = []
+        self._row_ids: Dict[int, int] = {}  # ladder slot -> row_id
+        self._next_row_id = 0
+        self._loaded_row_ids: List[int] = []
+        # Changes since the last commit
+        self._inserts: List[Tuple[int, Dict[str, LadderValue]]] = []
+        self._changes: Dict[Tuple[int, str], LadderValue] = {}
+        # Until the table holds the current ladder, changes aren't buffered
+        self._stale = True
+
+    def load(self) -> Optional[List[Mapping]]:
+        if not os.path.exists(self.db_path):
+            return None
+        rows, self._loaded_row_ids = _select_ladder(self._connection(), self.table)
+        return rows
+
+    def attach(self, ladder: Ladder, loaded: bool) -> None:
+        if not loaded:
+            # First load with SQLite: import the CSV
+            self._write_all(ladder)
+            return
+        self._columns = list(ladder.fieldnames)
+        self._row_ids = {slot: row_id for slot, row_id in zip(ladder.slots(), self._loaded_row_ids)}
+        self._next_row_id = max(self._loaded_row_ids, default=-1) + 1
+        self._loaded_row_ids = []
+        self._stale = False
+
+    def reset(self) -> None:
+        self._stale = True
+        self._inserts = []
+        self._changes = {}
+
+    def record_change(self, slot: int, column: str, value: LadderValue) -> None:
+        if self._stale:
+            return
+        self._changes[(self._row_ids[slot], column)] = value
+
+    def record_insert(self, ladder: Ladder, slot: int) -> None:
+        if self._stale:
+            return
+        row_id = self._next_row_id
+        self._next_row_id += 1
+        self._row_ids[slot] = row_id
+        self._inserts.append((row_id, dict(ladder.row(slot))))
+
+    def commit(self, ladder: Ladder) -> None:
+        """Apply the buffered inserts and updates in one transaction, or rewrite the table if the ladder was replaced."""
+        if self._stale:
+            self._write_all(ladder)
+            return
+        if not self._inserts and not self._changes:
+            return
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for name in ladder.fieldnames:
+                if name not in self._columns:
+                    conn.execute(f"ALTER TABLE {_quote(self.table)} ADD COLUMN {_quote(name)} {_column_type(name)}")
+                    self._columns.append(name)
+            if self._inserts:
+                conn.executemany(self._insert_sql(), [
+                    [row_id] + [values.get(name) for name in self._columns] for row_id, values in self._inserts
+                ])
+            changes_by_column: Dict[str, List[Tuple[LadderValue, int]]] = {}
+            for (row_id, column), value in self._changes.items():
+                changes_by_column.setdefault(column, []).append((value, row_id))
+            for column, params in changes_by_column.items():
+                conn.executemany(f"UPDATE {_quote(self.table)} SET {_quote(column)} = ? WHERE row_id = ?", params)
+            conn.execute("COMMIT")
+        except Exception as e:
+            # Keep the buffered changes so the next save retries them
+            conn.execute("ROLLBACK")
+            self.logger.error(f"Error saving ladder to {self.db_path} ({self.table}): {e}")
+            return
+        self._inserts = []
+        self._changes = {}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Autocommit mode: transactions are opened explicitly in commit()/_write_all()
+            self._conn = sqlite3.connect(self.db_path, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+        return self._conn
+
+    def _insert_sql(self) -> str:
+        columns = ", ".join(["row_id"] + [_quote(name) for name in self._columns])
+        placeholders = ", ".join("?" * (len(self._columns) + 1))
+        return f"INSERT INTO {_quote(self.table)} ({columns}) VALUES ({placeholders})"
+
+    def _write_all(self, ladder: Ladder) -> None:
+        """Replace the table with the whole ladder in one transaction."""
+        conn = self._connection()
+        table = _quote(self.table)
+        self._columns = list(ladder.fieldnames)
+        column_defs = ", ".join(["row_id INTEGER PRIMARY KEY"] + [
+            f"{_quote(name)} {_column_type(name)}" for name in self._columns
+        ])
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(f"CREATE TABLE {table} ({column_defs})")
+            for name in INDEXED_COLUMNS:
+                if name in self._columns:
+                    conn.execute(f"CREATE INDEX {_quote(f'{self.table}_{name}')} ON {table} ({_quote(name)})")
+            conn.executemany(self._insert_sql(), [
+                [position] + [row[name] for name in self._columns] for position, row in enumerate(ladder)
+            ])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._row_ids = {slot: position for position, slot in enumerate(ladder.slots())}
+        self._next_row_id = len(ladder)
+        self._inserts = []
+        self._changes = {}
+        self._stale = False
@@ -0,0 +1,79 @@
+"""
+Pluggable ladder storage for the SCALE_T bot.
+
+By default CSVCore reads the ladder CSV at load and rewrites it on every save().
+A storage backend (see StorageBackend in common/constants.py) replaces that:
+
+    - load()/attach() at startup: the backend either returns the stored rows, or
+      returns None and gets the ladder CSVCore read from the CSV (to import it)
+    - reset()/record_change()/record_insert() from the CSVCore ladder hooks, so the
+      backend sees every change as it happens
+    - commit() from save(), flush() where a save must be durable before continuing,
+      and close() on shutdown
+
+CSVCore also takes a LadderStorage instance directly; the backtest runner passes a
+MemoryLadderStorage so a ladder is never written back.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Mapping, Optional
+
+from .ladder import Ladder, LadderValue
+
+
+class LadderStorage(ABC):
+    """Base class for ladder storage backends. Only commit() is required, the other hooks default to no-ops."""
+
+    def load(self) -> Optional[List[Mapping]]:
+        """Stored rows in ladder order, or None to load the ladder from the CSV."""
+        return None
+
+    def attach(self, ladder: Ladder, loaded: bool) -> None:
+        """
+        Called once the loaded ladder is csv_data.
+
+        Args:
+            ladder (Ladder): The ladder CSVCore will work on.
+            loaded (bool): True if the rows came from load(), False if they were read from the CSV.
+        """
+        pass
+
+    def reset(self) -> None:
+        """csv_data was replaced wholesale."""
+        pass
+
+    def record_change(self, slot: int, column: str, value: LadderValue) -> None:
+        """A single ladder value changed."""
+        pass
+
+    def record_insert(self, ladder: Ladder, slot: int) -> None:
+        """A row was added to the ladder."""
+        pass
+
+    @abstractmethod
+    def commit(self, ladder: Ladder) -> None:
+        """Persist the ladder; called from CSVCore.save()."""
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every commit so far is durable. False if the timeout ran out."""
+        return True
+
+    def close(self) -> None:
+        """Finish outstanding work and release files."""
+        pass
+
+
+class MemoryLadderStorage(LadderStorage):
+    """
+    Keeps the ladder in memory only: saves are dropped (backtest.py). Starts from the given
+    rows, or from the ticker CSV if rows is None.
+    """
+
+    def __init__(self, rows: Optional[List[Mapping]] = None):
+        self._rows = rows
+
+    def load(self) -> Optional[List[Mapping]]:
+        return self._rows
+
+    def commit(self, ladder: Ladder) -> None:
+        pass
@@ -6,12 +6,16 @@ In a classless implementation, this module focuses on the initial setup and orch
 """
 
 import argparse
+import asyncio
 
 from .csv_utils.csv_service import CSVService
 from .brokerages.alpaca_interface import AlpacaInterface
 from .trading.decision_maker import DecisionMaker
+from .trading.async_decision_maker import AsyncDecisionMaker
+from .trading.decision_trace import dump_traces_on_signal
+from .multi_engine import run_multi_engine
 from .common.logging_config import get_logger
-from .common.constants import TradingType
+from .common.constants import TradingType, ASYNC_ENGINE
 ###################logging.basicConfig(level=logging.INFO)
 #.env log levels
 
@@ -30,6 +34,7 @@ def run_engine(ticker: str, trading_type: str):
         csv_service = CSVService(ticker=ticker, trading_type=trading_type)
         alpaca_interface = AlpacaInterface(trading_type=trading_type, ticker=ticker)
         decision_maker = DecisionMaker(csv_service=csv_service, alpaca_interface=alpaca_interface)
+        dump_traces_on_signal(lambda: [decision_maker])
         decision_maker.launch_action_producer_threads()
         logger.info("Engine Started")
         decision_maker.consume_actions()
@@ -38,12 +43,54 @@ def run_engine(ticker: str, trading_type: str):
         raise RuntimeError(e)
 
 
+async def _serve_async(ticker: str, trading_type: str, logger):
+    csv_service = CSVService(ticker=ticker, trading_type=trading_type)
+    alpaca_interface = AlpacaInterface(trading_type=trading_type, ticker=ticker)
+    decision_maker = AsyncDecisionMaker(csv_service=csv_service, alpaca_interface=alpaca_interface)
+    dump_traces_on_signal(lambda: [decision_maker])
+    try:
+        await decision_maker.launch_action_producers()
+        logger.info("Engine Started (asyncio)")
+        await decision_maker.consume_actions()
+    finally:
+        await decision_maker.close()
+
+
+def run_async_engine(ticker: str, trading_type: str):
+    """
+    Starts the SCALE_T trading bot engine on a single asyncio event loop.
+
+    Redis pub/sub, the action queue and Alpaca REST calls all run on the loop, so price
+    updates keep being handled while an order is being placed.
+
+    Args:
+        ticker (str): The stock ticker symbol to trade.
+        trading_type (str): The trading type ('paper' or 'live').
+    """
+    logger = get_logger("engine")
+    logger.info(f"Starting asyncio engine with ticker: {ticker} and trading type: {trading_type}")
+
+    try :
+        asyncio.run(_serve_async(ticker, trading_type, logger))
+    except Exception as e:
+        logger.error(f"Engine failure on error {e}")
+        raise RuntimeError(e)
+
+
 if __name__ == "__main__":
     # Example usage (for testing/running engine directly)
     parser = argparse.ArgumentParser(description="Run the SCALE-T trading bot engine.")
-    parser.add_argument("ticker", type=str, help="The stock ticker symbol to trade (e.g., AAPL).")
+    parser.add_argument("tickers", type=str, nargs="+", help="The stock ticker symbol(s) to trade (e.g., AAPL). Several run in one process.")
     parser.add_argument("trading_type", type=TradingType, choices=list(TradingType), help="Trading type ('paper' or 'live').")
+    parser.add_argument("--asyncio", action="store_true", default=ASYNC_ENGINE, help="Run on an asyncio event loop (default from SCALE_T_ASYNC_ENGINE).")
 
     args = parser.parse_args()
 
-    run_engine(ticker=args.ticker, trading_type=args.trading_type)
+    if len(args.tickers) > 1:
+        if args.asyncio:
+            parser.error("--asyncio runs a single ticker")
+        run_multi_engine(tickers=args.tickers, trading_type=args.trading_type)
+    elif args.asyncio:
+        run_async_engine(ticker=args.tickers[0], trading_type=args.trading_type)
+    else:
+        run_engine(ticker=args.tickers[0], trading_type=args.trading_type)
@@ -0,0 +1,162 @@
+"""
+Multi-ticker engine for SCALE_T bot.
+
+Hosts one CSVService/DecisionMaker pair per ticker in a single process instead of one container
+per ticker. The tickers share one Redis publisher, one pattern subscription on every ticker
+channel, one Alpaca client and one OrderReconciler, which polls every ticker's pending order
+in one open-orders query. Each DecisionMaker consumes its own action queue on its own
+thread, so a ticker that fails (including a DecisionMaker sys.exit()) stops on its own while
+the others keep trading.
+"""
+
+import threading
+from typing import Dict, List
+
+from .csv_utils.csv_service import CSVService
+from .brokerages.alpaca_interface import AlpacaInterface
+from .trading.decision_maker import DecisionMaker
+from .trading.order_reconciler import OrderReconciler
+from .trading.decision_trace import dump_traces_on_signal
+from .common.logging_config import get_logger
+
+from ...utils.redis import (
+    RedisPublisher, RedisSubscriber, CHANNELS, REDIS_HOST_DOCKER, REDIS_PORT, REDIS_DB
+)
+
+
+class MultiTickerEngine:
+    """
+    Runs the DecisionMakers for many tickers in one process.
+    """
+
+    def __init__(self, tickers: List[str], trading_type: str):
+        self.logger = get_logger("multi_engine")
+        self.tickers = [ticker.upper() for ticker in tickers]
+        self.trading_type = trading_type
+        self.decision_makers: Dict[str, DecisionMaker] = {}  # tickers still trading
+        # Guards decision_makers against consumer threads stopping their ticker. Reentrant, so a
+        # signal handler on the main thread can take it while the main thread holds it.
+        self._lock = threading.RLock()
+        self.consumer_threads: Dict[str, threading.Thread] = {}
+        self.failed: Dict[str, str] = {}  # ticker -> reason it stopped
+        self.publisher = None
+        self.subscriber = None
+        self.order_reconciler = None
+
+    def start(self) -> None:
+        """
+        Create the DecisionMakers, subscribe to every ticker channel and start the consumers.
+
+        Raises:
+            RuntimeError: If none of the tickers could be started.
+        """
+        alpaca_interface = AlpacaInterface(trading_type=self.trading_type)
+        self.publisher = RedisPublisher(host=REDIS_HOST_DOCKER, port=REDIS_PORT, db=REDIS_DB)
+        self.order_reconciler = OrderReconciler(alpaca_interface)
+
+        for ticker in self.tickers:
+            try:
+                csv_service = CSVService(ticker=ticker, trading_type=self.trading_type)
+                self.decision_makers[ticker] = DecisionMaker(
+                    csv_service=csv_service,
+                    alpaca_interface=alpaca_interface.for_ticker(ticker),
+                    publisher=self.publisher,
+                )
+                self.decision_makers[ticker].order_reconciler = self.order_reconciler
+            except (Exception, SystemExit) as e:
+                self._stop_ticker(ticker, f"startup failed: {e!r}")
+        if not self.decision_makers:
+            raise RuntimeError(f"No ticker could be started: {self.failed}")
+
+        # One subscription for every ticker; _route hands each message to its DecisionMaker
+        self.subscriber = RedisSubscriber(host=REDIS_HOST_DOCKER, port=REDIS_PORT, db=REDIS_DB)
+        pattern = CHANNELS.TICKER_UPDATES_PATTERN
+        assert self.subscriber.psubscribe(pattern, self._route) == True, f"Failed to subscribe to pattern {pattern}"
+        self.subscriber.start_listening()
+        self.order_reconciler.start()
+
+        for ticker, decision_maker in self.running().items():
+            try:
+                decision_maker.register_with_broker()
+            except Exception as e:
+                self._stop_ticker(ticker, f"broker registration failed: {e!r}")
+                continue
+            thread = threading.Thread(target=self._consume, args=(ticker, decision_maker), name=f"scale_t_{ticker}", daemon=True)
+            self.consumer_threads[ticker] = thread
+            thread.start()
+        self.logger.info(f"Started {len(self.consumer_threads)} of {len(self.tickers)} tickers: {', '.join(self.consumer_threads)}")
+
+    def _route(self, message) -> None:
+        ticker = CHANNELS.get_ticker_from_channel(message['channel'])
+        decision_maker = self.decision_makers.get(ticker)
+        if decision_maker is not None:
+            decision_maker.on_redis_message(message)
+
+    def _consume(self, ticker: str, decision_maker: DecisionMaker) -> None:
+        try:
+            decision_maker.consume_actions()
+            self._stop_ticker(ticker, "consumer returned")
+        except (Exception, SystemExit) as e:
+            self._stop_ticker(ticker, f"{e!r}")
+
+    def _stop_ticker(self, ticker: str, reason: str) -> None:
+        self.logger.error(f"Stopping {ticker}: {reason}")
+        with self._lock:
+            self.failed[ticker] = reason
+            decision_maker = self.decision_makers.pop(ticker, None)
+        if decision_maker is not None:
+            try:
+                decision_maker.csv_service.close()
+            except Exception as e:
+                self.logger.error(f"Failed to close ladder for {ticker}: {e}")
+
+    def running(self) -> Dict[str, DecisionMaker]:
+        """A snapshot of the tickers still trading, safe to iterate while consumers stop."""
+        with self._lock:
+            return dict(self.decision_makers)
+
+    def latency_stats(self) -> Dict[str, Dict]:
+        """Tick-to-order latency per stage (LatencyTracker.stats()) for every ticker still trading."""
+        return {ticker: decision_maker.latency.stats() for ticker, decision_maker in self.running().items()}
+
+    def run(self) -> None:
+        """
+        Start the engine and block while any ticker is still trading.
+
+        Raises:
+            RuntimeError: Once every ticker has stopped.
+        """
+        self.start()
+        for thread in list(self.consumer_threads.values()):
+            thread.join()
+        raise RuntimeError(f"All tickers stopped: {self.failed}")
+
+    def close(self) -> None:
+        if self.subscriber is not None:
+            self.subscriber.close()
+        if self.order_reconciler is not None:
+            self.order_reconciler.close()
+        for ticker in self.running():
+            self._stop_ticker(ticker, "engine closed")
+
+
+def run_multi_engine(tickers: List[str], trading_type: str):
+    """
+    Starts the SCALE_T trading bot engine for several tickers in one process.
+
+    Args:
+        tickers (List[str]): The stock ticker symbols to trade.
+        trading_type (str): The trading type ('paper' or 'live').
+    """
+    logger = get_logger("engine")
+    logger.info(f"Starting multi-ticker engine with tickers: {', '.join(tickers)} and trading type: {trading_type}")
+
+    engine = MultiTickerEngine(tickers, trading_type)
+    dump_traces_on_signal(lambda: engine.running().values())
+    try :
+        engine.run()
+    except Exception as e:
+        logger.error(f"Engine failure on error {e}")
+        raise RuntimeError(e)
+    finally:
+        engine.close()
@@ -0,0 +1,93 @@
+"""
+Action queues for the DecisionMaker consumer.
+
+Drop-in `queue.Queue` (ActionQueue) and `asyncio.Queue` (AsyncActionQueue, for
+the asyncio engine) with two rules on top of FIFO:
+
+    - Order updates (and any other non-price message) are always handed out
+      before price updates, so a fill never waits behind a burst of ticks.
+    - Only the newest price update is kept. A price that arrives while another is
+      still queued replaces it; the DecisionMaker only acts on the latest price
+      anyway, and each stale tick would cost a full ladder check.
+
+`ticks_conflated` and `max_depth` show how hard the queue is being pushed.
+"""
+
+import asyncio
+import queue
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, Optional
+
+from .constants import MessageType
+
+PRICE_UPDATE_TYPES = ('price_update', MessageType.PRICE_UPDATE)
+
+
+class _ConflatingQueue(ABC):
+    """Storage hooks shared by both queues; the base queue class provides locking and task accounting."""
+
+    def _init(self, maxsize: int) -> None:
+        self._priority = deque()
+        self._latest_price: Optional[Dict[str, Any]] = None
+        self.ticks_conflated = 0  # price updates replaced before they were processed
+        self.max_depth = 0
+
+    def _qsize(self) -> int:
+        return len(self._priority) + (self._latest_price is not None)
+
+    def _put(self, message: Dict[str, Any]) -> None:
+        if message.get('type') in PRICE_UPDATE_TYPES:
+            if self._latest_price is not None:
+                self.ticks_conflated += 1
+                # put() counts an unfinished task for every message, but the replaced tick
+                # will never be get()/task_done()'d, so don't let join() wait for it
+                self._drop_unfinished_task()
+            self._latest_price = message
+        else:
+            self._priority.append(message)
+        self.max_depth = max(self.max_depth, self._qsize())
+
+    def _get(self) -> Dict[str, Any]:
+        if self._priority:
+            return self._priority.popleft()
+        message, self._latest_price = self._latest_price, None
+        return message
+
+    @abstractmethod
+    def _drop_unfinished_task(self) -> None:
+        """Uncount the unfinished task of a replaced price update; the counter is named differently per base queue."""
+
+    def _stats(self) -> Dict[str, int]:
+        return {'depth': self._qsize(), 'max_depth': self.max_depth, 'ticks_conflated': self.ticks_conflated}
+
+
+class ActionQueue(_ConflatingQueue, queue.Queue):
+    """Priority for order updates, latest-only for price updates. Thread safe, like queue.Queue."""
+
+    def _drop_unfinished_task(self) -> None:
+        # Called from put() with the queue mutex held
+        self.unfinished_tasks -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring: current depth, max depth and conflated ticks."""
+        with self.mutex:
+            return self._stats()
+
+
+class AsyncActionQueue(_ConflatingQueue, asyncio.Queue):
+    """ActionQueue for a single event loop, like asyncio.Queue. Not thread safe."""
+
+    def _drop_unfinished_task(self) -> None:
+        self._unfinished_tasks -= 1
+
+    # asyncio.Queue reads its own deque here rather than going through _qsize()
+    def qsize(self) -> int:
+        return self._qsize()
+
+    def empty(self) -> bool:
+        return self._qsize() == 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring: current depth, max depth and conflated ticks."""
+        return self._stats()
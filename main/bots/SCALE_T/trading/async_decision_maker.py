@@ -0,0 +1,172 @@
+"""
+DecisionMaker for the asyncio engine (engine.py --asyncio).
+
+Same trading decisions as DecisionMaker, but Redis messages are read by redis.asyncio on the
+event loop and Alpaca REST calls are awaited instead of blocking the consumer:
+
+    - place_order, replace_order and cancel_order run as tasks instead of on DecisionMaker's
+      order pool, with the same SUBMITTING/CANCELLING handling.
+    - get_order_by_id (pending-order polls) and get_shares_count (when the position cache needs
+      reconciling) run as tasks too; their results feed back into the same handlers DecisionMaker uses.
+
+Create it from a coroutine running on the engine's loop: startup may already schedule tasks.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Optional, Set
+
+from alpaca.trading.enums import OrderSide
+
+from ..brokerages.async_alpaca_interface import AsyncAlpacaInterface
+from ..common.constants import ORDER_RECONCILE_MIN_SEC
+from ..common.notify import send_notification
+
+from .action_queue import AsyncActionQueue
+from .constants import OrderState
+from .decision_maker import DecisionMaker
+from .inline_executor import InlineExecutor
+
+from ....utils.redis import (
+    AsyncRedisSubscriber, CHANNELS, REDIS_HOST_DOCKER, REDIS_PORT, REDIS_DB
+)
+
+
+class AsyncDecisionMaker(DecisionMaker):
+    def __init__(self, csv_service, alpaca_interface, async_alpaca_interface: Optional[AsyncAlpacaInterface] = None):
+        self.async_alpaca_interface = async_alpaca_interface or AsyncAlpacaInterface(alpaca_interface)
+        self.subscriber: Optional[AsyncRedisSubscriber] = None
+        self.producer_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        super().__init__(csv_service, alpaca_interface)
+
+    def _create_action_queue(self):
+        return AsyncActionQueue()
+
+    def _create_order_executor(self) -> Executor:
+        # Alpaca calls are tasks on the loop (see _spawn), so there is no order pool to start
+        return InlineExecutor()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        # The loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Alpaca task {task.get_coro().__name__} failed: {task.exception()}")
+
+    def _reconcile_share_count(self):
+        self._spawn(self._fetch_share_count())
+
+    async def _fetch_share_count(self):
+        self._verify_share_count(await self.async_alpaca_interface.get_shares_count())
+
+    def _submit_order(self, side: OrderSide, limit_price: float, quantity: float, row) -> bool:
+        if not self._ladder_is_saved():
+            return False
+        self.order_state = OrderState.SUBMITTING
+        self._spawn(self._place_order(side, limit_price, quantity, row, self._take_tick_stamps()))
+        return True
+
+    async def _place_order(self, side: OrderSide, limit_price: float, quantity: float, row, stamps=None) -> None:
+        try:
+            order = await self.async_alpaca_interface.place_order(side, limit_price, quantity)
+        except Exception as e:
+            self.logger.error(f"Error placing {side.value} order: {e}")
+            order = None
+        self._stamp_submitted(stamps)
+        self._order_submitted(order, side, row)
+        self._record_latency(stamps)
+
+    def _replace_pending_order(self, limit_price: float, quantity: int, row) -> bool:
+        side = OrderSide(self.pending_order.side)
+        if not self._ladder_is_saved():
+            return False
+        self.order_state = OrderState.SUBMITTING
+        self._spawn(self._replace_order(self.pending_order.id, limit_price, quantity, side, row, self._take_tick_stamps()))
+        return True
+
+    async def _replace_order(self, order_id, limit_price: float, quantity: int, side: OrderSide, row, stamps=None) -> None:
+        try:
+            order = await self.async_alpaca_interface.replace_order(order_id, limit_price, quantity)
+        except Exception as e:
+            self.logger.error(f"Error replacing {side.value} order: {e}")
+            order = None
+        self._stamp_submitted(stamps)
+        self._order_replaced(order, side, row)
+        self._record_latency(stamps)
+
+    @staticmethod
+    def _stamp_submitted(stamps) -> None:
+        if stamps is not None:
+            stamps['submitted'] = time.time()
+
+    def _cancel_pending_order(self, reason: str) -> None:
+        order_id = self.pending_order.id
+        side = OrderSide(self.pending_order.side).value
+        self.order_state = OrderState.CANCELLING
+        self._spawn(self._cancel_order(order_id, side, reason))
+
+    async def _cancel_order(self, order_id, side, reason: str) -> None:
+        try:
+            cancel_success = await self.async_alpaca_interface.cancel_order(order_id)
+        except Exception as e:
+            self.logger.error(f"Error cancelling {side} order {order_id}: {e}")
+            cancel_success = False
+        self._after_cancel(cancel_success, order_id, side, reason)
+
+    def _refresh_pending_order(self) -> None:
+        self._spawn(self._fetch_pending_order(self.pending_order.id))
+
+    async def _fetch_pending_order(self, order_id) -> None:
+        try:
+            latest_order = await self.async_alpaca_interface.get_order_by_id(order_id)
+            self.queue_manual_order_update(latest_order)
+        except Exception as e:
+            send_notification("Bot needs help", "Failed to manually trigger order update")
+            self.logger.error(f"Failed to manually trigger order update: {e}")
+
+    async def launch_action_producers(self):
+        """Register with the broker and start reading the ticker channel on this loop."""
+        # One-off publish; keep the blocking Redis client off the loop
+        await asyncio.to_thread(self.register_with_broker)
+        self.subscriber = AsyncRedisSubscriber(host=REDIS_HOST_DOCKER, port=REDIS_PORT, db=REDIS_DB)
+        channel_name = CHANNELS.get_ticker_channel(self.csv_service.ticker)
+        assert await self.subscriber.subscribe(channel_name, self.on_redis_message) == True, f"Failed to subscribe to channel {channel_name}"
+        self.logger.info(f"Subscribed to channel {channel_name}")
+        self.producer_task = asyncio.create_task(self.subscriber.listen())
+        self.logger.info("Started async Redis subscriber.")
+
+    async def consume_actions(self):
+        if self.publisher is None:
+            self.logger.error("Publisher is not initialized. Cannot consume actions. Quitting.")
+            return
+        while True:
+            try:
+                message = await asyncio.wait_for(self.action_queue.get(), ORDER_RECONCILE_MIN_SEC)
+            except asyncio.TimeoutError:
+                self._check_reconcile()
+                continue
+            try:
+                self._handle_action(message)
+            except (Exception, SystemExit):
+                self.dump_trace("error")
+                raise
+            self.action_queue.task_done()
+            self._check_reconcile()
+
+    async def close(self):
+        """Stop the subscriber and any Alpaca calls still waiting on the loop."""
+        if self.producer_task is not None:
+            self.producer_task.cancel()
+        if self.subscriber is not None:
+            await self.subscriber.close()
+        for task in list(self._tasks):
+            task.cancel()
+        self.async_alpaca_interface.close()
+        self._order_executor.shutdown(wait=False)
@@ -4,10 +4,15 @@ from enum import Enum, auto
 class MessageType(Enum):
     PRICE_UPDATE = auto()
     ORDER_UPDATE = 'order_update'
+    ORDER_SUBMITTED = 'order_submitted'  # a place_order call on the order pool returned
+    CANCEL_RESULT = 'cancel_result'      # a cancel_order call on the order pool returned
+    ORDER_REPLACED = 'order_replaced'    # a replace_order call on the order pool returned
 
 class OrderState(Enum):
     NONE = auto()
     BUYING = auto()
     SELLING = auto()
     CANCELLING = auto()
+    SUBMITTING = auto()  # place_order is in flight; the order isn't known yet
+
     
\ No newline at end of file
@@ -1,8 +1,9 @@
-import queue
 import threading
 import asyncio
+import queue
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 import sys
-from typing import Tuple
+from typing import Optional, Tuple
 from datetime import datetime as dt, timezone
 import time
 
@@ -15,31 +16,56 @@ from alpaca.data.enums import DataFeed
 from alpaca.data.models.trades import Trade
 from alpaca.trading import TradeUpdate
 
-from ..common.logging_config import get_logger
+from ..common.logging_config import get_logger, get_sampled_logger
 from ..common.notify import send_notification
-from ..common.constants import TradingType
+from ..common.constants import (
+    LATENCY_REPORT_INTERVAL_SEC, ORDER_RECONCILE_MAX_SEC, ORDER_RECONCILE_MIN_SEC, TradingType
+)
 
 from ..csv_utils.csv_service import CSVService
 
+from .action_queue import ActionQueue
 from .constants import MessageType, OrderState
+from .decision_trace import DecisionTrace
+from .latency import LatencyTracker
 
 from ....utils.redis import ( 
     RedisSubscriber, RedisPublisher, CHANNELS, REDIS_HOST_DOCKER, REDIS_PORT, REDIS_DB
 )
 
 class DecisionMaker:
-    def __init__(self, csv_service, alpaca_interface):
+    def __init__(self, csv_service, alpaca_interface, publisher: RedisPublisher = None):
         self.logger = get_logger("decision_maker")
+        self.tick_logger = get_sampled_logger("decision_maker")  # for lines logged on every tick
         self.logger.info(f"Initializing DecisionMaker for {csv_service.ticker}")
         self.csv_service: CSVService = csv_service
         self.alpaca_interface = alpaca_interface
-        self.action_queue = queue.Queue()
+        # Order updates jump ahead of prices and queued prices collapse to the latest (see action_queue.py)
+        self.action_queue = self._create_action_queue()
         self.producer_thread = None
-        self.publisher = None
-        self.last_manual_update_time = 0  # Timestamp of last manual order update
-        self.manual_update_interval_sec = 10
+        self.publisher = publisher  # shared by every ticker in the multi-ticker engine, otherwise created on registration
+        # Pending-order polls in case a stream update is lost: due at _reconcile_at (monotonic), the
+        # delay doubling from ORDER_RECONCILE_MIN_SEC to ORDER_RECONCILE_MAX_SEC until new activity
+        self._reconcile_delay = ORDER_RECONCILE_MIN_SEC
+        self._reconcile_at = time.monotonic() + ORDER_RECONCILE_MIN_SEC
+        self._reconciled_at = float("-inf")  # monotonic time of the last poll
+        self.order_reconciler = None  # shared OrderReconciler in the multi-ticker engine, see order_reconciler.py
+        # place_order/cancel_order run here; their results come back through the action queue
+        self._order_executor = self._create_order_executor()
+        self._held_order_updates = []  # order updates that arrived while SUBMITTING
+        self._replaced_order_id = None  # the last order we replaced, whose final update still carries its fills
+        self._deferred_price = None    # latest price seen while SUBMITTING
+        self.latency = LatencyTracker()  # tick-to-order latency per stage, see latency.py
+        self._tick_stamps = None         # stamps of the tick being decided on
+        self._latency_reported_at = time.monotonic()
+        self.trace = DecisionTrace(csv_service.ticker)  # last decisions, dumped on SIGUSR1 or error, see decision_trace.py
+        self._trace_record = None  # record of the tick being decided on
 
         self.logger.info(f"Initializing pending order variables.")
+        # handle_order_update below reads these, so they must exist before a saved order is checked
+        self.pending_order = None
+        self.pending_order_index = None
+        self.order_state = OrderState.NONE
         pending_order_info = self.csv_service.get_pending_order_info()
         if pending_order_info:
             order_id = pending_order_info["order_id"]
@@ -47,30 +73,45 @@ class DecisionMaker:
                 self.logger.info(f"Pending order found: {order_id} at index {pending_order_info['index']}")
                 self.pending_order = self.alpaca_interface.get_order_by_id(order_id)
                 self.pending_order_index = pending_order_info["index"]
+                self.order_state = OrderState.BUYING if self.pending_order.side == OrderSide.BUY else OrderState.SELLING
                 self.logger.info(f"Pending order initialized: {self.pending_order}. Handling order update.")
+                # May settle it (filled or cancelled while we were down), which resets the state to NONE
                 self.handle_order_update(self.pending_order)
-                self.order_state = OrderState.BUYING if self.pending_order.side == OrderSide.BUY else OrderState.SELLING
             else:
                 self.logger.error("Pending order found but order_id is None. Exciting")
                 sys.exit()
         else:
             self.logger.debug("No pending order found.")
-            self.pending_order = None
-            self.pending_order_index = None
-            self.order_state = OrderState.NONE
 
         # Get initial price and put it on the queue
         self.logger.info("Getting initial price and putting it on the queue.")
         current_price = self.alpaca_interface.get_current_price()
         self._prev_price = current_price
-        self.action_queue.put({'type': 'price_update', 'data': current_price})
+        self.action_queue.put_nowait({'type': 'price_update', 'data': current_price})
 
         self.logger.info("Checking share count.")
         # self._check_share_count()
 
 
+    def _create_action_queue(self):
+        return ActionQueue()
+
+    def _create_order_executor(self) -> Executor:
+        return ThreadPoolExecutor(max_workers=2, thread_name_prefix="order_submit")
+
     def _check_share_count(self):
-        alpaca_shares = self.alpaca_interface.get_shares_count()
+        # Trade updates keep the broker's position cache current, so a fill or cancel doesn't cost a REST call
+        cached_shares = self.alpaca_interface.get_cached_shares_count()
+        if cached_shares is not None and cached_shares == self.csv_service.get_current_held_shares():
+            self.logger.info(f"Shares count verified from position cache: {cached_shares}")
+            return
+        # Cache is due for reconciliation or disagrees with the ladder: ask Alpaca before deciding anything
+        self._reconcile_share_count()
+
+    def _reconcile_share_count(self):
+        self._verify_share_count(self.alpaca_interface.get_shares_count())
+
+    def _verify_share_count(self, alpaca_shares):
         csv_shares = self.csv_service.get_current_held_shares()
         if alpaca_shares != csv_shares:
             self.logger.error(f"Mismatch in shares: Alpaca ({alpaca_shares}) vs CSV ({csv_shares}). Exiting.")
@@ -78,20 +119,30 @@ class DecisionMaker:
         self.logger.info(f"Shares count verified: Alpaca ({alpaca_shares}) vs CSV ({csv_shares})")
 
     def handle_order_update(self, order: Order):
+        if self.order_state == OrderState.SUBMITTING:
+            # A fill can beat the place_order response; apply it once the order is recorded
+            self.logger.info(f"Holding order update for {order.id} until the submitted order is recorded")
+            self._held_order_updates.append(order)
+            return
         if not self.pending_order:
             self.logger.warning("THERE IS NO ORDER TO WARRRANT AN ORDER UPDATE. Can't update. POSSIBLE BUG OR DUPLICATE ORDER UPDATE")
             return
         if self.pending_order.id != order.id:
+            if order.id == self._replaced_order_id and order.status == OrderStatus.REPLACED:
+                self._handle_replaced_order(order)
+                return
             self.logger.warning(f"Mismatch. Current pid:{self.pending_order.id}, update_pid:{order.id}")
             self.logger.warning("Dropping order update")
             return
-        self.logger.debug(f"Handling order update. Current pending order is {self.pending_order}")
-        self.logger.debug(f"Incoming order {order}")
+        # Lazy arguments: the Order reprs are only built if a handler takes DEBUG (on the listener thread with SCALE_T_LOG_QUEUE)
+        self.logger.debug("Handling order update. Current pending order is %s", self.pending_order)
+        self.logger.debug("Incoming order %s", order)
         self.logger.debug(f"At index {self.pending_order_index} of type {type(self.pending_order_index)}")
         status = order.status
         filled_qty = float(order.filled_qty)
         filled_avg_price = float(order.filled_avg_price) if order.filled_avg_price is not None else None 
         side = order.side 
+        self.trace.add("order_update", status, order_id=order.id, side=side, price=filled_avg_price, qty=filled_qty)
         self.logger.info(f"Handling order update. Order status: {status}, Order ID: {order.id}")
         if status == OrderStatus.FILLED:
             self.logger.info("Order filled")
@@ -136,6 +187,7 @@ class DecisionMaker:
             OrderStatus.PARTIALLY_FILLED,
             OrderStatus.PENDING_NEW,
             OrderStatus.PENDING_CANCEL,
+            OrderStatus.PENDING_REPLACE,
         ):
             self.logger.info("Order pending")
             self.logger.info(f"Order status: PENDING. Status: {status}")
@@ -154,66 +206,112 @@ class DecisionMaker:
                     order_price = associated_csv_line["sell_price"]
             else :
                 order_price = self.pending_order.limit_price
+            self._trace(cancel_at=float(order_price) * (1.0025 if self.pending_order.side == 'buy' else 0.9975))
             if self.pending_order.side == 'buy' and current_price >= float(order_price) * 1.0025:
+                # Re-quote in one call if the ladder still wants to buy at this price
+                if self._replace_for_rows(self.csv_service.get_rows_for_buy(current_price), current_price):
+                    return True
                 self.logger.info(f"Decision: Cancelling buy order. Order ID: {self.pending_order.id}, Expected price: {order_price}, Current price: {current_price}")
+                self._trace(outcome="cancel", order_id=self.pending_order.id)
                 send_notification("Bot needs help", "SomeDetails")
                 #input("Approve buy order cancellation? (press Enter to continue)")
-                cancel_success = self.alpaca_interface.cancel_order(self.pending_order.id)
-                self.order_state = OrderState.CANCELLING
-                if not cancel_success:
-                    self.logger.warning(f"Failed to cancel buy order ID: {self.pending_order.id}, manually triggering order update")
-                    # Manually trigger order update in the queue to catch any missed updates
-                    self._trigger_manual_order_update()
-                    return True  # Still indicate cancellation was attempted
-                self.logger.info(f"Cancelled buy order due to price increase. Order ID: {self.pending_order.id}")
-                return True  # Indicate that a cancellation occurred
+                self._cancel_pending_order("due to price increase")
+                return True  # Indicate that a cancellation occurred (or was attempted)
             elif self.pending_order.side == 'sell' and current_price <= float(order_price) * 0.9975:
+                if self._replace_for_rows(self.csv_service.get_rows_for_sell(current_price), current_price):
+                    return True
                 self.logger.info(f"Decision: Cancelling sell order. Order ID: {self.pending_order.id}, Expected price: {order_price}, Current price: {current_price}")
+                self._trace(outcome="cancel", order_id=self.pending_order.id)
                 send_notification("Bot needs help", "SomeDetails")
                 #input("Approve sell order cancellation? (press Enter to continue)")
-                cancel_success = self.alpaca_interface.cancel_order(self.pending_order.id)
-                self.order_state = OrderState.CANCELLING
-                if not cancel_success:
-                    self.logger.warning(f"Failed to cancel sell order ID: {self.pending_order.id}, manually triggering order update")
-                    # Manually trigger order update in the queue to catch any missed updates
-                    self._trigger_manual_order_update()
-                    return True  # Still indicate cancellation was attempted
-                self.logger.info(f"Cancelled sell order due to price decrease. Order ID: {self.pending_order.id}")
-                return True  # Indicate that a cancellation occurred
+                self._cancel_pending_order("due to price decrease")
+                return True  # Indicate that a cancellation occurred (or was attempted)
         return False
+
+    def _cancel_pending_order(self, reason: str) -> None:
+        """Cancel the pending order on the order pool and wait for its order update (CANCELLING)."""
+        order_id = self.pending_order.id
+        side = OrderSide(self.pending_order.side).value
+        self.order_state = OrderState.CANCELLING
+        future = self._order_executor.submit(self.alpaca_interface.cancel_order, order_id)
+        future.add_done_callback(lambda future: self.action_queue.put_nowait(
+            {'type': MessageType.CANCEL_RESULT, 'data': (future, order_id, side, reason)}))
+
+    def _handle_cancel_result(self, future: Future, order_id, side, reason: str) -> None:
+        try:
+            cancel_success = future.result()
+        except Exception as e:
+            self.logger.error(f"Error cancelling {side} order {order_id}: {e}")
+            cancel_success = False
+        self._after_cancel(cancel_success, order_id, side, reason)
+
+    def _after_cancel(self, cancel_success: bool, order_id, side, reason: str) -> None:
+        if not cancel_success:
+            self.logger.warning(f"Failed to cancel {side} order ID: {order_id} {reason}, manually triggering order update")
+            self.trace.add("cancel_result", "failed", order_id=order_id, side=side)
+            # Manually trigger order update in the queue to catch any missed updates
+            self._trigger_manual_order_update()
+            return
+        self.logger.info(f"Cancelled {side} order {reason}. Order ID: {order_id}")
+        self.trace.add("cancel_result", "cancelled", order_id=order_id, side=side)
         
     def _trigger_manual_order_update(self):
         """Manually trigger an order update to catch any missed updates.
-        
-        Only triggers the update once per minute to avoid excessive updates.
-        Uses direct Alpaca objects and places them in the queue for consistent handling.
+
+        Polls the pending order now, unless the last poll was less than ORDER_RECONCILE_MIN_SEC
+        ago; then the next scheduled poll is brought forward to that point instead.
         """
-        current_time = time.time()
-        # Check if it's been at least 10 seconds since the last manual update
-        if current_time - self.last_manual_update_time < self.manual_update_interval_sec:
-            self.logger.info(f"Skipping manual order update - last update was less than a {self.manual_update_interval_sec} secs ago")
+        now = time.monotonic()
+        self._reconcile_delay = ORDER_RECONCILE_MIN_SEC
+        self._reconcile_at = max(now, self._reconciled_at + ORDER_RECONCILE_MIN_SEC)
+        if self._reconcile_at > now:
+            self.logger.info(f"Deferring manual order update - last update was less than {ORDER_RECONCILE_MIN_SEC} secs ago")
+        self._check_reconcile()
+
+    def _reset_reconcile(self) -> None:
+        """New activity on the pending order: poll it again soon, then back off from there."""
+        self._reconcile_delay = ORDER_RECONCILE_MIN_SEC
+        self._reconcile_at = time.monotonic() + ORDER_RECONCILE_MIN_SEC
+
+    def _check_reconcile(self) -> None:
+        """Poll the pending order from Alpaca if it is due, and back off the next poll."""
+        if self.pending_order is None or self.order_state == OrderState.SUBMITTING:
             return
-            
-        if self.pending_order:
-            # Refresh the order data from Alpaca
-            try:
-                # Get the latest order directly from Alpaca
-                latest_order = self.alpaca_interface.get_order_by_id(self.pending_order.id)
-                
-                # Create a proper TradeUpdate object that matches what comes from the Alpaca stream
-                trade_update = TradeUpdate(order=latest_order, event=MessageType.ORDER_UPDATE.value, timestamp=dt.now(timezone.utc))
-                
-                # Queue the update just like the websocket would
-                self.action_queue.put({'type': MessageType.ORDER_UPDATE, 'data': trade_update, 'source': 'manual'})
-                
-                self.logger.info(f"Manually triggered order update for order ID: {latest_order.id}")
-                self.logger.info(f"Order status: {latest_order.status}")
-                
-                # Update the timestamp of the last manual update
-                self.last_manual_update_time = current_time
-            except Exception as e:
-                send_notification("Bot needs help", "Failed to manually trigger order update")
-                self.logger.error(f"Failed to manually trigger order update: {e}")
+        now = time.monotonic()
+        if now < self._reconcile_at:
+            return
+        self._reconciled_at = now
+        self._reconcile_at = now + self._reconcile_delay
+        self._reconcile_delay = min(self._reconcile_delay * 2, ORDER_RECONCILE_MAX_SEC)
+        self.tick_logger.info("Reconciling pending order %s, next poll in %.0fs", self.pending_order.id, self._reconcile_at - now)
+        if self.order_reconciler is not None:
+            self.order_reconciler.request(self, self.pending_order)
+        else:
+            self._refresh_pending_order()
+
+    def _refresh_pending_order(self) -> None:
+        # Ask Alpaca on the order pool; the result comes back as an order update
+        self._order_executor.submit(self._fetch_pending_order, self.pending_order.id)
+
+    def _fetch_pending_order(self, order_id) -> None:
+        try:
+            # Get the latest order directly from Alpaca
+            latest_order = self.alpaca_interface.get_order_by_id(order_id)
+            self.queue_manual_order_update(latest_order)
+        except Exception as e:
+            send_notification("Bot needs help", "Failed to manually trigger order update")
+            self.logger.error(f"Failed to manually trigger order update: {e}")
+
+    def queue_manual_order_update(self, latest_order: Order, source: str = 'reconcile') -> None:
+        """Queue latest_order as an order update, as if it came from the stream (pending-order polls, OrderReconciler)."""
+        # Create a proper TradeUpdate object that matches what comes from the Alpaca stream
+        trade_update = TradeUpdate(order=latest_order, event=MessageType.ORDER_UPDATE.value, timestamp=dt.now(timezone.utc))
+
+        # Queue the update just like the websocket would
+        self.action_queue.put_nowait({'type': MessageType.ORDER_UPDATE, 'data': trade_update, 'source': source})
+
+        self.logger.info(f"Manually triggered order update for order ID: {latest_order.id}")
+        self.logger.info(f"Order status: {latest_order.status}")
 
 
     def _check_place_buy_order(self, current_price):
@@ -222,34 +320,24 @@ class DecisionMaker:
             # If we have a pending sell order but want to buy, cancel the sell order first
             if self.pending_order and self.pending_order.side == 'sell':
                 self.logger.info(f"Cancelling pending sell order to place buy order. Order ID: {self.pending_order.id}")
+                self._trace(rows=[row['index'] for row in rows_to_buy], outcome="cancel", order_id=self.pending_order.id)
                 send_notification("Bot needs help", "SomeDetails")
                 #input("Approve cancellation of sell order to place buy order? (press Enter to continue)")
-                cancel_success = self.alpaca_interface.cancel_order(self.pending_order.id)
-                self.order_state = OrderState.CANCELLING
-                if not cancel_success:
-                    self.logger.warning(f"Failed to cancel sell order ID: {self.pending_order.id} for buy placement, manually triggering order update")
-                    # Manually trigger order update in the queue to catch any missed updates
-                    self._trigger_manual_order_update()
-                # self._refresh_pending_order()
+                self._cancel_pending_order("for buy placement")
                 return True  # Return after cancellation to wait for order update
             elif self.pending_order and self.pending_order.side == 'buy':
-                self.logger.debug("Pending buy order found. Skipping buy order placement.")
+                # More rows became buyable: grow the pending order in one call
+                if self._replace_for_rows(rows_to_buy, current_price, resize_only=True):
+                    return True
+                self.tick_logger.debug("Pending buy order found. Skipping buy order placement.")
                 return False
 
-            self.logger.info(f"Checked to place buy order at price {current_price}")
-            self.logger.debug(f"Rows to buy: {len(rows_to_buy)}")
-
-            total_qty_to_buy = sum(float(row['target_shares']) - float(row['held_shares']) for row in rows_to_buy)
-            # We need to place whole orders before fractional orders
-            # Check if order amount is greater than 1 + trim the decimals and place order
-            # Otherwise just place order(Covers everything less than one and whole shares off the bat)
-            if total_qty_to_buy > 1 and total_qty_to_buy % 1 > 0:
-                self.logger.debug(f"Wanted to buy {total_qty_to_buy} but trimming to {int(total_qty_to_buy)}")
-                total_qty_to_buy = int(total_qty_to_buy)
-            # Find the row with the lowest buy_price (highest index)
-            row_to_buy = rows_to_buy[-1]
-            buy_price = float(row_to_buy['buy_price'])
-            limit_price = round(min(current_price + 0.01, buy_price), 2)
+            self.tick_logger.info("Checked to place buy order at price %s", current_price)
+            self.tick_logger.debug("Rows to buy: %d", len(rows_to_buy))
+
+            total_qty_to_buy, limit_price, row_to_buy = self._plan_buy_order(rows_to_buy, current_price)
+            buy_price = row_to_buy['buy_price']
+            self._trace(rows=[row['index'] for row in rows_to_buy], side=OrderSide.BUY, qty=total_qty_to_buy, limit_price=limit_price)
             if total_qty_to_buy < 0.01:  # Support fractional shares
                 return False
 
@@ -262,18 +350,9 @@ class DecisionMaker:
                 self.logger.info(f"Decision: Placing buy order. Quantity: {total_qty_to_buy}, Limit price: {limit_price}, Buy price: {buy_price}, Current price: {current_price}")
                 self.logger.info(f"Unrealized profit: {buy_has_unrealized_profit}")
                 send_notification("Bot needs help", "SomeDetails")
+            self._trace(outcome="buy")
             try:
-                order = self.alpaca_interface.place_order(OrderSide.BUY, limit_price, total_qty_to_buy)
-                self.order_state = OrderState.BUYING
-                if order is None:
-                    self.logger.error("Failed to place buy order")
-                    return False
-                self.pending_order = order
-                self.pending_order_index = int(row_to_buy['index'])
-                row_to_buy['pending_order_id'] = order.id
-                self.csv_service.save()
-                self.last_manual_update_time = time.time() # keep record of when order was placed
-                return True
+                return self._submit_order(OrderSide.BUY, limit_price, total_qty_to_buy, row_to_buy)
             except Exception as e:
                 self.logger.error(f"Error placing buy order: {e}")
                 return False
@@ -285,33 +364,26 @@ class DecisionMaker:
             # If we have a pending buy order but want to sell, cancel the buy order first
             if self.pending_order and self.pending_order.side == 'buy':
                 self.logger.info(f"Cancelling pending buy order to place sell order. Order ID: {self.pending_order.id}")
+                self._trace(rows=[row['index'] for row in rows_to_sell], outcome="cancel", order_id=self.pending_order.id)
                 send_notification("Bot needs help", "SomeDetails")
                 #input("Approve cancellation of buy order to place sell order? (press Enter to continue)")
-                cancel_success = self.alpaca_interface.cancel_order(self.pending_order.id)
-                self.order_state = OrderState.CANCELLING
-                if not cancel_success:
-                    self.logger.warning(f"Failed to cancel buy order ID: {self.pending_order.id} for sell placement, manually triggering order update")
-                    # Manually trigger order update in the queue to catch any missed updates
-                    self._trigger_manual_order_update()
-                # self._refresh_pending_order()
+                self._cancel_pending_order("for sell placement")
                 return True  # Return after cancellation to wait for order update
             elif self.pending_order and self.pending_order.side == 'sell':
-                self.logger.debug(f"Skipping sell order as there is already a pendingOrder of sell")
+                if self._replace_for_rows(rows_to_sell, current_price, resize_only=True):
+                    return True
+                self.tick_logger.debug("Skipping sell order as there is already a pendingOrder of sell")
                 return False
 
-            self.logger.info(f"Checked to place sell order at price {current_price}")
-            self.logger.debug(f"Rows to sell: {len(rows_to_sell)}")
+            self.tick_logger.info("Checked to place sell order at price %s", current_price)
+            self.tick_logger.debug("Rows to sell: %d", len(rows_to_sell))
 
-            total_qty_to_sell = sum(float(row['held_shares']) for row in rows_to_sell)
-
-            if total_qty_to_sell > 1 and total_qty_to_sell % 1 > 0:
-                self.logger.debug(f"Wanted to sell {total_qty_to_sell} but trimming to {int(total_qty_to_sell)}")
-                total_qty_to_sell = int(total_qty_to_sell)
-            row_to_sell = rows_to_sell[0]
-            sell_price = float(row_to_sell['sell_price'])
-            limit_price = round(max(current_price - 0.01, sell_price), 2)
+            total_qty_to_sell, limit_price, row_to_sell = self._plan_sell_order(rows_to_sell, current_price)
+            sell_price = row_to_sell['sell_price']
+            self._trace(rows=[row['index'] for row in rows_to_sell], side=OrderSide.SELL, qty=total_qty_to_sell,
+                        limit_price=limit_price, outcome="sell")
             sell_has_extra_profit = sell_price != limit_price
-            unrealized_profit = float(row_to_sell['unrealized_profit'])
+            unrealized_profit = row_to_sell['unrealized_profit']
             if total_qty_to_sell == 1 and (sell_has_extra_profit or unrealized_profit > 0):
                 self.logger.info(f"Decision: Placing sell order for 1 share. Limit price: {limit_price}")
                 self.logger.info(f"Extra profit: {sell_has_extra_profit}")
@@ -324,23 +396,183 @@ class DecisionMaker:
                 send_notification("Bot needs help", "SomeDetails")
             self.logger.info("Placing sell order.")
             try:
-                order = self.alpaca_interface.place_order(OrderSide.SELL, limit_price, total_qty_to_sell)
-                self.order_state = OrderState.SELLING
-                if order is None:
-                    self.logger.error("Failed to place sell order")
-                    return False
-                self.pending_order = order
                 self.logger.info(f"Row to sell index: {row_to_sell['index']}")
-                self.pending_order_index = int(row_to_sell['index'])
-                row_to_sell['pending_order_id'] = order.id
-                self.csv_service.save()
-                self.last_manual_update_time = time.time() # keep record of when order was placed
-                return True #Indicate that we placed a sell order
+                return self._submit_order(OrderSide.SELL, limit_price, total_qty_to_sell, row_to_sell)
             except Exception as e:
                 self.logger.error(f"Error placing sell order: {e}")
                 return False
         return False
 
+    def _plan_buy_order(self, rows_to_buy, current_price) -> Tuple[float, float, object]:
+        """Quantity, limit price and pending row for a buy covering rows_to_buy."""
+        total_qty_to_buy = sum(row['target_shares'] - row['held_shares'] for row in rows_to_buy)
+        # We need to place whole orders before fractional orders
+        # Check if order amount is greater than 1 + trim the decimals and place order
+        # Otherwise just place order(Covers everything less than one and whole shares off the bat)
+        if total_qty_to_buy > 1 and total_qty_to_buy % 1 > 0:
+            self.logger.debug(f"Wanted to buy {total_qty_to_buy} but trimming to {int(total_qty_to_buy)}")
+            total_qty_to_buy = int(total_qty_to_buy)
+        # Find the row with the lowest buy_price (highest index)
+        row_to_buy = rows_to_buy[-1]
+        limit_price = round(min(current_price + 0.01, row_to_buy['buy_price']), 2)
+        return total_qty_to_buy, limit_price, row_to_buy
+
+    def _plan_sell_order(self, rows_to_sell, current_price) -> Tuple[float, float, object]:
+        """Quantity, limit price and pending row for a sell covering rows_to_sell."""
+        total_qty_to_sell = sum(row['held_shares'] for row in rows_to_sell)
+
+        if total_qty_to_sell > 1 and total_qty_to_sell % 1 > 0:
+            self.logger.debug(f"Wanted to sell {total_qty_to_sell} but trimming to {int(total_qty_to_sell)}")
+            total_qty_to_sell = int(total_qty_to_sell)
+        row_to_sell = rows_to_sell[0]
+        limit_price = round(max(current_price - 0.01, row_to_sell['sell_price']), 2)
+        return total_qty_to_sell, limit_price, row_to_sell
+
+    def _replace_for_rows(self, rows, current_price, resize_only: bool = False) -> bool:
+        """
+        Re-price (or, with resize_only, only grow) the pending order so it covers rows, in one
+        replace call instead of cancel, wait for CANCELED, place. Returns True if a replace was sent.
+
+        Only whole-share limit orders with nothing filled are replaced; the rest keep the
+        cancel-then-place path (fractional orders are market orders, and a partly filled order
+        would leave its fills split across two orders).
+        """
+        if not rows:
+            return False
+        order = self.pending_order
+        if order.order_type != OrderType.LIMIT or float(order.filled_qty or 0) > 0:
+            return False
+        if order.side == 'buy':
+            quantity, limit_price, row = self._plan_buy_order(rows, current_price)
+        else:
+            quantity, limit_price, row = self._plan_sell_order(rows, current_price)
+        if quantity < 1 or quantity % 1 > 0:
+            return False
+        if resize_only and quantity <= float(order.qty):
+            return False
+        self._trace(rows=[row['index'] for row in rows], side=OrderSide(order.side), qty=quantity, limit_price=limit_price,
+                    outcome="replace", order_id=order.id)
+        self.logger.info(f"Decision: Replacing {order.side} order {order.id}. Quantity: {order.qty} -> {quantity}, Limit price: {order.limit_price} -> {limit_price}, Current price: {current_price}")
+        return self._replace_pending_order(limit_price, int(quantity), row)
+
+    def _replace_pending_order(self, limit_price: float, quantity: int, row) -> bool:
+        """
+        Send a replace for the pending order to the order pool (SUBMITTING, like a new order).
+        The result comes back as an ORDER_REPLACED action.
+        """
+        order_id = self.pending_order.id
+        side = OrderSide(self.pending_order.side)
+        if not self._ladder_is_saved():
+            return False
+        self.order_state = OrderState.SUBMITTING
+        stamps = self._take_tick_stamps()
+        future = self._order_executor.submit(self.alpaca_interface.replace_order, order_id, limit_price, quantity)
+        future.add_done_callback(lambda future: self._queue_order_result(MessageType.ORDER_REPLACED, (future, side, row), stamps))
+        return True
+
+    def _handle_order_replaced(self, future: Future, side: OrderSide, row) -> None:
+        try:
+            order = future.result()
+        except Exception as e:
+            self.logger.error(f"Error replacing {side.value} order: {e}")
+            order = None
+        self._order_replaced(order, side, row)
+
+    def _order_replaced(self, order: Order, side: OrderSide, row) -> None:
+        """Switch the ladder over to the replacement order, or keep the old one if the replace failed."""
+        if order is None:
+            # Most likely filled or cancelled meanwhile; its order update settles it
+            self.logger.warning(f"Could not replace order {self.pending_order.id}, keeping it")
+            self.trace.add("order_result", "replace_failed", side=side, order_id=self.pending_order.id)
+            self.order_state = OrderState.BUYING if side == OrderSide.BUY else OrderState.SELLING
+            self._replay_held_actions()
+            return
+        self.logger.info(f"Replaced order {self.pending_order.id} with {order.id}")
+        self._replaced_order_id = self.pending_order.id
+        old_row = self.csv_service.get_row_by_index(self.pending_order_index)
+        if old_row and old_row['index'] != row['index']:
+            old_row['pending_order_id'] = "None"
+        self._order_submitted(order, side, row)
+
+    def _handle_replaced_order(self, order: Order) -> None:
+        # Shares the old order filled before the replace went through still belong on the ladder
+        filled_qty = float(order.filled_qty)
+        self.logger.info(f"Replaced order {order.id} closed with {filled_qty} filled")
+        if filled_qty > 0:
+            self.csv_service.update_order_status(self.pending_order_index, filled_qty, float(order.filled_avg_price), order.side)
+            # update_order_status clears the row's pending_order_id, but the replacement order is still live on it
+            row = self.csv_service.get_row_by_index(self.pending_order_index)
+            row['pending_order_id'] = self.pending_order.id
+            self.csv_service.save()
+
+    def _submit_order(self, side: OrderSide, limit_price: float, quantity: float, row) -> bool:
+        """
+        Send an order for a ladder row to the order pool (SUBMITTING). The consumer keeps
+        taking ticks meanwhile; the result comes back as an ORDER_SUBMITTED action.
+        """
+        if not self._ladder_is_saved():
+            return False
+        self.order_state = OrderState.SUBMITTING
+        stamps = self._take_tick_stamps()
+        future = self._order_executor.submit(self.alpaca_interface.place_order, side, limit_price, quantity)
+        future.add_done_callback(lambda future: self._queue_order_result(MessageType.ORDER_SUBMITTED, (future, side, row), stamps))
+        return True
+
+    def _ladder_is_saved(self) -> bool:
+        """
+        The ladder must be on disk before an order that depends on it goes out. If the last
+        save couldn't be written, no order is sent; the next tick tries again.
+        """
+        if self.csv_service.flush():
+            return True
+        self.logger.error(f"Ladder for {self.csv_service.ticker} is not saved to disk, not sending the order")
+        self._trace(outcome="save_failed")
+        return False
+
+    def _queue_order_result(self, message_type: MessageType, data, stamps) -> None:
+        # Runs on the order pool thread as soon as the Alpaca call returns
+        if stamps is not None:
+            stamps['submitted'] = time.time()
+        self.action_queue.put_nowait({'type': message_type, 'data': data, 'stamps': stamps})
+
+    def _handle_order_submitted(self, future: Future, side: OrderSide, row) -> None:
+        try:
+            order = future.result()
+        except Exception as e:
+            self.logger.error(f"Error placing {side.value} order: {e}")
+            order = None
+        self._order_submitted(order, side, row)
+
+    def _order_submitted(self, order: Order, side: OrderSide, row) -> None:
+        """Record the broker's answer, then catch up on what arrived while SUBMITTING."""
+        if order is None:
+            self.trace.add("order_result", "failed", side=side)
+        else:
+            self.trace.add("order_result", "accepted", side=side, order_id=order.id, qty=order.qty, limit_price=order.limit_price)
+        self.order_state = OrderState.BUYING if side == OrderSide.BUY else OrderState.SELLING
+        self._record_placed_order(order, side, row)
+        self._replay_held_actions()
+
+    def _replay_held_actions(self) -> None:
+        """Catch up on the order updates and the latest price that arrived while SUBMITTING."""
+        held_order_updates, self._held_order_updates = self._held_order_updates, []
+        for held_order in held_order_updates:
+            self.handle_order_update(held_order)
+        if self._deferred_price is not None:
+            price, self._deferred_price = self._deferred_price, None
+            self.handle_price_update(price)
+
+    def _record_placed_order(self, order: Order, side: OrderSide, row) -> bool:
+        if order is None:
+            self.logger.error(f"Failed to place {side.value} order")
+            return False
+        self.pending_order = order
+        self.pending_order_index = row['index']
+        row['pending_order_id'] = order.id
+        self.csv_service.save()
+        self._reset_reconcile()  # a new order is first polled ORDER_RECONCILE_MIN_SEC after it was placed
+        return True
+
     def _filter_price_data(self, price: float) -> float | None:    
         if price == self._prev_price:
             return None
@@ -349,56 +581,155 @@ class DecisionMaker:
         return price
 
     def handle_price_update(self, price):
+        record = self._trace_record = self.trace.begin("tick", price, self.order_state)
+        try:
+            self._decide(price, record)
+        finally:
+            self._trace_record = None
+            self.trace.end(record)
+
+    def _decide(self, price, record) -> None:
         if self.order_state == OrderState.CANCELLING:
+            record.outcome = "ignored"
+            return
+        if self.order_state == OrderState.SUBMITTING:
+            # pending_order isn't known yet, so deciding now could double up the order
+            self._deferred_price = price
+            record.outcome = "deferred"
             return
 
         current_price = self._filter_price_data(price)
         if current_price is None:
+            record.outcome = "duplicate"
             return
+        # Without a pending order to cancel, a tick inside the ladder's idle band can't change anything
+        if self.pending_order is None:
+            idle_low, idle_high = self.csv_service.get_idle_band()
+            record.idle_low, record.idle_high = idle_low, idle_high
+            if idle_low < current_price < idle_high:
+                record.outcome = "idle"
+                return
         if self._check_cancel_order(current_price):
-            self.logger.info("Price update handled by cancel order check.")
+            self.tick_logger.info("Price update handled by cancel order check.")
             return  # If order was cancelled, don't proceed further
 
         # print("Checking to place sell order.")
         if self._check_place_sell_order(current_price):
-            self.logger.info("Price update handled by sell order check.")
+            self.tick_logger.info("Price update handled by sell order check.")
             return
 
         # print("Checking to place buy order.")
         if self._check_place_buy_order(current_price):
-            self.logger.info("Price update handled by buy order check.")
+            self.tick_logger.info("Price update handled by buy order check.")
             return
         
         # At this point, we have neither a pending order nor a new order to place
         # Check to see if we need to chase lines
         if self.csv_service.is_chasable_lines(current_price):
-            self.csv_service.chase_price({"current_price":current_price})
+            # Catch up to a gap in one rewrite instead of one $0.01 step per tick
+            self.csv_service.chase_price({"current_price":current_price}, catch_up=True)
+            record.outcome = "chase"
+        elif record.outcome is None:
+            record.outcome = "hold"
+
+    def _trace(self, **fields) -> None:
+        """Set fields on the record of the tick being decided on (decision_trace.py)."""
+        record = self._trace_record
+        if record is not None:
+            for field, value in fields.items():
+                setattr(record, field, value)
+
+    def dump_trace(self, reason: str) -> Optional[str]:
+        """Write the decision trace to DECISION_TRACE_DIR. Returns the file's path, or None if it couldn't be written."""
+        try:
+            path = self.trace.dump(reason)
+        except OSError as e:
+            self.logger.error(f"Failed to dump decision trace for {self.csv_service.ticker}: {e}")
+            return None
+        self.logger.info(f"Decision trace for {self.csv_service.ticker} ({reason}) written to {path}")
+        return path
 
     def consume_actions(self):
         if self.publisher is None:
             self.logger.error("Publisher is not initialized. Cannot consume actions. Quitting.")
             return
         while True:
-            message = self.action_queue.get()
-            if message['type'] == MessageType.ORDER_UPDATE:
-                self.logger.info(f"Handling order update from {message.get('source','unknown')}")
-                self.handle_order_update(message['data'].order)
-            elif message['type'] == 'price_update':                    
-                self.handle_price_update(message['data'])
-            else :
-                self.logger.error(f"Recieved an unknown message with type: {message['type']}")
-                self.logger.error(f"message: {message}")
+            try:
+                # Wake up without messages too, so a pending order whose updates stopped is still polled
+                message = self.action_queue.get(timeout=ORDER_RECONCILE_MIN_SEC)
+            except queue.Empty:
+                self._check_reconcile()
+                continue
+            try:
+                self._handle_action(message)
+            except (Exception, SystemExit):
+                # The decisions that led up to it, for the post-mortem
+                self.dump_trace("error")
+                raise
             self.action_queue.task_done()
+            self._check_reconcile()
+
+    def _handle_action(self, message):
+        if message['type'] == MessageType.ORDER_UPDATE:
+            self.logger.info(f"Handling order update from {message.get('source','unknown')}")
+            if message.get('source') != 'reconcile':
+                self._reset_reconcile()
+            if message['data'].position_qty is not None:
+                self.alpaca_interface.update_position(message['data'].position_qty)
+            self.handle_order_update(message['data'].order)
+        elif message['type'] == 'price_update':                    
+            if message.get('stamps') is None:
+                self.handle_price_update(message['data'])
+            else:
+                self._handle_stamped_price_update(message['data'], message['stamps'])
+        elif message['type'] == MessageType.ORDER_SUBMITTED:
+            self._handle_order_submitted(*message['data'])
+            self._record_latency(message.get('stamps'))
+        elif message['type'] == MessageType.CANCEL_RESULT:
+            self._handle_cancel_result(*message['data'])
+        elif message['type'] == MessageType.ORDER_REPLACED:
+            self._handle_order_replaced(*message['data'])
+            self._record_latency(message.get('stamps'))
+        else :
+            self.logger.error(f"Recieved an unknown message with type: {message['type']}")
+            self.logger.error(f"message: {message}")
+
+    def _handle_stamped_price_update(self, price, stamps) -> None:
+        """handle_price_update for a tick from Redis, timing its stages (see latency.py)."""
+        stamps['dequeued'] = time.time()
+        self._tick_stamps = stamps
+        try:
+            self.handle_price_update(price)
+        finally:
+            # Still set if no order went out; an order's stamps are recorded once it returns
+            if self._take_tick_stamps() is not None:
+                self._record_latency(stamps)
+
+    def _take_tick_stamps(self):
+        """The stamps of the tick being decided on, marked decided, or None if it isn't timed."""
+        stamps, self._tick_stamps = self._tick_stamps, None
+        if stamps is not None:
+            stamps['decided'] = time.time()
+        return stamps
+
+    def _record_latency(self, stamps) -> None:
+        if stamps is None:
+            return
+        self.latency.record(stamps)
+        if LATENCY_REPORT_INTERVAL_SEC and time.monotonic() - self._latency_reported_at >= LATENCY_REPORT_INTERVAL_SEC:
+            self._latency_reported_at = time.monotonic()
+            self.logger.info(f"Tick-to-order latency for {self.csv_service.ticker}:\n{self.latency.report()}")
 
     def launch_action_producer_threads(self):
         self.producer_thread = threading.Thread(target=self._subscribe_redis_producer, daemon=True)
         self.producer_thread.start()
         self.logger.info("Started action producer threads.")
 
-    def _subscribe_redis_producer(self):
+    def register_with_broker(self):
         # Need to add price subscriber here as well
         # Create a publisher and publish subscribe to price for ticker
-        self.publisher = RedisPublisher(host=REDIS_HOST_DOCKER, port=REDIS_PORT, db=REDIS_DB)
+        if self.publisher is None:
+            self.publisher = RedisPublisher(host=REDIS_HOST_DOCKER, port=REDIS_PORT, db=REDIS_DB)
         # Publish to the Broker channel
         message = {
             'action': 'subscribe',
@@ -406,29 +737,35 @@ class DecisionMaker:
         }
         self.publisher.publish(CHANNELS.BROKER_REGISTRATION, message_data=message, sender='scale_t')
         self.logger.info(f"Registered to channel {CHANNELS.BROKER_REGISTRATION} for ticker {self.csv_service.ticker}")
-        # Close publisher after subscribing
+
+    def on_redis_message(self, message):
+        data = message.get('data', {})
+        if data.get('type') == 'price':
+            price = data.get('price', None)
+            if price is not None:
+                # Stamps from the broker, if it sent them; the tick is timed from here on either way
+                stamps = dict(data.get('stamps') or {})
+                stamps['enqueued'] = time.time()
+                self.action_queue.put_nowait({'type': 'price_update', 'data': float(price), 'source': 'redis', 'stamps': stamps})
+        if data.get('type') == 'order':
+            trdUpdate = message.get('data', {}).get('order_data', {})
+            order_json = trdUpdate.get('order', None)
+            order = Order(**order_json)
+            myTradeUpdate = TradeUpdate(order=order, event=trdUpdate.get('event', None), timestamp=dt.fromisoformat(trdUpdate.get('timestamp')),
+                                        position_qty=trdUpdate.get('position_qty', None))
+            # Check if the message is a trade update
+            self.logger.info("Trade update: %s", myTradeUpdate)
+            self.logger.info(f"Trade update event: {myTradeUpdate.event}")
+            self.action_queue.put_nowait({'type': MessageType.ORDER_UPDATE, 'data': myTradeUpdate, 'source': 'redis'})
+
+    def _subscribe_redis_producer(self):
+        self.register_with_broker()
         # create a subscriber
         subscriber = RedisSubscriber(host=REDIS_HOST_DOCKER, port=REDIS_PORT, db=REDIS_DB)
         # generate the name of the channel
         channel_name = CHANNELS.get_ticker_channel(self.csv_service.ticker)
-        # define the handler
-        def redis_handler(message):
-            data = message.get('data', {})
-            if data.get('type') == 'price':
-                price = data.get('price', None)
-                if price is not None:
-                    self.action_queue.put({'type': 'price_update', 'data': float(price), 'source': 'redis'})
-            if data.get('type') == 'order':
-                trdUpdate = message.get('data', {}).get('order_data', {})
-                order_json = trdUpdate.get('order', None)
-                order = Order(**order_json)
-                myTradeUpdate = TradeUpdate(order=order, event=trdUpdate.get('event', None), timestamp=dt.fromisoformat(trdUpdate.get('timestamp')))
-                # Check if the message is a trade update
-                self.logger.info(f"Trade update: {myTradeUpdate}")
-                self.logger.info(f"Trade update event: {myTradeUpdate.event}")
-                self.action_queue.put({'type': MessageType.ORDER_UPDATE, 'data': myTradeUpdate, 'source': 'redis'})
         # subscribe to the channel
-        assert subscriber.subscribe(channel_name, redis_handler) == True, f"Failed to subscribe to channel {channel_name}"
+        assert subscriber.subscribe(channel_name, self.on_redis_message) == True, f"Failed to subscribe to channel {channel_name}"
         # start listening for messages
         self.logger.info(f"Subscribed to channel {channel_name}")
         subscriber.start_listening()
@@ -0,0 +1,119 @@
+"""
+Decision trace for the SCALE_T bot.
+
+DecisionMaker writes one record per tick it decides on (price, state, the idle band and cancel
+threshold it checked, the ladder rows it selected, quantity, limit price, outcome, how long it
+took) and one per order result, into a ring buffer of preallocated records that are overwritten
+in place. Nothing is written out until it is asked for: the buffer is dumped to a CSV in
+DECISION_TRACE_DIR when the consumer fails, or for every DecisionMaker of the process on SIGUSR1
+
+    kill -USR1 <pid>
+
+so a bad trade can be looked into without running DEBUG file logging.
+"""
+
+import csv
+import os
+import signal
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ..common.constants import DECISION_TRACE_DIR, DECISION_TRACE_SIZE
+from ..common.logging_config import get_logger
+
+FIELDS = ("time", "event", "price", "state", "idle_low", "idle_high", "cancel_at", "rows", "side", "qty",
+          "limit_price", "outcome", "order_id", "elapsed_us")
+
+
+class TraceRecord:
+    __slots__ = FIELDS + ("_started",)
+
+    def reset(self, event: str, price, state) -> None:
+        self.time = time.time()
+        self.event = event
+        self.price = price
+        self.state = state
+        self.idle_low = self.idle_high = self.cancel_at = None
+        self.rows = self.side = self.qty = self.limit_price = None
+        self.outcome = self.order_id = self.elapsed_us = None
+        self._started = time.perf_counter()
+
+    def as_dict(self) -> Dict:
+        record = {field: getattr(self, field) for field in FIELDS}
+        if record["rows"] is not None:
+            record["rows"] = " ".join(str(index) for index in record["rows"])
+        for field in ("state", "side", "outcome"):
+            record[field] = getattr(record[field], "value", record[field])
+        return record
+
+
+class DecisionTrace:
+    """
+    The last `size` records, oldest overwritten first. Written by the consumer only; dumps
+    from other threads (or a signal handler) may catch the newest record half filled.
+    """
+
+    def __init__(self, ticker: str, size: int = DECISION_TRACE_SIZE):
+        self.ticker = ticker
+        self._records = [TraceRecord() for _ in range(max(size, 1))]
+        self._next = 0
+        self.count = 0  # records written since startup
+
+    def begin(self, event: str, price=None, state=None) -> TraceRecord:
+        """Take the next slot for a record; fill in its fields, then end() it."""
+        record = self._records[self._next]
+        self._next = (self._next + 1) % len(self._records)
+        self.count += 1
+        record.reset(event, price, state)
+        return record
+
+    @staticmethod
+    def end(record: TraceRecord, outcome: Optional[str] = None) -> None:
+        if outcome is not None:
+            record.outcome = outcome
+        record.elapsed_us = round((time.perf_counter() - record._started) * 1e6)
+
+    def add(self, event: str, outcome: str, **fields) -> None:
+        """Record something that needs no timing, such as an order result."""
+        record = self.begin(event)
+        for field, value in fields.items():
+            setattr(record, field, value)
+        self.end(record, outcome)
+
+    def records(self) -> List[Dict]:
+        """The records held, oldest first."""
+        held = min(self.count, len(self._records))
+        start = (self._next - held) % len(self._records)
+        return [self._records[(start + i) % len(self._records)].as_dict() for i in range(held)]
+
+    def dump(self, reason: str, directory: Optional[str] = None) -> str:
+        """Write the records to a CSV named after the ticker, the time and reason. Returns its path."""
+        directory = directory or DECISION_TRACE_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.ticker}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{reason}.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records())
+        return path
+
+
+def dump_traces_on_signal(get_decision_makers: Callable[[], Iterable], signum: Optional[int] = None) -> bool:
+    """
+    Dump the decision trace of every DecisionMaker get_decision_makers() returns when the
+    process gets signum (SIGUSR1 by default). Call it from the main thread. Returns False
+    where the signal doesn't exist (Windows).
+    """
+    logger = get_logger("decision_trace")
+    signum = signum if signum is not None else getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        return False
+
+    def handler(received, frame):
+        for decision_maker in list(get_decision_makers()):
+            decision_maker.dump_trace("signal")
+        logger.info(f"Dumped decision traces on signal {received}")
+
+    signal.signal(signum, handler)
+    return True
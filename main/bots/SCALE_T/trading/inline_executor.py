@@ -0,0 +1,22 @@
+"""
+Executor that runs calls on the caller's thread.
+
+DecisionMaker sends place_order/cancel_order to a thread pool (its order pool) so the consumer
+never waits on Alpaca. Where nothing needs to run in the background, _create_order_executor
+returns an InlineExecutor instead: the backtest runner, so a run is deterministic, and
+AsyncDecisionMaker, which awaits its Alpaca calls as tasks on the event loop.
+"""
+
+from concurrent.futures import Executor, Future
+
+
+class InlineExecutor(Executor):
+    """Runs each submitted call straight away on the caller's thread."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
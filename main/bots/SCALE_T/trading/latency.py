@@ -0,0 +1,103 @@
+"""
+Tick-to-order latency for the SCALE_T bot.
+
+Price messages carry wall-clock stamps (epoch seconds) from each stage they pass:
+
+    trade      exchange time of the trade (Alpaca's Trade.timestamp)
+    received   AlpacaBroker.price_handler got it from the stream
+    published  AlpacaBroker handed it to Redis
+    enqueued   DecisionMaker.on_redis_message put it on the action queue
+    dequeued   the consumer took it off the action queue
+    decided    the DecisionMaker finished with it, or sent an order for it
+    submitted  place_order/replace_order returned for that order
+
+LatencyTracker keeps a histogram per hop between consecutive stages, plus trade->submitted
+end to end, so the slow part (Redis, queueing, ladder checks or REST) shows up on its own.
+Ticks conflated away in the action queue, or deferred while an order is submitting, aren't
+measured. The broker and the bot stamp with their own clocks, so published->enqueued includes
+any skew between the two hosts.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple
+
+STAGES = ("trade", "received", "published", "enqueued", "dequeued", "decided", "submitted")
+HOPS: Tuple[Tuple[str, str], ...] = tuple(zip(STAGES, STAGES[1:])) + (("trade", "submitted"),)
+
+
+def hop_name(start: str, end: str) -> str:
+    return f"{start}->{end}"
+
+
+class LatencyHistogram:
+    """
+    Latency counts in log-spaced buckets, ten per decade from 10us to 100s. Quantiles are
+    reported as the upper bound of their bucket, so they are within ~26% of the true value.
+    """
+
+    BOUNDS = tuple(1e-5 * 10 ** (i / 10) for i in range(71))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)  # the last bucket holds everything over 100s
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        # Stamps from two hosts can be out of order by their clock skew
+        seconds = max(seconds, 0.0)
+        self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile, in seconds; None if empty."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.BOUNDS[bucket], self.max) if bucket < len(self.BOUNDS) else self.max
+        return self.max
+
+    def stats(self) -> Dict[str, float]:
+        """Count, mean, p50/p90/p99 and max, in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else None,
+            'p50_ms': self._ms(self.quantile(0.5)),
+            'p90_ms': self._ms(self.quantile(0.9)),
+            'p99_ms': self._ms(self.quantile(0.99)),
+            'max_ms': round(self.max * 1000, 3),
+        }
+
+    @staticmethod
+    def _ms(seconds: Optional[float]) -> Optional[float]:
+        return None if seconds is None else round(seconds * 1000, 3)
+
+
+class LatencyTracker:
+    """One LatencyHistogram per hop for a ticker; only touched from its consumer."""
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {hop_name(start, end): LatencyHistogram() for start, end in HOPS}
+
+    def record(self, stamps: Dict[str, float]) -> None:
+        """Record every hop whose start and end stages are both in stamps."""
+        for start, end in HOPS:
+            if start in stamps and end in stamps:
+                self.histograms[hop_name(start, end)].record(stamps[end] - stamps[start])
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """LatencyHistogram.stats() for every hop measured so far."""
+        return {name: histogram.stats() for name, histogram in self.histograms.items() if histogram.count}
+
+    def report(self) -> str:
+        """One line per measured hop, for the log."""
+        return "\n".join(
+            f"{name}: n={stats['count']} p50={stats['p50_ms']}ms p90={stats['p90_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms"
+            for name, stats in self.stats().items()
+        )
@@ -0,0 +1,79 @@
+"""
+Pending-order polls shared by the DecisionMakers of one process (multi_engine.py).
+
+Each DecisionMaker polls its pending order from Alpaca on a backoff schedule, in case the order's
+stream update was lost (see DecisionMaker._check_reconcile). Alone, a DecisionMaker polls with
+get_order_by_id. In the multi-ticker engine the polls go through one OrderReconciler instead: it
+gathers the requests of a short window and answers them with one open-orders query for all their
+tickers. Only an order missing from the answer (it closed) still costs a get_order_by_id.
+"""
+
+import threading
+import time
+from typing import Dict, Tuple
+
+from ..common.logging_config import get_logger
+from ..common.notify import send_notification
+
+
+class OrderReconciler:
+    """Batches pending-order polls from several DecisionMakers into one Alpaca call per window."""
+
+    def __init__(self, alpaca_interface, batch_window_sec: float = 0.5):
+        self.logger = get_logger("order_reconciler")
+        self.alpaca_interface = alpaca_interface
+        self.batch_window_sec = batch_window_sec
+        self._requests: Dict[str, Tuple[object, str]] = {}  # order id -> (decision maker, ticker)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="order_reconciler", daemon=True)
+        self._thread.start()
+
+    def request(self, decision_maker, order) -> None:
+        """Poll order for decision_maker; the result is queued on its action queue as a manual order update."""
+        with self._lock:
+            self._requests[str(order.id)] = (decision_maker, decision_maker.csv_service.ticker)
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                return
+            # Let the other tickers' polls that are due about now join this batch
+            self._wake.clear()
+            time.sleep(self.batch_window_sec)
+            self.reconcile_pending()
+
+    def reconcile_pending(self) -> int:
+        """Answer every queued request. Returns how many orders were polled."""
+        with self._lock:
+            requests, self._requests = self._requests, {}
+        if not requests:
+            return 0
+        symbols = sorted({ticker for _, ticker in requests.values()})
+        try:
+            open_orders = {str(order.id): order for order in self.alpaca_interface.get_open_orders(symbols)}
+        except Exception as e:
+            self.logger.error(f"Failed to get open orders for {', '.join(symbols)}: {e}")
+            open_orders = {}
+        self.logger.info(f"Reconciled {len(requests)} pending orders over {len(symbols)} tickers, {len(open_orders)} open")
+        for order_id, (decision_maker, ticker) in requests.items():
+            order = open_orders.get(order_id)
+            try:
+                if order is None:
+                    # No longer open (or the bulk query failed): ask for it directly
+                    order = self.alpaca_interface.get_order_by_id(order_id)
+                decision_maker.queue_manual_order_update(order, source='reconcile')
+            except Exception as e:
+                send_notification("Bot needs help", "Failed to manually trigger order update")
+                self.logger.error(f"Failed to reconcile {ticker} order {order_id}: {e}")
+        return len(requests)
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
@@ -2,6 +2,7 @@ from .constants import CHANNELS, MESSAGE_SCHEMAS, REDIS_HOST_DOCKER, REDIS_PORT,
 from .connection import RedisConnection
 from .publisher import RedisPublisher
 from .subscriber import RedisSubscriber
+from .async_subscriber import AsyncRedisSubscriber
 from .message import (
     MessageValidationError,
     validate_message,
@@ -15,6 +16,7 @@ __all__ = [
     "RedisConnection",
     "RedisPublisher",
     "RedisSubscriber",
+    "AsyncRedisSubscriber",
     "MessageValidationError",
     "validate_message",
     "create_message",
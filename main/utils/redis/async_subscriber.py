@@ -0,0 +1,135 @@
+"""
+Async Redis Subscriber Module
+
+This module provides an asyncio counterpart to RedisSubscriber built on redis.asyncio.
+Messages are read by a coroutine on the caller's event loop and handed to the channel
+callbacks there, so consumers running on the same loop need no thread handoff.
+"""
+
+import json
+import logging
+import os
+
+import redis.asyncio as aioredis
+
+from .message import parse_message, MessageValidationError
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AsyncRedisSubscriber:
+    """
+    asyncio Redis subscriber for receiving messages from channels.
+
+    Callbacks are plain functions called on the event loop with the parsed message,
+    the same contract as RedisSubscriber.
+    """
+    REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
+
+    def __init__(self, host=REDIS_HOST, port=6379, db=0, **kwargs):
+        """
+        Initialize a new async Redis subscriber.
+
+        Args:
+            host (str): Redis server hostname or IP address. Defaults to 'localhost'.
+            port (int): Redis server port. Defaults to 6379.
+            db (int): Redis database number. Defaults to 0.
+            **kwargs: Additional arguments to pass to the Redis client.
+        """
+        self.client = aioredis.Redis(host=host, port=port, db=db, **kwargs)
+        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self.callbacks = {}
+        self.is_running = False
+
+    def _message_handler(self, message):
+        """
+        Parse a raw pubsub message and route it to the channel's callback.
+
+        Args:
+            message (dict): The Redis message object.
+        """
+        if message is None or 'data' not in message:
+            return
+
+        channel = message['channel'].decode('utf-8')
+        data = message['data'].decode('utf-8')
+
+        try:
+            try:
+                message = parse_message(data)
+            except MessageValidationError as e:
+                logger.warning(f"Invalid message format on channel '{channel}': {e}")
+                return
+
+            logger.debug(f"Received message on channel '{channel}'")
+
+            if channel in self.callbacks:
+                self.callbacks[channel](message)
+
+        except json.JSONDecodeError:
+            logger.error(f"Received non-JSON message on channel '{channel}': {data}")
+        except Exception as e:
+            logger.error(f"Error processing message on channel '{channel}': {e}")
+
+    async def subscribe(self, channel, callback):
+        """
+        Subscribe to a Redis channel with a callback function.
+
+        Args:
+            channel (str): The channel to subscribe to.
+            callback (callable): Function to call when a message is received.
+
+        Returns:
+            bool: True if subscription was successful, False otherwise.
+        """
+        try:
+            self.callbacks[channel] = callback
+            await self.pubsub.subscribe(channel)
+            logger.info(f"Subscribed to channel: {channel}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to subscribe to channel {channel}: {e}")
+            return False
+
+    async def listen(self):
+        """
+        Read messages until close() is called, dispatching each to its callback.
+        Run it as a task on the loop that consumes the messages.
+        """
+        if not self.callbacks:
+            logger.error("Cannot start listening - no channels subscribed")
+            return
+        self.is_running = True
+        logger.info("Starting async message listener")
+        try:
+            async for message in self.pubsub.listen():
+                if not self.is_running:
+                    break
+                if message.get('type') == 'message':
+                    self._message_handler(message)
+        finally:
+            self.is_running = False
+
+    async def close(self):
+        """
+        Stop listening and close the pubsub connection and client.
+        """
+        self.is_running = False
+        await self.pubsub.unsubscribe()
+        await self.pubsub.close()
+        await self.client.close()
+        self.callbacks.clear()
+        logger.info("Closed async Redis subscriber")
+
+    async def __aenter__(self):
+        """
+        Support for 'async with' statement.
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Clean up resources when exiting an 'async with' block.
+        """
+        await self.close()
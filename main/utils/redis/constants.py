@@ -13,6 +13,7 @@ class CHANNELS:
     """Name for channel used to register bots with the broker."""
     BROKER_REGISTRATION = "BROKER_REGISTRATION"
     PROFIT_REPORT = "PROFIT_REPORT"
+    TICKER_UPDATES_PATTERN = "TICKER_UPDATES_*"  # every ticker channel, for one psubscribe
 
     @staticmethod
     def get_ticker_channel(ticker: str) -> str:
@@ -21,6 +22,13 @@ class CHANNELS:
             logger.error(f"Invalid ticker provided for channel generation: {ticker}")
             raise ValueError("Ticker must be a non-empty string")
         return f"TICKER_UPDATES_{ticker.upper()}"
+
+    @staticmethod
+    def get_ticker_from_channel(channel: str) -> str:
+        """Inverse of get_ticker_channel."""
+        if not channel.startswith("TICKER_UPDATES_"):
+            raise ValueError(f"Not a ticker channel: {channel}")
+        return channel[len("TICKER_UPDATES_"):]
         
     @staticmethod
     def get_ticker_performance_channel(ticker: str) -> str:
@@ -62,6 +62,9 @@ class RedisSubscriber:
         # Get channel and decode data
         channel = message['channel'].decode('utf-8')
         data = message['data'].decode('utf-8')
+        # Pattern subscriptions are registered under the pattern, not the channel
+        pattern = message.get('pattern')
+        callback_key = pattern.decode('utf-8') if pattern else channel
         
         try:
             # Parse JSON data
@@ -77,9 +80,12 @@ class RedisSubscriber:
             logger.debug(f"Received message on channel '{channel}'")
             
             # Call the registered callback for this channel with the parsed message
-            if channel in self.callbacks:
+            if callback_key in self.callbacks:
+                if pattern:
+                    # One callback serves many channels; tell it which one this came from
+                    message['channel'] = channel
                 # Pass the complete message to the callback
-                self.callbacks[channel](message)
+                self.callbacks[callback_key](message)
             
         except json.JSONDecodeError:
             logger.error(f"Received non-JSON message on channel '{channel}': {data}")
@@ -120,7 +126,8 @@ class RedisSubscriber:
         
         Args:
             pattern (str): The pattern to subscribe to (e.g., "channel.*").
-            callback (callable): Function to call when a message is received.
+            callback (callable): Function to call when a message is received. The parsed
+                                 message also carries the matching channel under 'channel'.
             message_types (list, optional): List of message types to filter for. 
                                            If None, all messages will be processed.
                                            Defaults to None.
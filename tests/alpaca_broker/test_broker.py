@@ -253,6 +253,15 @@ class TestAlpacaBroker(unittest.TestCase):
             expected_channel, expected_payload, sender="alpaca_broker"
         )
 
+    def test_handle_price_update_forwards_latency_stamps(self):
+        """Test stamps from price_handler are published with a publish stamp added."""
+        stamps = {"trade": 1700000000.0, "received": 1700000000.02}
+        self.broker.handle_price_update({"price": "150.50", "symbol": "AAPL", "timestamp": "ts1", "stamps": stamps})
+
+        published_data = self.mock_redis_publisher.publish.call_args[0][1]
+        self.assertEqual(published_data['stamps']['trade'], 1700000000.0)
+        self.assertGreaterEqual(published_data['stamps']['published'], stamps['received'])
+
     def test_handle_order_update_publishes(self):
         """Test handle_order_update publishes correctly formatted message."""
         mock_trade_update = MockTradeUpdate(symbol="MSFT")
@@ -274,6 +283,19 @@ class TestAlpacaBroker(unittest.TestCase):
         self.assertEqual(published_data['order_data']['order']['symbol'], 'MSFT')
         self.assertEqual(kwargs['sender'], 'alpaca_broker')
 
+    def test_handle_order_update_keeps_flat_position(self):
+        """A fill that closes the position publishes position_qty 0, not None."""
+        mock_trade_update = MockTradeUpdate(symbol="MSFT")
+        mock_trade_update.position_qty = 0
+        self.broker.handle_order_update(mock_trade_update)
+        published_data = self.mock_redis_publisher.publish.call_args[0][1]
+        self.assertEqual(published_data['order_data']['position_qty'], "0")
+
+        mock_trade_update.position_qty = None
+        self.broker.handle_order_update(mock_trade_update)
+        published_data = self.mock_redis_publisher.publish.call_args[0][1]
+        self.assertIsNone(published_data['order_data']['position_qty'])
+
 
     @patch('main.alpaca_broker.broker.AlpacaBroker.subscribe_symbol')
     def test_handle_registration_subscribe(self, mock_subscribe):
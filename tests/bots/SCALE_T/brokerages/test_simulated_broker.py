@@ -0,0 +1,154 @@
+"""Unit tests for the SCALE_T simulated brokerage."""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from alpaca.trading.enums import OrderStatus, OrderType, TradeEvent
+
+from main.bots.SCALE_T.backtest import BacktestCSVService, run_backtest
+from main.bots.SCALE_T.brokerages.simulated_broker import SimulatedBroker
+from tests.bots.SCALE_T.test_backtest import ticks, whole_share_rows
+
+START = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def at(seconds):
+    return START + timedelta(seconds=seconds)
+
+
+class TestSimulatedBroker(unittest.TestCase):
+    """Orders fill against fed ticks the way Alpaca would fill them."""
+
+    def _broker(self, **kwargs):
+        broker = SimulatedBroker("AAPL", **kwargs)
+        broker.on_trade(100.0, at(0))
+        return broker
+
+    def test_limits_fill_at_limit_price_on_a_later_tick(self):
+        broker = self._broker()
+        buy = broker.place_order('buy', 99.0, 2)
+        sell = broker.place_order('sell', 101.0, 1)
+        self.assertEqual(buy.id, UUID(int=1))
+        self.assertEqual(buy.order_type, OrderType.LIMIT)
+
+        broker.on_trade(99.5, at(1))
+        self.assertEqual(broker.take_updates(), [])
+        broker.on_trade(98.7, at(2))
+        [update] = broker.take_updates()
+        self.assertEqual((update.event, update.price, update.qty, update.position_qty), (TradeEvent.FILL, 99.0, 2.0, 2.0))
+        self.assertEqual(broker.get_order_by_id(str(buy.id)).status, OrderStatus.FILLED)
+        self.assertEqual(broker.get_order_by_id(sell.id).status, OrderStatus.NEW)
+
+    def test_fractional_orders_go_out_as_market_orders(self):
+        broker = self._broker()
+        self.assertIsNone(broker.place_order('buy', 99.0, 0.5))  # price isn't favorable
+        order = broker.place_order('buy', 100.5, 0.5)
+        self.assertEqual(order.order_type, OrderType.MARKET)
+        broker.on_trade(100.2, at(1))
+        self.assertEqual(broker.fills[0]['price'], 100.2)
+        self.assertEqual(broker.get_shares_count(), 0.5)
+
+    def test_partial_fills_report_cumulative_quantity(self):
+        broker = self._broker(partial_fill_qty=1)
+        order = broker.place_order('buy', 99.0, 3)
+        broker.on_trade(98.0, at(1))
+        broker.on_trade(99.5, at(2))
+        broker.on_trade(99.0, at(3))
+        broker.on_trade(98.5, at(4))
+        updates = broker.take_updates()
+        self.assertEqual([update.event for update in updates], [TradeEvent.PARTIAL_FILL, TradeEvent.PARTIAL_FILL, TradeEvent.FILL])
+        self.assertEqual([float(update.order.filled_qty) for update in updates], [1.0, 2.0, 3.0])
+        self.assertEqual(updates[0].order.status, OrderStatus.PARTIALLY_FILLED)
+        # A partly filled order can't be replaced, only cancelled
+        self.assertIsNone(broker.replace_order(order.id, 98.0, 3))
+
+    def test_latency_delays_orders_and_lets_a_fill_beat_a_cancel(self):
+        broker = self._broker(latency_sec=2)
+        order = broker.place_order('buy', 99.0, 1)
+        broker.on_trade(98.0, at(1))
+        self.assertEqual(broker.take_updates(), [])  # not at the book yet
+
+        self.assertTrue(broker.cancel_order(order.id))
+        broker.on_trade(98.5, at(2))  # the cancel is still on its way
+        broker.on_trade(100.0, at(3))
+        [update] = broker.take_updates()
+        self.assertEqual(update.event, TradeEvent.FILL)
+        self.assertFalse(broker.cancel_order(order.id))
+
+    def test_cancel_lands_after_latency(self):
+        broker = self._broker(latency_sec=1)
+        order = broker.place_order('sell', 101.0, 1)
+        broker.cancel_order(order.id)
+        broker.on_trade(100.5, at(0.5))
+        self.assertEqual(broker.take_updates(), [])
+        broker.on_trade(101.5, at(1))
+        [update] = broker.take_updates()
+        self.assertEqual((update.event, update.order.status), (TradeEvent.CANCELED, OrderStatus.CANCELED))
+        self.assertEqual(broker.fills, [])
+
+    def test_replace_moves_the_order(self):
+        broker = self._broker()
+        order = broker.place_order('buy', 99.0, 2)
+        new_order = broker.replace_order(order.id, 99.5, 2)
+        self.assertEqual(new_order.replaces, order.id)
+        [update] = broker.take_updates()
+        self.assertEqual((update.event, update.order.replaced_by), (TradeEvent.REPLACED, new_order.id))
+        broker.on_trade(99.4, at(1))
+        self.assertEqual(broker.fills[0]['order_id'], str(new_order.id))
+
+    def test_buying_power_reserves_open_buys(self):
+        broker = self._broker(cash=250.0)
+        broker.place_order('buy', 100.0, 2)
+        self.assertEqual(broker.get_buying_power(), 50.0)
+        self.assertIsNone(broker.place_order('buy', 99.0, 1))
+        broker.on_trade(100.0, at(1))
+        self.assertEqual((broker.cash, broker.get_buying_power()), (50.0, 50.0))
+        broker.place_order('sell', 101.0, 2)
+        broker.on_trade(101.0, at(2))
+        self.assertEqual(broker.get_buying_power(), 252.0)
+
+    def test_for_ticker_shares_the_account_orders(self):
+        broker = self._broker()
+        other = broker.for_ticker("MSFT")
+        other.on_trade(300.0, at(0))
+        order = broker.place_order('buy', 99.0, 2)
+        other_order = other.place_order('buy', 299.0, 1)
+        self.assertNotEqual(order.id, other_order.id)
+        self.assertEqual(broker.get_order_by_id(other_order.id).symbol, "MSFT")
+
+        # Each broker only matches its own ticker's trades
+        broker.on_trade(98.0, at(1))
+        self.assertEqual([update.order.id for update in broker.take_updates()], [order.id])
+        self.assertEqual(other.take_updates(), [])
+        self.assertEqual([open_order.id for open_order in other.get_open_orders(["AAPL", "MSFT"])], [other_order.id])
+        self.assertEqual(broker.get_open_orders(["AAPL"]), [])
+
+
+class TestSimulatedBrokerWithDecisionMaker(unittest.TestCase):
+    """The DecisionMaker books partial and delayed fills from the simulated broker."""
+
+    def test_partial_fills_are_booked_once_complete(self):
+        rows = whole_share_rows()
+        for row in rows:
+            row['target_shares'] = 2
+        csv_service = BacktestCSVService("TEST", rows=rows)
+        result = run_backtest(csv_service, ticks(99.5, 98.95, 98.9, 98.9, 99.6, 100.05, 100.1, 100.1),
+                              partial_fill_qty=1)
+        self.assertEqual([(fill['side'], fill['qty']) for fill in result.fills],
+                         [('buy', 1.0), ('buy', 1.0), ('sell', 1.0), ('sell', 1.0)])
+        self.assertEqual(csv_service.get_current_held_shares(), 0.0)
+        self.assertEqual(result.max_share_drift, 0.0)
+
+    def test_latency_is_deterministic(self):
+        prices = (99.5, 98.95, 98.9, 98.5, 99.6, 100.05, 100.1, 100.2, 99.0, 98.9)
+        first = run_backtest(BacktestCSVService("TEST", rows=whole_share_rows()), ticks(*prices), latency_sec=1.5)
+        second = run_backtest(BacktestCSVService("TEST", rows=whole_share_rows()), ticks(*prices), latency_sec=1.5)
+        self.assertGreater(len(first.fills), 0)
+        self.assertEqual(first.fills, second.fills)
+        # With the round trip the buy placed on the 98.95 tick can't fill on the 98.9 tick right after it
+        self.assertEqual(first.fills[0]['timestamp'], ticks(*prices)[3][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Unit tests for the SCALE_T daily log file handler."""
+
+import gzip
+import logging
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from main.bots.SCALE_T.common.custom_logfile_handler import CustomTimedRotatingFileHandler
+
+
+class TestCustomTimedRotatingFileHandler(unittest.TestCase):
+    """The handler switches day files at NYC midnight and gzips the finished day."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.base_dir = tmp_dir.name
+        with patch.object(CustomTimedRotatingFileHandler, 'get_nyc_date', return_value="2024-01-31"):
+            self.handler = CustomTimedRotatingFileHandler(base_dir=self.base_dir)
+        self.addCleanup(self.handler.close)
+
+    def _emit(self, message, created=None):
+        record = logging.LogRecord("SCALE_T", logging.INFO, __file__, 0, message, None, None)
+        if created is not None:
+            record.created = created
+        self.handler.handle(record)
+
+    def test_next_midnight_is_in_new_york(self):
+        next_midnight = self.handler.get_next_nyc_midnight()
+        self.assertGreater(next_midnight, time.time())
+        self.assertLessEqual(next_midnight - time.time(), 25 * 3600)
+        self.assertEqual(self.handler.next_rollover_at, next_midnight)
+
+    def test_records_before_midnight_stay_in_the_day_file(self):
+        self._emit("first")
+        self.assertEqual(self.handler.baseFilename, os.path.join(self.base_dir, "2024", "01", "SCALE_T-2024-01-31.log"))
+        self.assertIsNone(self.handler.compress_thread)
+
+    def test_rollover_switches_file_and_compresses_the_old_one(self):
+        self._emit("january")
+        old_filename = self.handler.baseFilename
+        with patch.object(CustomTimedRotatingFileHandler, 'get_nyc_date', return_value="2024-02-01"):
+            self._emit("february", created=self.handler.next_rollover_at)
+        self.handler.compress_thread.join(5)
+
+        self.assertEqual(self.handler.baseFilename, os.path.join(self.base_dir, "2024", "02", "SCALE_T-2024-02-01.log"))
+        self.assertFalse(os.path.exists(old_filename))
+        with gzip.open(old_filename + ".gz", 'rt') as f:
+            self.assertEqual(f.read(), "january\n")
+        self.handler.flush()
+        with open(self.handler.baseFilename) as f:
+            self.assertEqual(f.read(), "february\n")
+
+    def test_rollover_keeps_only_backup_count_days(self):
+        # Eight finished days before the open one: two more than the default backupCount of 7 once it closes, across a month boundary
+        old_days = [f"2023-12-{day}" for day in range(26, 32)] + ["2024-01-29", "2024-01-30"]
+        for day in old_days:
+            log_dir = os.path.join(self.base_dir, day[:4], day[5:7])
+            os.makedirs(log_dir, exist_ok=True)
+            with gzip.open(os.path.join(log_dir, f"SCALE_T-{day}.log.gz"), 'wt') as f:
+                f.write(day)
+        self._emit("january")
+        with patch.object(CustomTimedRotatingFileHandler, 'get_nyc_date', return_value="2024-02-01"):
+            self._emit("february", created=self.handler.next_rollover_at)
+        self.handler.compress_thread.join(5)
+
+        kept = sorted(name for _, _, names in os.walk(self.base_dir) for name in names)
+        self.assertEqual(kept, ["SCALE_T-2023-12-28.log.gz", "SCALE_T-2023-12-29.log.gz",
+                                "SCALE_T-2023-12-30.log.gz", "SCALE_T-2023-12-31.log.gz", "SCALE_T-2024-01-29.log.gz",
+                                "SCALE_T-2024-01-30.log.gz", "SCALE_T-2024-01-31.log.gz", "SCALE_T-2024-02-01.log"])
+
+
+if __name__ == '__main__':
+    unittest.main()
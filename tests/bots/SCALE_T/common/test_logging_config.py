@@ -0,0 +1,129 @@
+"""Unit tests for the SCALE_T queue logging mode."""
+
+import logging
+import queue
+import unittest
+from unittest.mock import Mock, patch
+
+from main.bots.SCALE_T.common import logging_config
+from main.bots.SCALE_T.common.logging_config import DroppingQueueHandler, SampledLogger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class TestDroppingQueueHandler(unittest.TestCase):
+    """Records are queued unformatted, and dropped and counted when the queue is full."""
+
+    def setUp(self):
+        self.log_queue = queue.Queue(2)
+        self.handler = DroppingQueueHandler(self.log_queue)
+        self.logger = logging.getLogger("test_dropping_queue_handler")
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def test_arguments_are_formatted_by_the_consumer(self):
+        payload = ['order-1', 100.0]
+        self.logger.warning("Order %s", payload)
+        record = self.log_queue.get_nowait()
+        self.assertIs(record.args[0], payload)
+        self.assertEqual(record.getMessage(), "Order ['order-1', 100.0]")
+
+    def test_full_queue_drops_and_reports(self):
+        for i in range(5):
+            self.logger.warning("tick %d", i)
+        self.assertEqual(self.handler.dropped, 3)
+        self.assertEqual([self.log_queue.get_nowait().getMessage() for _ in range(2)], ["tick 0", "tick 1"])
+
+        self.logger.warning("after")
+        messages = [self.log_queue.get_nowait().getMessage() for _ in range(2)]
+        self.assertEqual(messages, ["Log queue full, dropped 3 records", "after"])
+
+    def test_tracebacks_are_rendered_on_the_logging_thread(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("failed")
+        record = self.log_queue.get_nowait()
+        self.assertIsNone(record.exc_info)
+        self.assertIn("ValueError: boom", record.getMessage())
+
+
+class TestQueueLogging(unittest.TestCase):
+    """enable_queue_logging puts the handlers behind a listener; disable flushes and restores them."""
+
+    def test_enable_and_disable(self):
+        target = ListHandler()
+        target.setFormatter(logging_config.formatter)
+        with patch.object(logging_config, 'rotating_handler', target), \
+                patch.object(logging_config, 'console_handler', logging.NullHandler()):
+            logger = logging_config.scale_t_logger
+            original_handlers = list(logger.handlers)
+            logger.handlers = [logging_config.rotating_handler, logging_config.console_handler]
+            try:
+                handler = logging_config.enable_queue_logging(maxsize=100)
+                self.assertIs(logging_config.enable_queue_logging(), handler)
+                self.assertEqual(logger.handlers, [handler])
+                logging_config.get_logger("test").info("queued %s", 1)
+                logging_config.disable_queue_logging()
+                self.assertIn(target, logger.handlers)
+                self.assertTrue(target.lines[-1].endswith("SCALE_T.test - INFO - queued 1"))
+            finally:
+                logging_config.disable_queue_logging()
+                logger.handlers = original_handlers
+
+
+class TestSampledLogger(unittest.TestCase):
+    """Per statement: the first N lines of an interval, then 1 in K, then a count of what was skipped."""
+
+    def setUp(self):
+        self.target = ListHandler()
+        self.logger = logging.getLogger("test_sampled_logger")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.addHandler(self.target)
+        self.addCleanup(self.logger.removeHandler, self.target)
+        self.clock = Mock()
+        self.clock.monotonic.return_value = 1000.0
+        patcher = patch.object(logging_config, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sampled = SampledLogger(self.logger, first=2, every=3, interval_sec=60)
+
+    def test_first_then_one_in_k_per_statement(self):
+        for i in range(8):
+            self.sampled.info("tick %d", i)
+        self.sampled.debug("other")
+        self.assertEqual(self.target.lines, ["tick 0", "tick 1", "tick 4", "tick 7", "other"])
+        self.assertEqual(self.sampled.suppressed(), 4)
+
+    def test_next_interval_reports_suppressed_count(self):
+        for i in range(4):
+            self.sampled.info("tick %d", i)
+        self.clock.monotonic.return_value = 1061.0
+        self.sampled.info("tick %d", 4)
+        self.assertEqual(self.target.lines[-2:], ['Suppressed 2 of 4 "tick %d" lines in the last 61s', "tick 4"])
+        self.assertEqual(self.sampled.suppressed(), 0)
+
+    def test_disabled_level_is_not_counted(self):
+        self.logger.setLevel(logging.INFO)
+        for _ in range(5):
+            self.sampled.debug("quiet")
+        self.assertEqual((self.target.lines, self.sampled.suppressed()), ([], 0))
+
+    def test_record_points_at_the_caller(self):
+        records = []
+        self.target.emit = records.append
+        self.sampled.info("here")
+        self.assertEqual(records[0].funcName, "test_record_points_at_the_caller")
+
+
+if __name__ == '__main__':
+    unittest.main()
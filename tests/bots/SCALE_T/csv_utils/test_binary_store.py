@@ -0,0 +1,98 @@
+"""Unit tests for the binary mmap ladder store in the SCALE_T bot."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from main.bots.SCALE_T.csv_utils.binary_store import FIELD_LAYOUT, HEADER, RECORD
+from main.bots.SCALE_T.csv_utils.csv_service import CSVService
+from main.bots.SCALE_T.csv_utils.csv_tool import CSVWorker
+from main.bots.SCALE_T.common.constants import StorageBackend, TradingType
+from tests.bots.SCALE_T.csv_utils.test_csv_service import write_ladder_csv
+
+
+class TestBinaryLadderStore(unittest.TestCase):
+    """The binary store must round-trip the ladder exactly and update single fields in place."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_filepath = os.path.join(self.tmp_dir.name, "TEST.csv")
+        self.binary_filepath = os.path.join(self.tmp_dir.name, "TEST.ladder")
+        write_ladder_csv(self.csv_filepath, num_lines=20, held_every=4)
+        self.filepath_patch = patch(
+            'main.bots.SCALE_T.csv_utils.csv_core.get_ticker_filepath', return_value=self.csv_filepath
+        )
+        self.filepath_patch.start()
+        self.csv_service = CSVService("TEST", TradingType.PAPER, storage=StorageBackend.BINARY)
+
+    def tearDown(self):
+        self.csv_service.close()
+        self.filepath_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _rows(self, csv_service):
+        return [dict(row) for row in csv_service.csv_data]
+
+    def _reload(self):
+        self.csv_service.close()
+        self.csv_service = CSVService("TEST", TradingType.PAPER, storage=StorageBackend.BINARY)
+        return self._rows(self.csv_service)
+
+    def _read_binary(self):
+        with open(self.binary_filepath, 'rb') as f:
+            return f.read()
+
+    def test_first_load_imports_csv(self):
+        self.assertTrue(os.path.exists(self.binary_filepath))
+        csv_rows = self._rows(CSVService("TEST", TradingType.PAPER, storage=StorageBackend.CSV))
+        self.assertEqual(self._reload(), csv_rows)
+
+    def test_fills_are_written_in_place(self):
+        with open(self.csv_filepath, 'r') as f:
+            csv_before = f.read()
+        self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+        self.csv_service.update_order_status(0, 4.0, 101.0, 'sell')
+        expected = self._rows(self.csv_service)
+        self.assertEqual(self._reload(), expected)
+        with open(self.csv_filepath, 'r') as f:
+            self.assertEqual(f.read(), csv_before)
+
+    def test_single_value_change_touches_only_its_bytes(self):
+        before = self._read_binary()
+        row = self.csv_service.get_row_by_index(5)
+        row["held_shares"] = 1.5
+        self.csv_service.save()
+        after = self._read_binary()
+        changed = [i for i, (old, new) in enumerate(zip(before, after)) if old != new]
+        offset, field = FIELD_LAYOUT["held_shares"]
+        start = HEADER.size + 5 * RECORD.size + offset
+        self.assertTrue(changed)
+        self.assertTrue(all(start <= i < start + field.size for i in changed))
+
+    def test_chase_inserts_survive_reload(self):
+        self.csv_service.update_order_status(0, self.csv_service.get_current_held_shares(), 101.0, 'sell')
+        self.csv_service.chase_price({"current_price": 150.0})
+        self.csv_service.update_order_status(1, 1.0, 99.0, 'buy')
+        expected = self._rows(self.csv_service)
+        self.assertEqual(len(expected), 21)
+        self.assertEqual(self._reload(), expected)
+
+    def test_pending_order_id_too_long(self):
+        with self.assertRaises(ValueError):
+            self.csv_service.csv_data[0]["pending_order_id"] = "x" * 41
+
+    def test_export_and_import_with_csv_tool(self):
+        self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+        expected = self._rows(self.csv_service)
+        self.csv_service.close()
+        worker = CSVWorker("TEST", TradingType.PAPER)
+        worker.export_binary_to_csv()
+        self.assertEqual(self._rows(CSVService("TEST", TradingType.PAPER, storage=StorageBackend.CSV)), expected)
+        os.remove(self.binary_filepath)
+        worker.import_csv_to_binary()
+        self.assertEqual(self._reload(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
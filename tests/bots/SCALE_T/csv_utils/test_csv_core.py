@@ -36,11 +36,12 @@ class TestCsvCore(unittest.TestCase):
     @patch('csv.DictReader')
     @patch('builtins.open')
     def test_load_csv_data_success(self, mock_open, mock_csv_dictreader, mock_validate_csv):
-        my_list = ["test", "list"]
+        my_list = [{"index": "0", "buy_price": "10.5", "pending_order_id": "None"}]
         mock_csv_dictreader.return_value = my_list
-        self.assertTrue(self.test_csv_core1.csv_data == my_list)
         self.test_csv_core1._load_csv_data()
-        self.assertEqual(self.test_csv_core1.csv_data, my_list)
+        # Values are parsed into their column types once, at load
+        self.assertEqual(len(self.test_csv_core1.csv_data), 1)
+        self.assertEqual(dict(self.test_csv_core1.csv_data[0]), {"index": 0, "buy_price": 10.5, "pending_order_id": "None"})
 
     # - FileNotFoundError - only one way to trigger this
     @patch('builtins.open', side_effect=FileNotFoundError("FILE not found"))
@@ -63,7 +64,7 @@ class TestCsvCore(unittest.TestCase):
     @patch('csv.DictReader')
     @patch('builtins.open', new_callable=mock_open, read_data="da")
     def test_load_csv_data_generic_exception2(self, mock_file, mock_csv_dictreader, validate_csv_data):
-        my_list = ["test", "list"]
+        my_list = [{"index": "0", "buy_price": "10.5"}]
         mock_csv_dictreader.return_value = my_list
         exception_msg = "another exception"
         def mr_exception():
@@ -184,40 +185,37 @@ class TestCsvCore(unittest.TestCase):
         self.test_csv_core1.validate_csv_data()  # Should not raise exception
 
     def test_validate_csv_data_invalid_index(self):
-        """Test validation fails with non-integer index."""
+        """Test parsing fails with non-integer index."""
         self.test_csv_core1.required_columns = []
-        self.test_csv_core1.csv_data = [{
-            "index": "not_a_number",
-            "target_shares": "100",
-            "buy_price": "10.5",
-            "sell_price": "11.0"
-        }]
         with self.assertRaises(ValueError):
-            self.test_csv_core1.validate_csv_data()
+            self.test_csv_core1.csv_data = [{
+                "index": "not_a_number",
+                "target_shares": "100",
+                "buy_price": "10.5",
+                "sell_price": "11.0"
+            }]
 
     def test_validate_csv_data_invalid_target_shares(self):
-        """Test validation fails with non-numeric target_shares."""
+        """Test parsing fails with non-numeric target_shares."""
         self.test_csv_core1.required_columns = []
-        self.test_csv_core1.csv_data = [{
-            "index": "1",
-            "target_shares": "invalid",
-            "buy_price": "10.5",
-            "sell_price": "11.0"
-        }]
         with self.assertRaises(ValueError):
-            self.test_csv_core1.validate_csv_data()
+            self.test_csv_core1.csv_data = [{
+                "index": "1",
+                "target_shares": "invalid",
+                "buy_price": "10.5",
+                "sell_price": "11.0"
+            }]
 
     def test_validate_csv_data_invalid_prices(self):
-        """Test validation fails with non-numeric prices."""
+        """Test parsing fails with non-numeric prices."""
         self.test_csv_core1.required_columns = []
-        self.test_csv_core1.csv_data = [{
-            "index": "1",
-            "target_shares": "100",
-            "buy_price": "invalid",
-            "sell_price": "also_invalid"
-        }]
         with self.assertRaises(ValueError):
-            self.test_csv_core1.validate_csv_data()
+            self.test_csv_core1.csv_data = [{
+                "index": "1",
+                "target_shares": "100",
+                "buy_price": "invalid",
+                "sell_price": "also_invalid"
+            }]
 
     def test_validate_csv_data_missing_optional_fields(self):
         """Test validation succeeds with missing optional fields (using default values)."""
@@ -249,30 +247,29 @@ class TestCsvCore(unittest.TestCase):
         self.test_csv_core1.validate_csv_data()  # Should not raise exception
 
     def test_validate_csv_data_invalid_middle_row(self):
-        """Test validation fails when middle row contains invalid data."""
+        """Test parsing fails when middle row contains invalid data."""
         self.test_csv_core1.required_columns = []
-        self.test_csv_core1.csv_data = [
-            {
-                "index": "1",
-                "target_shares": "100",
-                "buy_price": "10.5",
-                "sell_price": "11.0"
-            },
-            {
-                "index": "2",
-                "target_shares": "invalid",  # Invalid value in middle row
-                "buy_price": "20.5",
-                "sell_price": "21.0"
-            },
-            {
-                "index": "3",
-                "target_shares": "300",
-                "buy_price": "30.5",
-                "sell_price": "31.0"
-            }
-        ]
         with self.assertRaises(ValueError):
-            self.test_csv_core1.validate_csv_data()
+            self.test_csv_core1.csv_data = [
+                {
+                    "index": "1",
+                    "target_shares": "100",
+                    "buy_price": "10.5",
+                    "sell_price": "11.0"
+                },
+                {
+                    "index": "2",
+                    "target_shares": "invalid",  # Invalid value in middle row
+                    "buy_price": "20.5",
+                    "sell_price": "21.0"
+                },
+                {
+                    "index": "3",
+                    "target_shares": "300",
+                    "buy_price": "30.5",
+                    "sell_price": "31.0"
+                }
+            ]
     
     # get_column_names
     def test_get_column_names_empty_data(self):
@@ -440,6 +437,36 @@ class TestCsvCore(unittest.TestCase):
         self.assertEqual(same_old_row["buy_price"], 10.52)
         self.assertEqual(same_old_row["sell_price"], round(10.52*1.005,2))
 
+    @patch('main.bots.SCALE_T.csv_utils.csv_core.CSVCore._save_csv_data')
+    def test_chase_price_catch_up(self, mock_internal_save):
+        """A gap chased with catch_up ends in the same ladder as one $0.01 chase per tick, with one save"""
+        lines = [
+            {"index": "0", "target_shares": "100", "buy_price": "10.5", "sell_price": "11.0", "held_shares": "0", "pending_order_id": "None"},
+            {"index": "1", "target_shares": "200", "buy_price": "10.0", "sell_price": "10.5", "held_shares": "0", "pending_order_id": "None"},
+            {"index": "2", "target_shares": "300", "buy_price": "9.5", "sell_price": "10.0", "held_shares": "0", "pending_order_id": "None"}
+        ]
+        stepped = CSVCore(ticker=self.ticker, trading_type=self.trading_type)
+        stepped.csv_data = lines
+        while stepped.is_chasable_lines(11.63):
+            stepped.chase_price({'current_price': 11.63})
+        self.assertGreater(mock_internal_save.call_count, 100)
+        mock_internal_save.reset_mock()
+
+        caught_up = CSVCore(ticker=self.ticker, trading_type=self.trading_type)
+        caught_up.csv_data = lines
+        caught_up.chase_price({'current_price': 11.63}, catch_up=True)
+        mock_internal_save.assert_called_once()
+        self.assertFalse(caught_up.csv_data[0]["buy_price"] + 0.01 < 11.63)
+        self.assertEqual(len(caught_up.csv_data), len(stepped.csv_data))
+        for caught_up_row, stepped_row in zip(caught_up.csv_data, stepped.csv_data):
+            self.assertEqual(caught_up_row["index"], stepped_row["index"])
+            self.assertEqual(caught_up_row["buy_price"], stepped_row["buy_price"])
+            self.assertEqual(caught_up_row["sell_price"], stepped_row["sell_price"])
+            # Float noise from the repeated rebalances can move a $2 clip onto the neighbouring line
+            clip_shares = 2 / stepped_row["buy_price"]
+            self.assertLessEqual(abs(caught_up_row["target_shares"] - stepped_row["target_shares"]), clip_shares + 1e-9)
+        self.assertAlmostEqual(caught_up.get_total_cash_value(), stepped.get_total_cash_value(), places=6)
+
     # get_total_cash_value
     def test_get_total_cash_value(self):
         """Test that the total cash value is returned correctly."""
@@ -905,3 +905,167 @@
 # # Add main execution block if it's not already there
 # if __name__ == '__main__':
 #     unittest.main()
+
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from main.bots.SCALE_T.csv_utils.csv_service import CSVService
+from main.bots.SCALE_T.common.constants import TradingType
+
+CSV_HEADER = "index,buy_price,sell_price,target_shares,held_shares,pending_order_id,spc,unrealized_profit,last_action,profit"
+
+
+def write_ladder_csv(filepath, num_lines, held_every=0, start_sell_price=100.0):
+    """Write a descending ladder to filepath. Every held_every-th line is fully held."""
+    lines = [CSV_HEADER]
+    sell_price = start_sell_price
+    for i in range(num_lines):
+        buy_price = round(sell_price * 0.995, 2)
+        held = 2 if held_every and i % held_every == 0 else 0
+        lines.append(f"{i},{buy_price},{sell_price},2,{held},None,N,0.0,,0.0")
+        sell_price = buy_price
+    with open(filepath, 'w', newline='') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+class TestCSVServicePriceIndex(unittest.TestCase):
+    """The price index, row index and aggregates must give the same answers as a full scan."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_filepath = os.path.join(self.tmp_dir.name, "TEST.csv")
+        write_ladder_csv(self.csv_filepath, num_lines=50, held_every=3)
+        self.filepath_patch = patch(
+            'main.bots.SCALE_T.csv_utils.csv_core.get_ticker_filepath', return_value=self.csv_filepath
+        )
+        self.filepath_patch.start()
+        self.csv_service = CSVService("TEST", TradingType.PAPER)
+
+    def tearDown(self):
+        self.filepath_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _scan_rows_for_buy(self, current_price):
+        return [
+            row for row in self.csv_service.csv_data
+            if float(row["buy_price"]) >= current_price and float(row["held_shares"]) < float(row["target_shares"])
+        ]
+
+    def _scan_rows_for_sell(self, current_price):
+        return [
+            row for row in self.csv_service.csv_data
+            if float(row["sell_price"]) <= current_price and float(row["held_shares"]) > 0
+        ]
+
+    def _assert_matches_scan(self):
+        prices = [float(row["buy_price"]) for row in self.csv_service.csv_data]
+        prices += [float(row["sell_price"]) for row in self.csv_service.csv_data]
+        prices += [50.0, 77.77, 99.995, 150.0]
+        for price in prices:
+            self.assertEqual(self.csv_service.get_rows_for_buy(price), self._scan_rows_for_buy(price))
+            self.assertEqual(self.csv_service.get_rows_for_sell(price), self._scan_rows_for_sell(price))
+
+    def test_index_matches_scan_after_load(self):
+        self._assert_matches_scan()
+
+    def test_index_follows_fills(self):
+        self.csv_service.update_order_status(10, 3.0, 90.0, 'buy')
+        self._assert_matches_scan()
+        self.csv_service.update_order_status(0, 4.0, 101.0, 'sell')
+        self._assert_matches_scan()
+
+    def test_index_follows_chase_insert(self):
+        # Empty the ladder so the top line can be chased
+        self.csv_service.update_order_status(0, self.csv_service.get_current_held_shares(), 101.0, 'sell')
+        self.csv_service.chase_price({"current_price": 150.0})
+        self.assertEqual(float(self.csv_service.get_rows_for_buy(99.51)[0]["buy_price"]), 99.51)
+        self._assert_matches_scan()
+
+    def _scan_row_by_index(self, index):
+        for row in self.csv_service.csv_data:
+            if str(row.get('index')) == str(index):
+                return row
+        return None
+
+    def _assert_row_lookup_matches_scan(self):
+        for index in range(-1, len(self.csv_service.csv_data) + 2):
+            self.assertEqual(self.csv_service.get_row_by_index(index), self._scan_row_by_index(index))
+
+    def test_row_lookup_matches_scan_after_load(self):
+        self._assert_row_lookup_matches_scan()
+        self.assertEqual(self.csv_service.get_row_by_index("3")["index"], 3)
+
+    def test_row_lookup_follows_chase_renumber(self):
+        self.csv_service.update_order_status(0, self.csv_service.get_current_held_shares(), 101.0, 'sell')
+        old_top = self.csv_service.get_row_by_index(0)
+        self.csv_service.chase_price({"current_price": 150.0})
+        self.assertEqual(self.csv_service.get_row_by_index(0)["buy_price"], 99.51)
+        self.assertEqual(self.csv_service.get_row_by_index(1).slot, old_top.slot)
+        self._assert_row_lookup_matches_scan()
+
+    def test_row_lookup_follows_index_edit(self):
+        last = len(self.csv_service.csv_data) - 1
+        self.csv_service.csv_data[last]["index"] = last + 10
+        self.assertIsNone(self.csv_service.get_row_by_index(last))
+        self.assertEqual(self.csv_service.get_row_by_index(last + 10).slot, self.csv_service.csv_data[last].slot)
+
+
+    def _assert_aggregates_match_scan(self):
+        csv_data = self.csv_service.csv_data
+        self.assertEqual(self.csv_service.get_current_held_shares(), round(sum(row["held_shares"] for row in csv_data), 5))
+        self.assertAlmostEqual(
+            self.csv_service.get_total_cash_value(), sum(row["target_shares"] * row["buy_price"] for row in csv_data)
+        )
+        pending = [(i, row["pending_order_id"]) for i, row in enumerate(csv_data) if row["pending_order_id"] != "None"]
+        expected_info = {"order_id": pending[0][1], "index": pending[0][0]} if pending else None
+        self.assertEqual(self.csv_service.get_pending_order_info(), expected_info)
+
+    def test_aggregates_follow_fills_orders_and_chase(self):
+        self._assert_aggregates_match_scan()
+        self.csv_service.csv_data[7]["pending_order_id"] = "order-7"
+        self._assert_aggregates_match_scan()
+        self.assertFalse(self.csv_service.is_chasable_lines(150.0))
+        self.csv_service.update_order_status(7, 3.0, 90.0, 'buy')
+        self.assertIsNone(self.csv_service.get_pending_order_info())
+        self._assert_aggregates_match_scan()
+        self.csv_service.update_order_status(0, self.csv_service.get_current_held_shares(), 101.0, 'sell')
+        self._assert_aggregates_match_scan()
+        self.assertTrue(self.csv_service.is_chasable_lines(150.0))
+        self.csv_service.chase_price({"current_price": 150.0})
+        self.csv_service.csv_data[3]["pending_order_id"] = "order-3"
+        self._assert_aggregates_match_scan()
+
+
+    def _assert_idle_band_matches_scan(self):
+        idle_low, idle_high = self.csv_service.get_idle_band()
+        prices = [row["buy_price"] for row in self.csv_service.csv_data]
+        prices += [row["sell_price"] for row in self.csv_service.csv_data]
+        prices += [price + delta for price in list(prices) for delta in (-0.001, 0.001)]
+        prices += [50.0, 150.0]
+        for price in prices:
+            actionable = bool(
+                self._scan_rows_for_buy(price) or self._scan_rows_for_sell(price)
+                or self.csv_service.is_chasable_lines(price)
+            )
+            self.assertEqual(not (idle_low < price < idle_high), actionable, f"price {price}")
+
+    def test_idle_band_follows_ladder(self):
+        self._assert_idle_band_matches_scan()
+        self.csv_service.update_order_status(10, 3.0, 90.0, 'buy')
+        self._assert_idle_band_matches_scan()
+        # Empty ladder top: only the chase bound is left above the price
+        self.csv_service.update_order_status(0, self.csv_service.get_current_held_shares(), 101.0, 'sell')
+        self._assert_idle_band_matches_scan()
+        self.assertEqual(self.csv_service.get_trigger_thresholds()[2], self.csv_service.csv_data[0]["buy_price"])
+        self.csv_service.csv_data[0]["pending_order_id"] = "order-0"
+        self._assert_idle_band_matches_scan()
+        self.csv_service.csv_data[0]["pending_order_id"] = "None"
+        self.csv_service.chase_price({"current_price": 150.0})
+        self._assert_idle_band_matches_scan()
+
+
+if __name__ == '__main__':
+    unittest.main()
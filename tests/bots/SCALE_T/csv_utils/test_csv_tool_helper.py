@@ -1,5 +1,8 @@
 import unittest
-from main.bots.SCALE_T.csv_utils.csv_tool_helper import find_least_decimal_digit_for_shares, clip_decimal_place_shares
+from main.bots.SCALE_T.csv_utils.csv_tool_helper import (
+    build_price_ladder, carry_cash_over_lines, clip_decimal_place_shares, find_least_decimal_digit_for_shares,
+    spread_cash_over_lines
+)
 
 
 # import debugpy
@@ -43,7 +46,43 @@ class TestCSVService(unittest.TestCase):
         """
         self.assertAlmostEqual(clip_decimal_place_shares(100, .516), .016)
         self.assertAlmostEqual(clip_decimal_place_shares(1000, .516), 0)
-        
+
+    def test_build_price_ladder_matches_line_by_line(self):
+        """Each buy price is the sell price less percentage_diff, rounded, and becomes the next sell price."""
+        for starting_buy_price, percentage_diff in [(100, 0.005), (37.41, 0.0123), (812.07, 0.05)]:
+            buy_prices, sell_prices = build_price_ladder(starting_buy_price, percentage_diff, 300)
+            current_sell_price = round(starting_buy_price * (1 + (percentage_diff)), 2)
+            for buy_price, sell_price in zip(buy_prices, sell_prices):
+                self.assertEqual(sell_price, current_sell_price)
+                self.assertEqual(buy_price, round(current_sell_price * (1 - percentage_diff), 2))
+                current_sell_price = buy_price
+
+    def test_spread_cash_over_lines_matches_line_by_line(self):
+        """Same floats as clipping one line at a time and spreading the remainder over the lines left."""
+        buy_prices, _ = build_price_ladder(23.17, 0.01, 250)
+        target_shares, leftover = spread_cash_over_lines(buy_prices, 57.3)
+        extra_dollars = 0
+        for i, buy_price in enumerate(buy_prices):
+            extra_for_this_line = extra_dollars / (len(buy_prices) - i)
+            extra_dollars -= extra_for_this_line
+            intended_shares = (57.3 + extra_for_this_line) / buy_price
+            extra_shares = clip_decimal_place_shares(buy_price, intended_shares)
+            self.assertEqual(target_shares[i], intended_shares - extra_shares)
+            extra_dollars += extra_shares * buy_price
+        self.assertEqual(leftover, extra_dollars)
+
+    def test_carry_cash_over_lines_matches_line_by_line(self):
+        """Same floats as clipping one line at a time and carrying the remainder to the next line."""
+        buy_prices, _ = build_price_ladder(412.5, 0.005, 250)
+        target_shares, leftover = carry_cash_over_lines(buy_prices, 101.9)
+        extra_dollars = 0
+        for i, buy_price in enumerate(buy_prices):
+            intended_shares = (101.9 + extra_dollars) / buy_price
+            extra_shares = clip_decimal_place_shares(buy_price, intended_shares)
+            self.assertEqual(target_shares[i], intended_shares - extra_shares)
+            extra_dollars = extra_shares * buy_price
+        self.assertEqual(leftover, extra_dollars)
+
 
 
 if __name__ == '__main__':
@@ -0,0 +1,133 @@
+"""Unit tests for the append-only ladder journal in the SCALE_T bot."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from main.bots.SCALE_T.csv_utils.csv_service import CSVService
+from main.bots.SCALE_T.common.constants import StorageBackend, TradingType
+from tests.bots.SCALE_T.csv_utils.test_csv_service import write_ladder_csv
+
+
+class TestLadderJournal(unittest.TestCase):
+    """Saves go to the journal, and a reload (snapshot + journal) must give back the exact ladder."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_filepath = os.path.join(self.tmp_dir.name, "TEST.csv")
+        write_ladder_csv(self.csv_filepath, num_lines=20, held_every=4)
+        self.filepath_patch = patch(
+            'main.bots.SCALE_T.csv_utils.csv_core.get_ticker_filepath', return_value=self.csv_filepath
+        )
+        self.filepath_patch.start()
+        self.csv_service = CSVService("TEST", TradingType.PAPER, storage=StorageBackend.JOURNAL)
+
+    def tearDown(self):
+        self.csv_service._storage.close()
+        self.filepath_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _reload(self):
+        self.csv_service._storage.close()
+        return CSVService("TEST", TradingType.PAPER, storage=StorageBackend.JOURNAL)
+
+    def _rows(self, csv_service):
+        return [dict(row) for row in csv_service.csv_data]
+
+    def _read_csv(self):
+        with open(self.csv_filepath, 'r') as f:
+            return f.read()
+
+    def _trade(self):
+        self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+        self.csv_service.update_order_status(0, 4.0, 101.0, 'sell')
+
+    def test_save_appends_to_journal_not_csv(self):
+        snapshot = self._read_csv()
+        self._trade()
+        self.assertEqual(self._read_csv(), snapshot)
+        with open(self.csv_service._storage.journal_path, 'r') as f:
+            # rebase line plus one line per save
+            self.assertEqual(len(f.readlines()), 3)
+
+    def test_reload_replays_journal(self):
+        self._trade()
+        expected = self._rows(self.csv_service)
+        reloaded = self._reload()
+        self.assertEqual(self._rows(reloaded), expected)
+        # Recovery compacts, so the journal starts over
+        self.assertFalse(os.path.exists(reloaded._storage.journal_path))
+        reloaded._storage.close()
+
+    def test_reload_replays_chase_insert(self):
+        self.csv_service.update_order_status(0, self.csv_service.get_current_held_shares(), 101.0, 'sell')
+        self.csv_service.chase_price({"current_price": 150.0})
+        self.csv_service.chase_price({"current_price": 150.0})
+        self.csv_service.update_order_status(1, 1.0, 99.0, 'buy')
+        expected = self._rows(self.csv_service)
+        reloaded = self._reload()
+        self.assertEqual(self._rows(reloaded), expected)
+        self.assertEqual(reloaded.get_row_by_index(0)["buy_price"], expected[0]["buy_price"])
+        reloaded._storage.close()
+
+    def test_compaction_rewrites_snapshot(self):
+        self.csv_service._storage.compact_every = 2
+        self._trade()
+        self.csv_service._storage.close()  # wait for the background compaction
+        self.assertFalse(os.path.exists(self.csv_service._storage.compacting_path))
+        self.assertFalse(os.path.exists(self.csv_service._storage.snapshot_tmp_path))
+        # The CSV alone now holds the traded ladder
+        self.assertEqual(self._rows(CSVService("TEST", TradingType.PAPER, storage=StorageBackend.CSV)), self._rows(self.csv_service))
+        # Changes after the compaction go to a fresh journal with row ids from the new snapshot
+        self.csv_service.chase_price({"current_price": 150.0})
+        self.csv_service.update_order_status(1, 1.0, 99.0, 'buy')
+        expected = self._rows(self.csv_service)
+        self.assertEqual(self._rows(self._reload()), expected)
+
+    def test_recover_from_crash_before_snapshot_replace(self):
+        self._trade()
+        stale_snapshot = self._read_csv()
+        expected_before_compaction = self._rows(self.csv_service)
+        journal = self.csv_service._storage
+        # Rotate but "crash" before the snapshot write
+        with patch.object(journal, '_write_snapshot'):
+            journal.compact(self.csv_service.csv_data, background=False)
+        self.assertTrue(os.path.exists(journal.compacting_path))
+        self.assertTrue(os.path.exists(journal.snapshot_tmp_path))
+        self.csv_service.update_order_status(5, 1.0, 99.0, 'buy')
+        expected = self._rows(self.csv_service)
+        self.assertNotEqual(expected, expected_before_compaction)
+        self.assertEqual(self._read_csv(), stale_snapshot)
+        self.assertEqual(self._rows(self._reload()), expected)
+
+    def test_recover_from_crash_after_snapshot_replace(self):
+        self._trade()
+        journal = self.csv_service._storage
+        # The snapshot is replaced but .compacting is left behind
+        with patch('main.bots.SCALE_T.csv_utils.journal.os.remove'):
+            journal.compact(self.csv_service.csv_data, background=False)
+        self.assertTrue(os.path.exists(journal.compacting_path))
+        self.csv_service.update_order_status(5, 1.0, 99.0, 'buy')
+        expected = self._rows(self.csv_service)
+        self.assertEqual(self._rows(self._reload()), expected)
+
+    def test_torn_last_line_is_ignored(self):
+        self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+        expected = self._rows(self.csv_service)
+        self.csv_service._storage.close()
+        with open(self.csv_service._storage.journal_path, 'a') as f:
+            f.write('{"seq": 99, "ts": 1.0, "ops": [["set", 0, "held')
+        self.assertEqual(self._rows(self._reload()), expected)
+
+    def test_replacing_csv_data_writes_full_snapshot(self):
+        self._trade()
+        rows = self._rows(self.csv_service)[:5]
+        self.csv_service.csv_data = rows
+        self.csv_service.save()
+        self.assertEqual(self._read_csv().count("\n"), 6)
+        self.assertEqual(self._rows(self._reload()), rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
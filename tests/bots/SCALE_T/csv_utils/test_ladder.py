@@ -0,0 +1,78 @@
+"""Unit tests for the typed ladder storage in the SCALE_T bot."""
+
+import unittest
+from array import array
+
+from main.bots.SCALE_T.csv_utils.ladder import Ladder, LadderRow
+
+
+class TestLadder(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {"index": "0", "buy_price": "10.5", "sell_price": "11.0", "held_shares": "1", "pending_order_id": "None"},
+            {"index": "1", "buy_price": "10.0", "sell_price": "10.5", "held_shares": "0", "pending_order_id": "abc"},
+        ]
+        self.changes = []
+        self.inserts = []
+        self.ladder = Ladder.from_rows(
+            self.rows,
+            on_change=lambda *args: self.changes.append(args),
+            on_insert=self.inserts.append,
+        )
+
+    def test_values_are_parsed_once_into_typed_columns(self):
+        self.assertEqual(self.ladder.fieldnames, ["index", "buy_price", "sell_price", "held_shares", "pending_order_id"])
+        self.assertIsInstance(self.ladder.column("buy_price"), array)
+        self.assertIsInstance(self.ladder.column("index"), array)
+        row = self.ladder[0]
+        self.assertIsInstance(row, LadderRow)
+        self.assertEqual(row["index"], 0)
+        self.assertEqual(row["buy_price"], 10.5)
+        self.assertEqual(row["pending_order_id"], "None")
+        self.assertEqual(self.ladder[-1]["pending_order_id"], "abc")
+
+    def test_writes_are_coerced_and_reported(self):
+        row = self.ladder[1]
+        row["held_shares"] = "2.5"
+        row["pending_order_id"] = None
+        self.assertEqual(row["held_shares"], 2.5)
+        self.assertEqual(row["pending_order_id"], "None")
+        self.assertEqual(self.changes, [
+            (row.slot, "held_shares", 0.0, 2.5),
+            (row.slot, "pending_order_id", "abc", "None"),
+        ])
+        # Writing the same value again is not a change
+        row["held_shares"] = 2.5
+        self.assertEqual(len(self.changes), 2)
+
+    def test_row_views_survive_insert_at_top(self):
+        old_top = self.ladder[0]
+        new_top = self.ladder.insert(0, {"index": 0, "buy_price": 10.51, "sell_price": 11.06, "spc": "N"})
+        self.assertEqual(len(self.ladder), 3)
+        self.assertEqual(self.inserts, [new_top.slot])
+        self.assertEqual(self.ladder[0]["buy_price"], 10.51)
+        self.assertEqual(self.ladder[1]["buy_price"], old_top["buy_price"])
+        self.assertEqual(old_top["buy_price"], 10.5)
+        # New keys become columns, existing rows get the column default
+        self.assertIn("spc", self.ladder.fieldnames)
+        self.assertEqual(old_top["spc"], "")
+
+    def test_bad_values_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            Ladder.from_rows([{"index": "zero"}])
+        with self.assertRaises(ValueError):
+            self.ladder[0]["buy_price"] = "ten"
+        self.assertEqual(self.ladder[0]["buy_price"], 10.5)
+
+    def test_rows_behave_like_dicts(self):
+        self.assertEqual(dict(self.ladder[0]), {
+            "index": 0, "buy_price": 10.5, "sell_price": 11.0, "held_shares": 1.0, "pending_order_id": "None"
+        })
+        self.assertEqual(self.ladder[0].get("missing", "default"), "default")
+        self.assertEqual([row["index"] for row in self.ladder], [0, 1])
+        self.assertEqual([row["index"] for row in self.ladder[:1]], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
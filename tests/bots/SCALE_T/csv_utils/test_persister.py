@@ -0,0 +1,86 @@
+"""Unit tests for the write-behind ladder persister in the SCALE_T bot."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from main.bots.SCALE_T.csv_utils import persister
+from main.bots.SCALE_T.csv_utils.csv_service import CSVService
+from main.bots.SCALE_T.common.constants import StorageBackend, TradingType
+from tests.bots.SCALE_T.csv_utils.test_csv_service import write_ladder_csv
+
+
+class TestLadderPersister(unittest.TestCase):
+    """Saves are written in the background, coalesced, and never leave a partial CSV behind."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_filepath = os.path.join(self.tmp_dir.name, "TEST.csv")
+        write_ladder_csv(self.csv_filepath, num_lines=20, held_every=4)
+        self.filepath_patch = patch(
+            'main.bots.SCALE_T.csv_utils.csv_core.get_ticker_filepath', return_value=self.csv_filepath
+        )
+        self.filepath_patch.start()
+        self.csv_service = CSVService("TEST", TradingType.PAPER, storage=StorageBackend.CSV_WRITE_BEHIND)
+
+    def tearDown(self):
+        self.csv_service.close()
+        self.filepath_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _rows(self, csv_service):
+        return [dict(row) for row in csv_service.csv_data]
+
+    def _load_from_disk(self):
+        return self._rows(CSVService("TEST", TradingType.PAPER, storage=StorageBackend.CSV))
+
+    def test_flush_makes_saves_durable(self):
+        self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+        self.assertTrue(self.csv_service.flush(timeout=5))
+        self.assertEqual(self._load_from_disk(), self._rows(self.csv_service))
+        self.assertFalse(os.path.exists(f"{self.csv_filepath}.tmp"))
+
+    def test_saves_are_coalesced(self):
+        release = threading.Event()
+        original_write = persister.write_csv_atomically
+
+        def slow_write(*args, **kwargs):
+            release.wait(5)
+            original_write(*args, **kwargs)
+
+        with patch('main.bots.SCALE_T.csv_utils.persister.write_csv_atomically', side_effect=slow_write):
+            for i in range(10):
+                self.csv_service.csv_data[i]["held_shares"] = 1
+                self.csv_service.save()
+            release.set()
+            self.assertTrue(self.csv_service.flush(timeout=5))
+        ladder_persister = self.csv_service._storage
+        self.assertEqual(ladder_persister.saves, 10)
+        self.assertLessEqual(ladder_persister.writes, 2)
+        self.assertEqual(self._load_from_disk(), self._rows(self.csv_service))
+
+    def test_failed_write_keeps_previous_csv(self):
+        with open(self.csv_filepath, 'r') as f:
+            before = f.read()
+        with patch('main.bots.SCALE_T.csv_utils.persister.os.replace', side_effect=OSError("disk full")):
+            self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+            self.assertFalse(self.csv_service.flush(timeout=5))
+            self.assertFalse(self.csv_service.flush(timeout=5))  # retried, failed again
+        with open(self.csv_filepath, 'r') as f:
+            self.assertEqual(f.read(), before)
+        self.assertIsInstance(self.csv_service._storage.last_error, OSError)
+
+        # The next flush writes the failed save again
+        self.assertTrue(self.csv_service.flush(timeout=5))
+        self.assertEqual(self._load_from_disk(), self._rows(self.csv_service))
+        self.assertIsNone(self.csv_service._storage.last_error)
+
+    def test_flush_with_plain_csv_is_a_no_op(self):
+        csv_service = CSVService("TEST", TradingType.PAPER, storage=StorageBackend.CSV)
+        self.assertTrue(csv_service.flush())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Unit tests for the SQLite ladder store in the SCALE_T bot."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from main.bots.SCALE_T.csv_utils.csv_service import CSVService
+from main.bots.SCALE_T.csv_utils.csv_tool import CSVWorker
+from main.bots.SCALE_T.csv_utils.sqlite_store import read_ladder_rows
+from main.bots.SCALE_T.common.constants import StorageBackend, TradingType
+from tests.bots.SCALE_T.csv_utils.test_csv_service import write_ladder_csv
+
+
+class TestSQLiteLadderStore(unittest.TestCase):
+    """Saves are transactional, survive a reload, and can be read by another connection."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_filepath = os.path.join(self.tmp_dir.name, "TEST.csv")
+        self.db_path = os.path.join(self.tmp_dir.name, "ladders.sqlite3")
+        write_ladder_csv(self.csv_filepath, num_lines=20, held_every=4)
+        self.filepath_patch = patch(
+            'main.bots.SCALE_T.csv_utils.csv_core.get_ticker_filepath', return_value=self.csv_filepath
+        )
+        self.filepath_patch.start()
+        self.csv_service = CSVService("TEST", TradingType.PAPER, storage=StorageBackend.SQLITE)
+
+    def tearDown(self):
+        self.csv_service.close()
+        self.filepath_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _rows(self, csv_service):
+        return [dict(row) for row in csv_service.csv_data]
+
+    def _reload(self):
+        self.csv_service.close()
+        self.csv_service = CSVService("TEST", TradingType.PAPER, storage=StorageBackend.SQLITE)
+        return self._rows(self.csv_service)
+
+    def test_first_load_imports_csv(self):
+        self.assertTrue(os.path.exists(self.db_path))
+        csv_rows = self._rows(CSVService("TEST", TradingType.PAPER, storage=StorageBackend.CSV))
+        self.assertEqual(self._reload(), csv_rows)
+
+    def test_fills_survive_reload_without_touching_csv(self):
+        with open(self.csv_filepath, 'r') as f:
+            csv_before = f.read()
+        self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+        self.csv_service.update_order_status(0, 4.0, 101.0, 'sell')
+        expected = self._rows(self.csv_service)
+        self.assertEqual(self._reload(), expected)
+        with open(self.csv_filepath, 'r') as f:
+            self.assertEqual(f.read(), csv_before)
+
+    def test_chase_price_reindex_survives_reload(self):
+        self.csv_service.chase_price({"current_price": 150.0})
+        expected = self._rows(self.csv_service)
+        self.assertEqual(len(expected), 21)
+        self.assertEqual(self._reload(), expected)
+
+    def test_failed_save_rolls_back_and_retries(self):
+        before = read_ladder_rows(self.csv_filepath)
+        self.csv_service.csv_data[3]["held_shares"] = 7.0
+        self.csv_service.csv_data[4]["pending_order_id"] = "order-4"
+        store = self.csv_service._storage
+        real_connection = store._connection()
+
+        class FailingUpdates:
+            """Let the transaction start, then fail the first UPDATE batch."""
+
+            def execute(self, sql, *args):
+                return real_connection.execute(sql, *args)
+
+            def executemany(self, sql, params):
+                raise sqlite3.OperationalError("disk I/O error")
+
+        with patch.object(store, "_connection", return_value=FailingUpdates()):
+            self.csv_service.save()
+        self.assertEqual(read_ladder_rows(self.csv_filepath), before)
+        self.csv_service.save()
+        self.assertEqual(read_ladder_rows(self.csv_filepath), self._rows(self.csv_service))
+
+    def test_reader_sees_committed_ladder_while_bot_holds_connection(self):
+        self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+        self.assertEqual(read_ladder_rows(self.csv_filepath), self._rows(self.csv_service))
+        # Unsaved changes stay invisible to readers
+        self.csv_service.csv_data[5]["held_shares"] = 9.0
+        self.assertNotEqual(read_ladder_rows(self.csv_filepath)[5]["held_shares"], 9.0)
+
+    def test_csv_tool_export_and_import(self):
+        self.csv_service.update_order_status(12, 3.0, 98.0, 'buy')
+        expected = self._rows(self.csv_service)
+        self.csv_service.close()
+        worker = CSVWorker("TEST", TradingType.PAPER)
+        worker.export_sqlite_to_csv()
+        self.assertEqual(self._rows(CSVService("TEST", TradingType.PAPER, storage=StorageBackend.CSV)), expected)
+        os.remove(self.db_path)
+        worker.import_csv_to_sqlite()
+        self.assertEqual(read_ladder_rows(self.csv_filepath), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -157,7 +157,7 @@ class TestScaleTIntegrationMocked(unittest.TestCase):
         self.logger.info("Starting test 2")
         self.list_of_tests_done.append(2)
         row = TestScaleTIntegrationMocked.csv_service.get_row_by_index(0)
-        self.assertEqual(row['unrealized_profit'], '0.0')
+        self.assertEqual(row['unrealized_profit'], 0.0)
 
         # Mock the order ID for the placed order, and its status
         mock_placed_order = Mock()
@@ -506,8 +506,8 @@ class TestScaleTIntegrationMocked(unittest.TestCase):
         self.assertEqual(self.csv_service.get_current_held_shares(), 1)
         # Lets check the buy and sell price of index 0
         row = self.csv_service.get_row_by_index(0)
-        self.assertEqual(row['buy_price'], '99.5')
-        self.assertEqual(row['sell_price'], '100.0')
+        self.assertEqual(row['buy_price'], 99.5)
+        self.assertEqual(row['sell_price'], 100.0)
         self.assertEqual(row['held_shares'], 1)
         self.assertEqual(row['profit'], 0.5)
         self.assertEqual(row['unrealized_profit'], 0.26)
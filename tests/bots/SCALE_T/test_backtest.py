@@ -0,0 +1,87 @@
+"""Unit tests for the SCALE_T backtest runner."""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from main.bots.SCALE_T.backtest import BacktestCSVService, read_ticks, run_backtest, synthetic_ticks, write_result
+from main.bots.SCALE_T.brokerages.simulated_broker import SimulatedBroker
+from main.bots.SCALE_T.csv_utils.csv_tool_helper import build_ladder_rows
+from tests.bots.SCALE_T.csv_utils.test_csv_service import write_ladder_csv
+
+
+def whole_share_rows():
+    # Three one-share lines a dollar apart: buy at 99/98/97, sell at 100/99/98
+    return [
+        {"index": i, "buy_price": 99.0 - i, "sell_price": 100.0 - i, "target_shares": 1, "held_shares": 0,
+         "pending_order_id": "None", "spc": "N", "unrealized_profit": 0, "last_action": 0, "profit": 0}
+        for i in range(3)
+    ]
+
+
+def ticks(*prices):
+    return [(datetime.fromtimestamp(1_700_000_000 + i, timezone.utc), price) for i, price in enumerate(prices)]
+
+
+class TestBacktest(unittest.TestCase):
+    """Ticks drive the DecisionMaker against the simulated broker, and the ladder stays in memory."""
+
+    def test_round_trip_is_filled_and_booked(self):
+        csv_service = BacktestCSVService("TEST", rows=whole_share_rows())
+        # The first tick is the price DecisionMaker starts from and doesn't act on
+        result = run_backtest(csv_service, ticks(99.5, 98.95, 98.9, 99.6, 100.05, 100.1))
+
+        self.assertEqual(result.ticks, 6)
+        # Limits fill at the limit price on the tick after they were placed
+        self.assertEqual([(fill['side'], fill['qty'], fill['price']) for fill in result.fills],
+                         [('buy', 1.0, 98.96), ('sell', 1.0, 100.04)])
+        self.assertAlmostEqual(sum(report['realized'] for report in result.profit_reports), 1.04)
+        self.assertAlmostEqual(result.realized_profit, 1.08)
+        self.assertEqual(csv_service.get_current_held_shares(), 0.0)
+        self.assertEqual(result.max_share_drift, 0.0)
+        self.assertFalse(os.path.exists(csv_service.csv_filepath))
+
+    def test_share_count_mismatch_fails_the_run(self):
+        csv_service = BacktestCSVService("TEST", rows=whole_share_rows())
+        # A broker that ends up with a share more than the ladder booked
+        with patch.object(SimulatedBroker, 'get_shares_count', lambda broker: broker.shares + 1), \
+                patch.object(SimulatedBroker, 'get_cached_shares_count', lambda broker: None):
+            with self.assertRaisesRegex(RuntimeError, "Mismatch in shares"):
+                run_backtest(csv_service, ticks(99.5, 98.95, 98.9))
+
+    def test_synthetic_runs_are_deterministic(self):
+        rows = build_ladder_rows(100.0, 0.005, 0.2, 2000.0, last_action=0)
+        first = run_backtest(BacktestCSVService("TEST", rows=rows), synthetic_ticks(100.0, 5000, seed=7))
+        second = run_backtest(BacktestCSVService("TEST", rows=rows), synthetic_ticks(100.0, 5000, seed=7))
+        self.assertGreater(len(first.fills), 0)
+        self.assertEqual(first.fills, second.fills)
+        self.assertEqual(first.ladder, second.ladder)
+
+    def test_ticker_ladder_is_read_but_never_written(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_filepath = os.path.join(tmp_dir, "TEST.csv")
+            write_ladder_csv(csv_filepath, num_lines=10, held_every=0)
+            with open(csv_filepath) as f:
+                before = f.read()
+            with patch('main.bots.SCALE_T.csv_utils.csv_core.get_ticker_filepath', return_value=csv_filepath):
+                csv_service = BacktestCSVService("TEST")
+            result = run_backtest(csv_service, synthetic_ticks(csv_service.csv_data[0]['buy_price'], 2000, seed=1))
+            self.assertEqual(len(result.ladder), len(csv_service.csv_data))
+            with open(csv_filepath) as f:
+                self.assertEqual(f.read(), before)
+
+            write_result(result, os.path.join(tmp_dir, "out"))
+            self.assertEqual(sorted(os.listdir(os.path.join(tmp_dir, "out"))), ["fills.csv", "ladder.csv", "lines.csv"])
+
+    def test_read_ticks_accepts_epoch_and_iso_timestamps(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "ticks.csv")
+            with open(filepath, 'w') as f:
+                f.write("timestamp,price,size\n1700000000,100.5,10\n2023-11-14T22:13:21+00:00,100.6,5\n")
+            self.assertEqual(list(read_ticks(filepath)), ticks(100.5, 100.6))
+
+
+if __name__ == '__main__':
+    unittest.main()
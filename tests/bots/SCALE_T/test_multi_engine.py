@@ -0,0 +1,131 @@
+import json
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+from main.bots.SCALE_T.multi_engine import MultiTickerEngine, run_multi_engine
+from main.utils.redis import RedisSubscriber, CHANNELS
+
+
+def ticker_message(ticker, price):
+    return {'channel': CHANNELS.get_ticker_channel(ticker), 'data': {'type': 'price', 'price': price}}
+
+
+@patch('main.bots.SCALE_T.multi_engine.RedisSubscriber')
+@patch('main.bots.SCALE_T.multi_engine.RedisPublisher')
+@patch('main.bots.SCALE_T.multi_engine.CSVService')
+@patch('main.bots.SCALE_T.multi_engine.AlpacaInterface')
+@patch('main.bots.SCALE_T.multi_engine.DecisionMaker')
+class TestMultiTickerEngine(unittest.TestCase):
+    """Test cases for the SCALE_T multi-ticker engine."""
+
+    def setUp(self):
+        # Consumers run until the test lets them return
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _decision_makers(self, mock_decision_maker, failing=()):
+        created = {}
+
+        def create(csv_service, alpaca_interface, publisher):
+            ticker = alpaca_interface.ticker
+            if ticker in failing:
+                raise SystemExit()
+            created[ticker] = Mock()
+            created[ticker].csv_service = csv_service
+            created[ticker].consume_actions.side_effect = self.release.wait
+            return created[ticker]
+
+        mock_decision_maker.side_effect = create
+        return created
+
+    def _start(self, mock_alpaca_interface, mock_subscriber, tickers):
+        mock_alpaca_interface.return_value.for_ticker.side_effect = lambda ticker: Mock(ticker=ticker)
+        mock_subscriber.return_value.psubscribe.return_value = True
+        engine = MultiTickerEngine(tickers, "paper")
+        engine.start()
+        return engine
+
+    def test_shares_clients_and_one_subscription(self, mock_decision_maker, mock_alpaca_interface, mock_csv_service,
+                                                 mock_publisher, mock_subscriber):
+        created = self._decision_makers(mock_decision_maker)
+        engine = self._start(mock_alpaca_interface, mock_subscriber, ["aapl", "msft"])
+        self.release.set()
+        for thread in engine.consumer_threads.values():
+            thread.join(5)
+
+        mock_alpaca_interface.assert_called_once_with(trading_type="paper")
+        mock_publisher.assert_called_once()
+        mock_subscriber.return_value.psubscribe.assert_called_once_with(CHANNELS.TICKER_UPDATES_PATTERN, engine._route)
+        for call in mock_decision_maker.call_args_list:
+            self.assertIs(call.kwargs['publisher'], mock_publisher.return_value)
+        for ticker in ("AAPL", "MSFT"):
+            mock_csv_service.assert_any_call(ticker=ticker, trading_type="paper")
+            created[ticker].register_with_broker.assert_called_once()
+            created[ticker].consume_actions.assert_called_once()
+
+    def test_messages_are_routed_by_channel(self, mock_decision_maker, mock_alpaca_interface, mock_csv_service,
+                                            mock_publisher, mock_subscriber):
+        created = self._decision_makers(mock_decision_maker)
+        engine = self._start(mock_alpaca_interface, mock_subscriber, ["AAPL", "MSFT"])
+        message = ticker_message("MSFT", 101.0)
+        engine._route(message)
+        engine._route(ticker_message("TSLA", 5.0))
+        created["MSFT"].on_redis_message.assert_called_once_with(message)
+        created["AAPL"].on_redis_message.assert_not_called()
+
+    def test_failing_ticker_stops_alone(self, mock_decision_maker, mock_alpaca_interface, mock_csv_service,
+                                        mock_publisher, mock_subscriber):
+        created = self._decision_makers(mock_decision_maker, failing=("TSLA",))
+        mock_csv_service.side_effect = lambda ticker, trading_type: Mock(ticker=ticker)
+        engine = self._start(mock_alpaca_interface, mock_subscriber, ["AAPL", "MSFT", "TSLA"])
+        self.assertIn("TSLA", engine.failed)
+        self.assertNotIn("TSLA", engine.consumer_threads)
+
+        created["AAPL"].consume_actions.side_effect = SystemExit()
+        engine._consume("AAPL", created["AAPL"])
+        self.assertIn("AAPL", engine.failed)
+        created["AAPL"].csv_service.close.assert_called_once()
+        engine._route(ticker_message("AAPL", 100.0))
+        created["AAPL"].on_redis_message.assert_not_called()
+        self.assertEqual(list(engine.decision_makers), ["MSFT"])
+
+    def test_running_is_a_snapshot(self, mock_decision_maker, mock_alpaca_interface, mock_csv_service,
+                                   mock_publisher, mock_subscriber):
+        created = self._decision_makers(mock_decision_maker)
+        engine = self._start(mock_alpaca_interface, mock_subscriber, ["AAPL", "MSFT"])
+        # What the SIGUSR1 handler iterates while a consumer thread stops its ticker
+        running = engine.running().values()
+        engine._stop_ticker("AAPL", "test")
+        self.assertEqual(list(running), [created["AAPL"], created["MSFT"]])
+        self.assertEqual(list(engine.running()), ["MSFT"])
+
+    def test_no_ticker_started_raises(self, mock_decision_maker, mock_alpaca_interface, mock_csv_service,
+                                      mock_publisher, mock_subscriber):
+        self._decision_makers(mock_decision_maker, failing=("AAPL",))
+        mock_alpaca_interface.return_value.for_ticker.side_effect = lambda ticker: Mock(ticker=ticker)
+        with self.assertRaises(RuntimeError):
+            run_multi_engine(["AAPL"], "paper")
+        mock_subscriber.return_value.psubscribe.assert_not_called()
+
+
+class TestPatternSubscription(unittest.TestCase):
+    """Pattern callbacks receive messages from every matching channel, tagged with the channel."""
+
+    def test_pattern_message_reaches_pattern_callback(self):
+        subscriber = RedisSubscriber()
+        callback = Mock()
+        subscriber.callbacks[CHANNELS.TICKER_UPDATES_PATTERN] = callback
+        subscriber._message_handler({
+            'type': 'pmessage',
+            'pattern': CHANNELS.TICKER_UPDATES_PATTERN.encode(),
+            'channel': b'TICKER_UPDATES_AAPL',
+            'data': json.dumps({'data': {'type': 'price', 'price': 1.0}}).encode(),
+        })
+        callback.assert_called_once_with({'data': {'type': 'price', 'price': 1.0}, 'channel': 'TICKER_UPDATES_AAPL'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Orders, csv_service mocks and an inline DecisionMaker shared by the DecisionMaker tests of the SCALE_T bot."""
+
+import uuid
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from alpaca.trading.enums import OrderClass, OrderSide, OrderStatus, OrderType, TimeInForce
+from alpaca.trading.models import Order
+
+from main.bots.SCALE_T.trading.decision_maker import DecisionMaker
+from main.bots.SCALE_T.trading.inline_executor import InlineExecutor
+
+ORDER_ID = uuid.UUID(int=1)
+
+
+def make_order(status=OrderStatus.NEW, filled_qty=0.0, filled_avg_price=None, order_id=ORDER_ID, symbol="AAPL",
+               side=OrderSide.BUY, qty=2.0, limit_price=99.0):
+    # A real Order: manual order updates are wrapped in a TradeUpdate, which validates it
+    now = datetime.now(timezone.utc)
+    return Order(
+        id=order_id, client_order_id=str(order_id), created_at=now, updated_at=now, submitted_at=now,
+        symbol=symbol, qty=qty, filled_qty=filled_qty, filled_avg_price=filled_avg_price,
+        order_class=OrderClass.SIMPLE, order_type=OrderType.LIMIT, type=OrderType.LIMIT, side=side,
+        time_in_force=TimeInForce.DAY, limit_price=limit_price, status=status, extended_hours=False,
+    )
+
+
+def mock_csv_service(rows_for_buy=(), idle_band=(0.0, 0.0), held_shares=2.0, ticker="AAPL"):
+    """A csv_service Mock with no pending order, nothing to sell and nothing to chase."""
+    csv_service = Mock()
+    csv_service.ticker = ticker
+    csv_service.get_pending_order_info.return_value = None
+    csv_service.get_idle_band.return_value = idle_band
+    csv_service.get_rows_for_sell.return_value = []
+    csv_service.get_rows_for_buy.return_value = list(rows_for_buy)
+    csv_service.is_chasable_lines.return_value = False
+    csv_service.update_order_status.return_value = {}
+    csv_service.get_current_held_shares.return_value = held_shares
+    return csv_service
+
+
+class InlineDecisionMaker(DecisionMaker):
+    """DecisionMaker that makes its Alpaca calls inline instead of on the order pool."""
+
+    def _create_order_executor(self) -> Executor:
+        return InlineExecutor()
+
+
+def make_decision_maker(alpaca_interface, csv_service=None) -> InlineDecisionMaker:
+    """InlineDecisionMaker on csv_service (a mock_csv_service by default), its initial price taken off the queue."""
+    decision_maker = InlineDecisionMaker(csv_service or mock_csv_service(), alpaca_interface, publisher=Mock())
+    decision_maker.action_queue.get_nowait()  # initial price
+    return decision_maker
@@ -0,0 +1,84 @@
+"""Unit tests for the DecisionMaker action queue in the SCALE_T bot."""
+
+import asyncio
+import threading
+import unittest
+
+from main.bots.SCALE_T.trading.action_queue import ActionQueue, AsyncActionQueue
+from main.bots.SCALE_T.trading.constants import MessageType
+
+
+def price(value):
+    return {'type': 'price_update', 'data': value}
+
+
+def order(order_id):
+    return {'type': MessageType.ORDER_UPDATE, 'data': order_id}
+
+
+class TestActionQueue(unittest.TestCase):
+    """Order updates go first, queued prices collapse to the newest, and join() still works."""
+
+    def setUp(self):
+        self.action_queue = ActionQueue()
+
+    def _drain(self):
+        messages = []
+        while not self.action_queue.empty():
+            messages.append(self.action_queue.get())
+            self.action_queue.task_done()
+        return messages
+
+    def test_prices_conflate_to_latest(self):
+        for value in (100.0, 100.5, 101.0, 99.75):
+            self.action_queue.put(price(value))
+        self.assertEqual(self.action_queue.qsize(), 1)
+        self.assertEqual(self._drain(), [price(99.75)])
+        self.assertEqual(self.action_queue.ticks_conflated, 3)
+
+    def test_order_updates_jump_ahead_of_prices_in_order(self):
+        self.action_queue.put(price(100.0))
+        self.action_queue.put(order("a"))
+        self.action_queue.put(price(101.0))
+        self.action_queue.put(order("b"))
+        self.assertEqual(self._drain(), [order("a"), order("b"), price(101.0)])
+        self.assertEqual(self.action_queue.stats(), {'depth': 0, 'max_depth': 3, 'ticks_conflated': 1})
+
+    def test_price_after_get_is_not_conflated(self):
+        self.action_queue.put(price(100.0))
+        self.assertEqual(self.action_queue.get(), price(100.0))
+        self.action_queue.put(price(101.0))
+        self.assertEqual(self.action_queue.get(), price(101.0))
+        self.assertEqual(self.action_queue.ticks_conflated, 0)
+
+    def test_join_does_not_wait_for_conflated_ticks(self):
+        for value in range(50):
+            self.action_queue.put(price(float(value)))
+        self.action_queue.put(order("a"))
+        consumer = threading.Thread(target=self._drain)
+        consumer.start()
+        consumer.join(5)
+        joined = threading.Thread(target=self.action_queue.join)
+        joined.start()
+        joined.join(5)
+        self.assertFalse(joined.is_alive())
+
+
+class TestAsyncActionQueue(unittest.IsolatedAsyncioTestCase):
+    """The asyncio queue follows the same rules."""
+
+    async def test_order_updates_first_and_prices_conflate(self):
+        action_queue = AsyncActionQueue()
+        for message in (price(100.0), order("a"), price(101.0), price(102.0)):
+            action_queue.put_nowait(message)
+        messages = []
+        while not action_queue.empty():
+            messages.append(await action_queue.get())
+            action_queue.task_done()
+        self.assertEqual(messages, [order("a"), price(102.0)])
+        self.assertEqual(action_queue.stats(), {'depth': 0, 'max_depth': 2, 'ticks_conflated': 2})
+        await asyncio.wait_for(action_queue.join(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
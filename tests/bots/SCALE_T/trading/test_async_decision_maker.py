@@ -0,0 +1,123 @@
+"""Unit tests for the asyncio DecisionMaker in the SCALE_T bot."""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+from alpaca.trading.enums import OrderSide, OrderStatus
+
+from main.bots.SCALE_T.trading.async_decision_maker import AsyncDecisionMaker
+from main.bots.SCALE_T.trading.constants import OrderState
+from main.bots.SCALE_T.trading.inline_executor import InlineExecutor
+from tests.bots.SCALE_T.trading.helpers import ORDER_ID, make_order, mock_csv_service
+
+
+class TestAsyncDecisionMaker(unittest.IsolatedAsyncioTestCase):
+    """Price handling continues while place_order is in flight, and nothing is decided twice."""
+
+    async def asyncSetUp(self):
+        self.row = {'index': 3, 'buy_price': 99.0, 'sell_price': 101.0, 'target_shares': 2.0, 'held_shares': 0.0}
+        self.csv_service = mock_csv_service([self.row])
+        self.alpaca_interface = Mock()
+        self.alpaca_interface.get_current_price.return_value = 100.0
+
+        self.place_order_result = asyncio.get_running_loop().create_future()
+        self.async_alpaca = AsyncMock()
+        self.async_alpaca.place_order.side_effect = self._place_order
+        self.async_alpaca.get_shares_count.return_value = 2.0
+        self.async_alpaca.close = Mock()
+
+        self.decision_maker = AsyncDecisionMaker(self.csv_service, self.alpaca_interface, self.async_alpaca)
+        self.decision_maker.publisher = Mock()
+
+    async def asyncTearDown(self):
+        await self.decision_maker.close()
+
+    async def _place_order(self, side, limit_price, quantity):
+        return await self.place_order_result
+
+    async def _settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    async def test_ticks_are_consumed_while_order_is_in_flight(self):
+        self.decision_maker.handle_price_update(98.5)
+        await self._settle()
+        self.assertEqual(self.decision_maker.order_state, OrderState.SUBMITTING)
+        self.async_alpaca.place_order.assert_awaited_once_with(OrderSide.BUY, 98.51, 2.0)
+        self.csv_service.flush.assert_called_once()
+
+        for price in (98.4, 98.3, 98.2):
+            self.decision_maker.handle_price_update(price)
+        await self._settle()
+        self.assertEqual(self.async_alpaca.place_order.await_count, 1)
+        self.assertEqual(self.decision_maker._deferred_price, 98.2)
+
+        order = make_order(OrderStatus.NEW)
+        self.place_order_result.set_result(order)
+        await self._settle()
+        self.assertIs(self.decision_maker.pending_order, order)
+        self.assertEqual(self.decision_maker.order_state, OrderState.BUYING)
+        self.assertEqual(self.decision_maker.pending_order_index, 3)
+        self.assertEqual(self.row['pending_order_id'], ORDER_ID)
+        # The latest deferred price was checked against the recorded order, without placing another
+        self.assertIsNone(self.decision_maker._deferred_price)
+        self.assertEqual(self.decision_maker._prev_price, 98.2)
+        self.assertEqual(self.async_alpaca.place_order.await_count, 1)
+
+    async def test_fill_before_place_order_returns_is_replayed(self):
+        self.decision_maker.handle_price_update(98.5)
+        await self._settle()
+        order = make_order(OrderStatus.FILLED, filled_qty=2.0, filled_avg_price=98.5)
+        self.decision_maker.handle_order_update(order)
+        self.csv_service.update_order_status.assert_not_called()
+
+        self.place_order_result.set_result(make_order(OrderStatus.NEW))
+        await self._settle()
+        self.csv_service.update_order_status.assert_called_once_with(3, 2.0, 98.5, OrderSide.BUY)
+        self.assertIsNone(self.decision_maker.pending_order)
+        self.assertEqual(self.decision_maker.order_state, OrderState.NONE)
+        self.async_alpaca.get_shares_count.assert_awaited_once()
+
+    async def test_failed_placement_allows_retry(self):
+        self.place_order_result.set_result(None)
+        self.decision_maker.handle_price_update(98.5)
+        await self._settle()
+        self.assertIsNone(self.decision_maker.pending_order)
+        self.decision_maker.handle_price_update(98.4)
+        await self._settle()
+        self.assertEqual(self.async_alpaca.place_order.await_count, 2)
+
+    async def test_cancel_runs_without_blocking(self):
+        self.place_order_result.set_result(make_order(OrderStatus.NEW))
+        self.decision_maker.handle_price_update(98.5)
+        await self._settle()
+        cancel_result = asyncio.get_running_loop().create_future()
+
+        async def cancel_order(order_id):
+            return await cancel_result
+        self.async_alpaca.cancel_order.side_effect = cancel_order
+
+        # The ladder has nothing left to buy at 99.5, so there is nothing to re-quote to
+        self.csv_service.get_rows_for_buy.return_value = []
+        self.decision_maker.handle_price_update(99.5)
+        self.assertEqual(self.decision_maker.order_state, OrderState.CANCELLING)
+        await self._settle()
+        self.async_alpaca.cancel_order.assert_awaited_once_with(ORDER_ID)
+        cancel_result.set_result(True)
+        await self._settle()
+        self.async_alpaca.get_order_by_id.assert_not_awaited()
+
+    async def test_consume_actions_handles_queued_messages(self):
+        self.decision_maker.action_queue.put_nowait({'type': 'price_update', 'data': 98.5})
+        consumer = asyncio.create_task(self.decision_maker.consume_actions())
+        await self._settle()
+        consumer.cancel()
+        self.async_alpaca.place_order.assert_awaited_once()
+
+    async def test_no_order_pool_is_started(self):
+        self.assertIsInstance(self.decision_maker._order_executor, InlineExecutor)
+
+
+if __name__ == '__main__':
+    unittest.main()
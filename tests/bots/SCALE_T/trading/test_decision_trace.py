@@ -0,0 +1,93 @@
+"""Unit tests for the decision trace ring buffer in the SCALE_T bot."""
+
+import csv
+import os
+import signal
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from alpaca.trading.enums import OrderSide
+
+from main.bots.SCALE_T.trading.constants import OrderState
+from main.bots.SCALE_T.trading.decision_trace import FIELDS, DecisionTrace, dump_traces_on_signal
+from tests.bots.SCALE_T.trading.helpers import make_decision_maker, mock_csv_service
+
+
+class TestDecisionTrace(unittest.TestCase):
+    """Records are overwritten in place once the buffer is full and read back oldest first."""
+
+    def test_keeps_the_last_records(self):
+        trace = DecisionTrace("AAPL", size=3)
+        slots = list(trace._records)
+        for price in (1.0, 2.0, 3.0, 4.0, 5.0):
+            record = trace.begin("tick", price, OrderState.NONE)
+            trace.end(record, "hold")
+        self.assertEqual(trace._records, slots)  # no new records allocated
+        self.assertEqual(trace.count, 5)
+        records = trace.records()
+        self.assertEqual([record["price"] for record in records], [3.0, 4.0, 5.0])
+        self.assertEqual(records[0]["state"], OrderState.NONE.value)
+        self.assertEqual(records[0]["outcome"], "hold")
+        self.assertIsNotNone(records[0]["elapsed_us"])
+
+    def test_dump_writes_csv(self):
+        trace = DecisionTrace("AAPL", size=4)
+        trace.add("order_result", "accepted", side=OrderSide.BUY, order_id="order-1", qty=2.0, limit_price=98.51)
+        with tempfile.TemporaryDirectory() as directory:
+            path = trace.dump("signal", directory)
+            self.assertTrue(os.path.basename(path).startswith("AAPL-"))
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(tuple(rows[0]), FIELDS)
+        self.assertEqual((rows[0]["event"], rows[0]["side"], rows[0]["order_id"]), ("order_result", "buy", "order-1"))
+
+
+class TestDecisionMakerTrace(unittest.TestCase):
+    """DecisionMaker records what it checked and decided on each tick."""
+
+    def setUp(self):
+        self.rows = [{'index': 3, 'buy_price': 99.0, 'sell_price': 101.0, 'target_shares': 1.0, 'held_shares': 0.0},
+                     {'index': 4, 'buy_price': 98.0, 'sell_price': 100.0, 'target_shares': 1.0, 'held_shares': 0.0}]
+        self.csv_service = mock_csv_service(idle_band=(99.0, 101.0))
+        self.alpaca_interface = Mock()
+        self.alpaca_interface.get_current_price.return_value = 100.0
+        self.decision_maker = make_decision_maker(self.alpaca_interface, self.csv_service)
+        self.decision_maker._submit_order = Mock(return_value=True)
+
+    def test_ticks_are_traced(self):
+        self.decision_maker.handle_price_update(100.5)
+        self.csv_service.get_rows_for_buy.return_value = self.rows
+        self.decision_maker.handle_price_update(97.5)
+
+        idle, buy = self.decision_maker.trace.records()
+        self.assertEqual((idle["event"], idle["price"], idle["outcome"]), ("tick", 100.5, "idle"))
+        self.assertEqual((idle["idle_low"], idle["idle_high"]), (99.0, 101.0))
+        self.assertEqual(buy["outcome"], "buy")
+        self.assertEqual((buy["rows"], buy["side"], buy["qty"], buy["limit_price"]), ("3 4", "buy", 2.0, 97.51))
+
+    def test_consumer_dumps_trace_on_error(self):
+        self.decision_maker.dump_trace = Mock()
+        self.decision_maker._handle_action = Mock(side_effect=SystemExit())
+        self.decision_maker.action_queue.put_nowait({'type': 'price_update', 'data': 100.5})
+        with self.assertRaises(SystemExit):
+            self.decision_maker.consume_actions()
+        self.decision_maker.dump_trace.assert_called_once_with("error")
+
+    @unittest.skipUnless(hasattr(signal, "SIGUSR1"), "SIGUSR1 is POSIX only")
+    def test_signal_dumps_every_trace(self):
+        previous = signal.getsignal(signal.SIGUSR1)
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        self.decision_maker.handle_price_update(100.5)
+        with tempfile.TemporaryDirectory() as directory, \
+                patch('main.bots.SCALE_T.trading.decision_trace.DECISION_TRACE_DIR', directory):
+            self.assertTrue(dump_traces_on_signal(lambda: [self.decision_maker]))
+            signal.raise_signal(signal.SIGUSR1)
+            dumped = os.listdir(directory)
+        self.assertEqual(len(dumped), 1)
+        self.assertTrue(dumped[0].endswith("-signal.csv"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Unit tests for tick-to-order latency tracking in the SCALE_T bot."""
+
+import time
+import unittest
+from unittest.mock import Mock
+
+from alpaca.trading.enums import OrderStatus
+
+from main.bots.SCALE_T.trading.constants import MessageType
+from main.bots.SCALE_T.trading.latency import LatencyHistogram, LatencyTracker
+from tests.bots.SCALE_T.trading.helpers import make_decision_maker, make_order, mock_csv_service
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_quantiles_are_bucket_upper_bounds(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.001)
+        for _ in range(10):
+            histogram.record(0.5)
+        stats = histogram.stats()
+        self.assertEqual(stats['count'], 100)
+        self.assertAlmostEqual(stats['p50_ms'], 1.0)
+        self.assertAlmostEqual(stats['p90_ms'], 1.0)
+        self.assertEqual(stats['p99_ms'], 500.0)  # capped at the max seen
+        self.assertEqual(stats['max_ms'], 500.0)
+
+    def test_clock_skew_counts_as_zero(self):
+        histogram = LatencyHistogram()
+        histogram.record(-0.002)
+        self.assertEqual((histogram.count, histogram.max), (1, 0.0))
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+    def test_tracker_records_the_hops_it_has_both_ends_of(self):
+        tracker = LatencyTracker()
+        tracker.record({'enqueued': 10.0, 'dequeued': 10.002, 'decided': 10.003})
+        self.assertEqual(list(tracker.stats()), ['enqueued->dequeued', 'dequeued->decided'])
+        self.assertIn('enqueued->dequeued: n=1', tracker.report())
+
+
+class TestDecisionMakerLatency(unittest.TestCase):
+    """Ticks from Redis carry their stamps through the queue to the order they trigger."""
+
+    def setUp(self):
+        self.row = {'index': 3, 'buy_price': 99.0, 'sell_price': 101.0, 'target_shares': 2.0, 'held_shares': 0.0}
+        self.csv_service = mock_csv_service([self.row], idle_band=(98.0, 102.0))
+        self.alpaca_interface = Mock()
+        self.alpaca_interface.get_current_price.return_value = 100.0
+        self.alpaca_interface.place_order.return_value = make_order(OrderStatus.NEW)
+        self.decision_maker = make_decision_maker(self.alpaca_interface, self.csv_service)
+
+    def _tick(self, price):
+        now = time.time()
+        stamps = {'trade': now - 0.05, 'received': now - 0.04, 'published': now - 0.03}
+        self.decision_maker.on_redis_message({'data': {'type': 'price', 'price': str(price), 'stamps': stamps}})
+        self._next_action()
+
+    def _next_action(self):
+        message = self.decision_maker.action_queue.get(timeout=5)
+        self.decision_maker._handle_action(message)
+        return message
+
+    def test_tick_without_order_is_timed_to_its_decision(self):
+        self._tick(100.5)  # inside the idle band
+        stats = self.decision_maker.latency.stats()
+        self.assertEqual(list(stats), ['trade->received', 'received->published', 'published->enqueued',
+                                       'enqueued->dequeued', 'dequeued->decided'])
+        self.assertTrue(all(hop['count'] == 1 for hop in stats.values()))
+
+    def test_order_tick_is_timed_to_place_order_return(self):
+        self._tick(97.5)
+        self.assertEqual(self.decision_maker.latency.stats(), {})  # waits for place_order
+
+        message = self._next_action()
+        self.assertEqual(message['type'], MessageType.ORDER_SUBMITTED)
+        stats = self.decision_maker.latency.stats()
+        self.assertEqual(stats['decided->submitted']['count'], 1)
+        self.assertGreaterEqual(stats['trade->submitted']['max_ms'], 50.0)
+
+    def test_untimed_price_updates_are_not_recorded(self):
+        self.decision_maker._handle_action({'type': 'price_update', 'data': 100.5})
+        self.assertEqual(self.decision_maker.latency.stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
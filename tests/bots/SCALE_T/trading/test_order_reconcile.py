@@ -0,0 +1,147 @@
+"""Unit tests for pending-order reconciliation (backoff polls and the shared OrderReconciler) in the SCALE_T bot."""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from alpaca.trading.enums import OrderSide, OrderStatus
+
+from main.bots.SCALE_T.brokerages.simulated_broker import SimulatedBroker
+from main.bots.SCALE_T.common.constants import ORDER_RECONCILE_MAX_SEC, ORDER_RECONCILE_MIN_SEC
+from main.bots.SCALE_T.trading.constants import MessageType, OrderState
+from main.bots.SCALE_T.trading.order_reconciler import OrderReconciler
+from tests.bots.SCALE_T.trading.helpers import make_decision_maker, make_order, mock_csv_service
+
+
+@patch('main.bots.SCALE_T.trading.decision_maker.time')
+class TestReconcileBackoff(unittest.TestCase):
+    """A pending order is polled with a doubling delay that new activity resets."""
+
+    def setUp(self):
+        self.alpaca_interface = Mock()
+        self.alpaca_interface.get_current_price.return_value = 100.0
+        self.order = make_order()
+        self.alpaca_interface.get_order_by_id.return_value = self.order
+        self.decision_maker = make_decision_maker(self.alpaca_interface)
+
+    def _place(self, mock_time, now=0.0):
+        mock_time.monotonic.return_value = now
+        self.decision_maker.order_state = OrderState.BUYING
+        self.decision_maker._record_placed_order(self.order, OrderSide.BUY, {'index': 0})
+
+    def _poll_times(self, mock_time, until):
+        """Check every second up to until; return when a poll went out."""
+        polls = []
+        for now in range(int(until) + 1):
+            mock_time.monotonic.return_value = float(now)
+            calls = self.alpaca_interface.get_order_by_id.call_count
+            self.decision_maker._check_reconcile()
+            if self.alpaca_interface.get_order_by_id.call_count > calls:
+                polls.append(float(now))
+        return polls
+
+    def test_polls_back_off_to_max(self, mock_time):
+        self._place(mock_time)
+        polls = self._poll_times(mock_time, 2 * ORDER_RECONCILE_MAX_SEC + 60)
+        gaps = [later - earlier for earlier, later in zip(polls, polls[1:])]
+        self.assertEqual(polls[0], ORDER_RECONCILE_MIN_SEC)
+        self.assertEqual(gaps[:3], [ORDER_RECONCILE_MIN_SEC, 2 * ORDER_RECONCILE_MIN_SEC, 4 * ORDER_RECONCILE_MIN_SEC])
+        self.assertEqual(max(gaps), ORDER_RECONCILE_MAX_SEC)
+        # Each poll comes back as an order update on the queue
+        message = self.decision_maker.action_queue.get_nowait()
+        self.assertEqual(message['type'], MessageType.ORDER_UPDATE)
+        self.assertEqual(message['source'], 'reconcile')
+
+    def test_no_poll_without_pending_order_or_while_submitting(self, mock_time):
+        mock_time.monotonic.return_value = 1000.0
+        self.decision_maker._check_reconcile()
+        self._place(mock_time)
+        self.decision_maker.order_state = OrderState.SUBMITTING
+        mock_time.monotonic.return_value = 1000.0
+        self.decision_maker._check_reconcile()
+        self.alpaca_interface.get_order_by_id.assert_not_called()
+
+    def test_stream_update_resets_backoff(self, mock_time):
+        self._place(mock_time)
+        self._poll_times(mock_time, 100)
+        self.assertGreater(self.decision_maker._reconcile_delay, ORDER_RECONCILE_MIN_SEC)
+
+        # A poll's own answer doesn't count as activity
+        while not self.decision_maker.action_queue.empty():
+            self.decision_maker._handle_action(self.decision_maker.action_queue.get_nowait())
+        self.assertGreater(self.decision_maker._reconcile_delay, ORDER_RECONCILE_MIN_SEC)
+
+        mock_time.monotonic.return_value = 100.0
+        trade_update = Mock(order=self.order, position_qty=None)
+        self.decision_maker._handle_action({'type': MessageType.ORDER_UPDATE, 'data': trade_update, 'source': 'redis'})
+        self.assertEqual(self.decision_maker._reconcile_delay, ORDER_RECONCILE_MIN_SEC)
+        self.assertEqual(self.decision_maker._reconcile_at, 100.0 + ORDER_RECONCILE_MIN_SEC)
+
+    def test_failed_cancel_polls_now_unless_just_polled(self, mock_time):
+        self._place(mock_time)
+        self.decision_maker.order_state = OrderState.CANCELLING
+        mock_time.monotonic.return_value = 2.0
+        self.decision_maker._after_cancel(False, self.order.id, "buy", "due to price increase")
+        self.assertEqual(self.alpaca_interface.get_order_by_id.call_count, 1)
+
+        # Another failed cancel right after: the poll waits for the min gap instead of being skipped
+        mock_time.monotonic.return_value = 3.0
+        self.decision_maker._after_cancel(False, self.order.id, "buy", "due to price increase")
+        self.assertEqual(self.alpaca_interface.get_order_by_id.call_count, 1)
+        self.assertEqual(self.decision_maker._reconcile_at, 2.0 + ORDER_RECONCILE_MIN_SEC)
+
+    def test_polls_go_through_shared_reconciler(self, mock_time):
+        self.decision_maker.order_reconciler = Mock()
+        self._place(mock_time)
+        mock_time.monotonic.return_value = ORDER_RECONCILE_MIN_SEC
+        self.decision_maker._check_reconcile()
+        self.decision_maker.order_reconciler.request.assert_called_once_with(self.decision_maker, self.decision_maker.pending_order)
+        self.alpaca_interface.get_order_by_id.assert_not_called()
+
+
+class TestOrderReconciler(unittest.TestCase):
+    """Polls from several DecisionMakers are answered with one open-orders query."""
+
+    def setUp(self):
+        # One simulated account, as the multi-ticker engine has one AlpacaInterface for every ticker
+        self.broker = SimulatedBroker("AAPL")
+        self.brokers = {"AAPL": self.broker, "MSFT": self.broker.for_ticker("MSFT"), "TSLA": self.broker.for_ticker("TSLA")}
+        for broker in self.brokers.values():
+            broker.on_trade(100.0)
+        self.reconciler = OrderReconciler(self.broker)
+        self.decision_makers = {ticker: make_decision_maker(broker, mock_csv_service(ticker=ticker))
+                                for ticker, broker in self.brokers.items()}
+
+    def _queued_order(self, ticker):
+        message = self.decision_makers[ticker].action_queue.get_nowait()
+        self.assertEqual(message['source'], 'reconcile')
+        return message['data'].order
+
+    def test_one_query_for_every_ticker(self):
+        orders = {ticker: broker.place_order(OrderSide.BUY, 99.0, 2) for ticker, broker in self.brokers.items()}
+        self.brokers["MSFT"].place_order(OrderSide.BUY, 98.0, 2)  # open, but nobody asked about it
+        self.brokers["TSLA"].on_trade(98.5)  # fills TSLA's order
+        for ticker, decision_maker in self.decision_makers.items():
+            self.reconciler.request(decision_maker, orders[ticker])
+
+        with patch.object(self.broker, 'get_open_orders', wraps=self.broker.get_open_orders) as get_open_orders, \
+                patch.object(self.broker, 'get_order_by_id', wraps=self.broker.get_order_by_id) as get_order_by_id:
+            self.assertEqual(self.reconciler.reconcile_pending(), 3)
+        get_open_orders.assert_called_once_with(["AAPL", "MSFT", "TSLA"])
+        # Only the order that is no longer open is fetched on its own
+        get_order_by_id.assert_called_once_with(str(orders["TSLA"].id))
+        queued = {ticker: self._queued_order(ticker) for ticker in self.decision_makers}
+        self.assertEqual({ticker: (order.id, order.status) for ticker, order in queued.items()},
+                         {"AAPL": (orders["AAPL"].id, OrderStatus.NEW), "MSFT": (orders["MSFT"].id, OrderStatus.NEW),
+                          "TSLA": (orders["TSLA"].id, OrderStatus.FILLED)})
+        self.assertEqual(self.reconciler.reconcile_pending(), 0)
+
+    def test_failed_query_falls_back_to_single_orders(self):
+        order = self.broker.place_order(OrderSide.BUY, 99.0, 2)
+        self.reconciler.request(self.decision_makers["AAPL"], order)
+        with patch.object(self.broker, 'get_open_orders', side_effect=Exception("rate limited")):
+            self.reconciler.reconcile_pending()
+        self.assertEqual(self._queued_order("AAPL").id, order.id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Unit tests for re-quoting pending orders with replace_order in the SCALE_T bot."""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from alpaca.trading.enums import OrderStatus, OrderType
+
+from main.bots.SCALE_T.backtest import BacktestCSVService
+from main.bots.SCALE_T.brokerages.simulated_broker import SimulatedBroker
+from main.bots.SCALE_T.trading.constants import MessageType, OrderState
+from tests.bots.SCALE_T.trading.helpers import make_decision_maker
+
+START = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+LATENCY_SEC = 60
+
+
+def buy_row(index, buy_price, target_shares=2.0):
+    return {'index': index, 'buy_price': buy_price, 'sell_price': buy_price + 1, 'target_shares': target_shares,
+            'held_shares': 0.0, 'pending_order_id': "None", 'spc': "N", 'unrealized_profit': 0.0, 'last_action': 0,
+            'profit': 0.0}
+
+
+class TestOrderReplace(unittest.TestCase):
+    """Same-side re-quotes go through replace_order; everything else keeps cancel-then-place."""
+
+    def setUp(self):
+        self._start([buy_row(0, 99.8), buy_row(1, 99.3), buy_row(2, 98.8)])
+
+    def _start(self, rows):
+        # Orders only reach the simulated book LATENCY_SEC after they were sent, so they stay
+        # open through the ticks of a test unless it moves the clock on
+        self.broker = SimulatedBroker("AAPL", latency_sec=LATENCY_SEC)
+        self.broker.on_trade(100.0, START)
+        self.csv_service = BacktestCSVService("AAPL", rows=rows)
+        self.csv_service.broker = self.broker
+        self.rows = [self.csv_service.get_row_by_index(row['index']) for row in rows]
+        self.decision_maker = make_decision_maker(self.broker, self.csv_service)
+
+    def _tick(self, price):
+        self.broker.on_trade(price)
+        self.decision_maker.handle_price_update(price)
+
+    def _next_action(self):
+        message = self.decision_maker.action_queue.get_nowait()
+        self.decision_maker._handle_action(message)
+        return message
+
+    def _run_actions(self):
+        """Handle the queued results and the broker's trade updates until both are drained."""
+        handled = []
+        while True:
+            for trade_update in self.broker.take_updates():
+                self.decision_maker.action_queue.put_nowait({'type': MessageType.ORDER_UPDATE, 'data': trade_update})
+            if self.decision_maker.action_queue.empty():
+                return handled
+            handled.append(self._next_action()['type'])
+
+    def _place_buy(self, price):
+        self._tick(price)
+        self._run_actions()
+        return self.decision_maker.pending_order
+
+    def test_more_rows_grow_the_pending_order(self):
+        first = self._place_buy(99.25)
+        self.assertEqual((first.qty, first.limit_price), (4, 99.26))
+        self.assertEqual(self.rows[1]['pending_order_id'], str(first.id))
+
+        self._tick(98.75)
+        self.assertEqual(self.decision_maker.order_state, OrderState.SUBMITTING)
+        self.assertEqual(self._run_actions(), [MessageType.ORDER_REPLACED, MessageType.ORDER_UPDATE])
+
+        second = self.decision_maker.pending_order
+        self.assertEqual(second.replaces, first.id)
+        self.assertEqual((second.qty, second.limit_price), (6, 98.76))
+        self.assertEqual(self.broker.orders[first.id].status, OrderStatus.REPLACED)
+        self.assertEqual(self.decision_maker.order_state, OrderState.BUYING)
+        self.assertEqual(self.decision_maker.pending_order_index, 2)
+        self.assertEqual(self.rows[1]['pending_order_id'], "None")
+        self.assertEqual(self.rows[2]['pending_order_id'], str(second.id))
+
+    def test_price_drift_reprices_instead_of_cancelling(self):
+        first = self._place_buy(98.75)
+        self._tick(99.2)
+        self._run_actions()
+        second = self.decision_maker.pending_order
+        self.assertEqual(second.replaces, first.id)
+        self.assertEqual((second.qty, second.limit_price), (4, 99.21))
+        self.assertEqual(self.broker.orders[first.id].status, OrderStatus.REPLACED)
+
+    def test_no_rows_left_still_cancels(self):
+        first = self._place_buy(98.75)
+        self._tick(99.9)
+        self.assertEqual(self.decision_maker.order_state, OrderState.CANCELLING)
+        self.assertEqual(self._run_actions(), [MessageType.CANCEL_RESULT])
+
+        # The cancel lands at the broker and its CANCELED update settles the order
+        self.broker.on_trade(99.9, START + timedelta(seconds=LATENCY_SEC))
+        self._run_actions()
+        self.assertEqual(self.broker.orders[first.id].status, OrderStatus.CANCELED)
+        self.assertEqual(len(self.broker.orders), 1)
+        self.assertEqual(self.decision_maker.order_state, OrderState.NONE)
+        self.assertEqual(self.rows[2]['pending_order_id'], "None")
+
+    def test_fractional_order_is_not_replaced(self):
+        self._start([buy_row(0, 99.8, target_shares=0.5), buy_row(1, 99.3), buy_row(2, 98.8)])
+        first = self._place_buy(99.75)
+        self.assertEqual(first.order_type, OrderType.MARKET)
+        self._tick(99.25)
+        self.assertEqual(self.decision_maker.order_state, OrderState.BUYING)
+        self.assertIs(self.decision_maker.pending_order, first)
+
+    def test_failed_replace_keeps_order_and_applies_its_fill(self):
+        first = self._place_buy(99.25)
+        # Filled at the broker, but the fill hasn't reached the DecisionMaker when it re-quotes
+        self.broker.on_trade(99.2, START + timedelta(seconds=LATENCY_SEC))
+        self.decision_maker.handle_price_update(98.75)
+        self.assertEqual(self._next_action()['type'], MessageType.ORDER_REPLACED)
+        self.assertEqual(self.decision_maker.pending_order.id, first.id)
+        self.assertEqual(self.decision_maker.order_state, OrderState.BUYING)
+        self.assertEqual(self.rows[1]['pending_order_id'], str(first.id))
+        results = [(record['outcome'], record['order_id']) for record in self.decision_maker.trace.records()
+                   if record['event'] == "order_result"]
+        self.assertEqual(results, [("accepted", first.id), ("replace_failed", first.id)])
+
+        self._run_actions()
+        self.assertEqual([row['held_shares'] for row in self.rows], [2.0, 2.0, 0.0])
+        self.assertEqual(self.decision_maker.order_state, OrderState.NONE)
+        self.assertIsNone(self.decision_maker.pending_order)
+
+    def test_fills_reported_on_replaced_order_reach_ladder(self):
+        self._place_buy(99.25)
+        self._tick(98.75)
+        self._next_action()  # ORDER_REPLACED
+        second = self.decision_maker.pending_order
+
+        # Alpaca's final update for the old order carries what it filled before the replace. The
+        # simulated broker turns down a replace once the order has fills, so add one to its update.
+        (replaced_update,) = self.broker.take_updates()
+        self.assertEqual(replaced_update.order.status, OrderStatus.REPLACED)
+        replaced = replaced_update.order.model_copy(update={'filled_qty': 1.0, 'filled_avg_price': 99.26})
+        self.decision_maker.handle_order_update(replaced)
+
+        self.assertEqual([row['held_shares'] for row in self.rows], [1.0, 0.0, 0.0])
+        # The replacement is still live on its row, so a restart would pick it up
+        self.assertEqual(self.rows[2]['pending_order_id'], str(second.id))
+        self.assertEqual(self.csv_service.get_pending_order_info(), {'order_id': str(second.id), 'index': 2})
+        self.assertIs(self.decision_maker.pending_order, second)
+        self.assertEqual(self.decision_maker.order_state, OrderState.BUYING)
+
+
+if __name__ == '__main__':
+    unittest.main()
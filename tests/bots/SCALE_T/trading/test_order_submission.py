@@ -0,0 +1,124 @@
+"""Unit tests for DecisionMaker order submission on the order pool in the SCALE_T bot."""
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from alpaca.trading.enums import OrderSide, OrderStatus
+
+from main.bots.SCALE_T.trading.constants import MessageType, OrderState
+from main.bots.SCALE_T.trading.decision_maker import DecisionMaker
+from tests.bots.SCALE_T.trading.helpers import ORDER_ID, make_order, mock_csv_service
+
+
+class TestOrderSubmission(unittest.TestCase):
+    """The consumer doesn't wait on place_order/cancel_order; results come back through the queue."""
+
+    def setUp(self):
+        self.row = {'index': 3, 'buy_price': 99.0, 'sell_price': 101.0, 'target_shares': 2.0, 'held_shares': 0.0}
+        self.csv_service = mock_csv_service([self.row])
+        self.csv_service.get_row_by_index.return_value = self.row
+        self.alpaca_interface = Mock()
+        self.alpaca_interface.get_current_price.return_value = 100.0
+        self.alpaca_interface.get_shares_count.return_value = 2.0
+
+        self.broker_answer = threading.Event()
+        self.placed_order = make_order(OrderStatus.NEW)
+
+        def place_order(side, limit_price, quantity):
+            self.broker_answer.wait(5)
+            return self.placed_order
+
+        self.alpaca_interface.place_order.side_effect = place_order
+        self.decision_maker = DecisionMaker(self.csv_service, self.alpaca_interface, publisher=Mock())
+        self.decision_maker.action_queue.get_nowait()  # initial price
+
+    def tearDown(self):
+        self.broker_answer.set()
+        self.decision_maker._order_executor.shutdown(wait=True)
+
+    def _next_action(self):
+        message = self.decision_maker.action_queue.get(timeout=5)
+        self.decision_maker._handle_action(message)
+        self.decision_maker.action_queue.task_done()
+        return message
+
+    def test_ticks_are_deferred_while_submitting(self):
+        self.decision_maker.handle_price_update(98.5)
+        self.assertEqual(self.decision_maker.order_state, OrderState.SUBMITTING)
+        self.csv_service.flush.assert_called_once()
+        for price in (98.4, 98.3):
+            self.decision_maker.handle_price_update(price)
+        self.assertEqual(self.decision_maker._deferred_price, 98.3)
+
+        self.broker_answer.set()
+        self.assertEqual(self._next_action()['type'], MessageType.ORDER_SUBMITTED)
+        self.alpaca_interface.place_order.assert_called_once_with(OrderSide.BUY, 98.51, 2.0)
+        self.assertEqual(self.decision_maker.order_state, OrderState.BUYING)
+        self.assertIs(self.decision_maker.pending_order, self.placed_order)
+        self.assertEqual(self.row['pending_order_id'], ORDER_ID)
+        self.assertIsNone(self.decision_maker._deferred_price)
+        self.assertEqual(self.decision_maker._prev_price, 98.3)
+        self.assertEqual(self.alpaca_interface.place_order.call_count, 1)
+
+    def test_fill_before_submission_result_is_replayed(self):
+        self.decision_maker.handle_price_update(98.5)
+        self.decision_maker.handle_order_update(make_order(OrderStatus.FILLED, filled_qty=2.0, filled_avg_price=98.5))
+        self.csv_service.update_order_status.assert_not_called()
+
+        self.broker_answer.set()
+        self._next_action()
+        self.csv_service.update_order_status.assert_called_once_with(3, 2.0, 98.5, OrderSide.BUY)
+        self.assertIsNone(self.decision_maker.pending_order)
+        self.assertEqual(self.decision_maker.order_state, OrderState.NONE)
+
+    def test_no_order_while_ladder_is_not_saved(self):
+        self.csv_service.flush.return_value = False
+        self.decision_maker.handle_price_update(98.5)
+        self.assertEqual(self.decision_maker.order_state, OrderState.NONE)
+        self.alpaca_interface.place_order.assert_not_called()
+        self.assertEqual(self.decision_maker.trace.records()[-1]['outcome'], "save_failed")
+
+        # Saved again: the next tick places the order
+        self.csv_service.flush.return_value = True
+        self.decision_maker.handle_price_update(98.4)
+        self.assertEqual(self.decision_maker.order_state, OrderState.SUBMITTING)
+
+    def test_restart_with_pending_order(self):
+        # The ladder saved an order before the restart; the DecisionMaker picks it up from Alpaca
+        self.csv_service.get_pending_order_info.return_value = {'order_id': str(ORDER_ID), 'index': 3}
+        self.alpaca_interface.get_order_by_id.return_value = make_order(OrderStatus.NEW)
+        decision_maker = DecisionMaker(self.csv_service, self.alpaca_interface, publisher=Mock())
+        self.addCleanup(decision_maker._order_executor.shutdown)
+        self.assertEqual(decision_maker.order_state, OrderState.BUYING)
+        self.assertEqual(decision_maker.pending_order_index, 3)
+
+        # Cancelled while the bot was down: settled on startup
+        self.alpaca_interface.get_order_by_id.return_value = make_order(OrderStatus.CANCELED)
+        decision_maker = DecisionMaker(self.csv_service, self.alpaca_interface, publisher=Mock())
+        self.addCleanup(decision_maker._order_executor.shutdown)
+        self.assertEqual(decision_maker.order_state, OrderState.NONE)
+        self.assertIsNone(decision_maker.pending_order)
+        self.assertEqual(self.row['pending_order_id'], "None")
+
+    def test_cancel_result_comes_back_through_queue(self):
+        self.broker_answer.set()
+        self.decision_maker.handle_price_update(98.5)
+        self._next_action()
+        self.alpaca_interface.cancel_order.return_value = True
+
+        # The ladder has nothing left to buy at 99.5, so there is nothing to re-quote to
+        self.csv_service.get_rows_for_buy.return_value = []
+        self.decision_maker.handle_price_update(99.5)
+        self.assertEqual(self.decision_maker.order_state, OrderState.CANCELLING)
+        self.assertEqual(self._next_action()['type'], MessageType.CANCEL_RESULT)
+        self.alpaca_interface.cancel_order.assert_called_once_with(ORDER_ID)
+        # The CANCELED order update settles it
+        self.decision_maker.handle_order_update(make_order(OrderStatus.CANCELED))
+        self.assertEqual(self.decision_maker.order_state, OrderState.NONE)
+        self.assertIsNone(self.decision_maker.pending_order)
+        self.assertEqual(self.row['pending_order_id'], "None")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Unit tests for the trade-update position cache used by the SCALE_T share count checks."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from alpaca.trading.enums import OrderStatus
+
+from main.bots.SCALE_T.brokerages.alpaca_interface import AlpacaInterface
+from main.bots.SCALE_T.common.constants import TradingType
+from main.bots.SCALE_T.trading.constants import MessageType
+from tests.bots.SCALE_T.trading.helpers import make_decision_maker, make_order, mock_csv_service
+
+
+@patch('main.bots.SCALE_T.brokerages.alpaca_interface.StockHistoricalDataClient')
+@patch('main.bots.SCALE_T.brokerages.alpaca_interface.TradingClient')
+class TestPositionCache(unittest.TestCase):
+    """Fills and cancels are checked against position_qty from the stream; REST only reconciles."""
+
+    def _make(self, mock_trading_client, held_shares=4.0):
+        self.trading_client = mock_trading_client.return_value
+        self.trading_client.get_account.return_value = Mock(status="ACTIVE")
+        self.trading_client.get_all_positions.return_value = [Mock(symbol="AAPL", qty="2")]
+        self.alpaca_interface = AlpacaInterface(trading_type=TradingType.PAPER, ticker="AAPL")
+        self.alpaca_interface.get_current_price = Mock(return_value=100.0)
+
+        self.csv_service = mock_csv_service(held_shares=held_shares)
+        return make_decision_maker(self.alpaca_interface, self.csv_service)
+
+    def _fill(self, decision_maker, position_qty):
+        decision_maker.pending_order = make_order(OrderStatus.FILLED, filled_qty=2.0, filled_avg_price=98.5)
+        decision_maker.pending_order_index = 3
+        trade_update = SimpleNamespace(order=decision_maker.pending_order, position_qty=position_qty)
+        decision_maker._handle_action({'type': MessageType.ORDER_UPDATE, 'data': trade_update})
+
+    def test_fill_is_checked_against_stream_position(self, mock_trading_client, mock_data_client):
+        decision_maker = self._make(mock_trading_client)
+        self.assertEqual(self.alpaca_interface.get_shares_count(), 2.0)
+        self.trading_client.get_all_positions.reset_mock()
+
+        self._fill(decision_maker, position_qty="4")
+        self.assertEqual(self.alpaca_interface.get_cached_shares_count(), 4.0)
+        self.trading_client.get_all_positions.assert_not_called()
+
+    def test_stale_cache_is_reconciled_over_rest(self, mock_trading_client, mock_data_client):
+        decision_maker = self._make(mock_trading_client, held_shares=2.0)
+        self.alpaca_interface.update_position(2.0)  # never reconciled yet
+        self.assertIsNone(self.alpaca_interface.get_cached_shares_count())
+
+        self._fill(decision_maker, position_qty=None)
+        self.trading_client.get_all_positions.assert_called_once()
+        self.assertEqual(self.alpaca_interface.get_cached_shares_count(), 2.0)
+        self.assertIsNone(self.alpaca_interface.get_cached_shares_count(max_age_sec=-1))
+
+    def test_mismatch_is_confirmed_over_rest_before_exiting(self, mock_trading_client, mock_data_client):
+        decision_maker = self._make(mock_trading_client)
+        self.alpaca_interface.get_shares_count()
+        with self.assertRaises(SystemExit):
+            self._fill(decision_maker, position_qty="3")
+        self.assertEqual(self.trading_client.get_all_positions.call_count, 2)
+
+    def test_for_ticker_starts_with_empty_cache(self, mock_trading_client, mock_data_client):
+        self._make(mock_trading_client)
+        self.alpaca_interface.get_shares_count()
+        other = self.alpaca_interface.for_ticker("MSFT")
+        self.assertIsNone(other.get_cached_shares_count())
+        self.assertEqual(self.alpaca_interface.get_cached_shares_count(), 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()